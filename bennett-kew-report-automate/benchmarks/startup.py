@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: wall time and import cost of the CLI entry points.
+Fails (exit 1) if a command's median wall time exceeds its budget, so an
+eager import of anthropic/fitz/PIL/reportlab at module level shows up as a regression.
+
+Usage:
+  python benchmarks/startup.py              # Check all commands against their budgets
+  python benchmarks/startup.py --runs 20    # More samples
+  python benchmarks/startup.py --top 15     # Show the 15 heaviest imports per command
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GENERATOR_ROOT = ROOT.parent / "bennett-kew-report"
+
+# (label, argv relative to cwd, cwd, budget in ms)
+COMMANDS = [
+    ("run.py --help", ["run.py", "--help"], ROOT, 150),
+    ("run.py jobs", ["run.py", "jobs", "--limit", "1"], ROOT, 200),
+    ("calendar_utils", ["-m", "src.calendar_utils"], ROOT, 100),
+    ("run_report.py --help", ["run_report.py", "--help"], GENERATOR_ROOT, 150),
+]
+
+# Modules that must never be imported by the fast paths above
+HEAVY = ("anthropic", "fitz", "PIL", "reportlab.pdfgen", "numpy", "requests")
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(argv: list[str], cwd: Path, runs: int):
+    """
+    Run `python -X importtime <argv>` runs times.
+    Returns (wall times in ms, every (cumulative us, module) imported by the last run,
+    the top-level imports of the last run sorted heaviest first).
+    """
+    # Throwaway queue so `run.py jobs` doesn't create output/queue.sqlite
+    queue = Path(tempfile.gettempdir()) / "startup_benchmark_queue.sqlite"
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "REPORT_QUEUE": str(queue)}
+    walls, imports = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=cwd, env=env,
+                              capture_output=True, text=True)
+        walls.append((time.perf_counter() - start) * 1000)
+        imports = [(int(m.group(2)), m.group(4), len(m.group(3)))
+                   for m in _IMPORTTIME.finditer(proc.stderr)]
+    # Top-level imports only (nesting depth 1), cumulative microseconds
+    top = sorted(((cum, name) for cum, name, depth in imports if depth == 1), reverse=True)
+    return walls, [(cum, name) for cum, name, _ in imports], top
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup / import-time benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Samples per command (default: 10)")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list (default: 8)")
+    args = parser.parse_args()
+
+    failed = False
+    for label, argv, cwd, budget in COMMANDS:
+        if not cwd.exists():
+            continue
+        walls, imported, top = measure(argv, cwd, args.runs)
+        median = statistics.median(walls)
+        heavy = sorted({name for _, name in imported if name.startswith(HEAVY)})
+        ok = median <= budget and not heavy
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {label:<24} median {median:6.1f} ms  "
+              f"(min {min(walls):.1f}, budget {budget} ms)")
+        if heavy:
+            print(f"     heavy imports on a fast path: {', '.join(heavy)}")
+        for cum, name in top[:args.top]:
+            print(f"     {cum / 1000:7.1f} ms  {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
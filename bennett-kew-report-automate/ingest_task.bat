@@ -0,0 +1,34 @@
+@echo off
+REM ============================================================
+REM  Bennett-Kew Weekly Report - Daily Ingestion
+REM  Runs Monday-Friday at 7:00 PM via Windows Task Scheduler
+REM  Extracts the day's daily report so Friday's run only has
+REM  to process Friday plus the weekly synthesis.
+REM ============================================================
+
+set PYTHONUTF8=1
+set PROJECT_DIR=C:\Users\Adam\DEV\projects\fsi-weekly-report\bennett-kew-report-automate
+set LOG_DIR=%PROJECT_DIR%\output\logs
+set TIMESTAMP=%date:~10,4%%date:~4,2%%date:~7,2%_%time:~0,2%%time:~3,2%
+set TIMESTAMP=%TIMESTAMP: =0%
+set LOG_FILE=%LOG_DIR%\ingest_%TIMESTAMP%.log
+set EVENTS_FILE=%LOG_DIR%\ingest_%TIMESTAMP%.ndjson
+
+REM Create log directory if needed
+if not exist "%LOG_DIR%" mkdir "%LOG_DIR%"
+
+echo [%date% %time%] Starting daily report ingestion >> "%LOG_FILE%"
+echo ================================================== >> "%LOG_FILE%"
+
+cd /d "%PROJECT_DIR%"
+
+C:\Python314\python.exe run.py ingest-day --backend api --events "%EVENTS_FILE%" >> "%LOG_FILE%" 2>&1
+
+if %ERRORLEVEL% EQU 0 (
+    echo [%date% %time%] SUCCESS - Daily report ingested >> "%LOG_FILE%"
+) else (
+    echo [%date% %time%] FAILED - Exit code: %ERRORLEVEL% >> "%LOG_FILE%"
+)
+
+echo ================================================== >> "%LOG_FILE%"
+echo [%date% %time%] Done >> "%LOG_FILE%"
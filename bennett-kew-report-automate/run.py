@@ -11,33 +11,70 @@ Usage:
   python run.py --config another_project           # Different project
   python run.py --skip-email --debug               # Dev mode
   python run.py --dry-run                          # Assemble JSON only
+  python run.py --resume                           # Reuse unchanged stage checkpoints
+  python run.py --from-stage 6                     # Re-render PDF onward from checkpoints
+  python run.py --all-configs                      # Every project in config/, one process
+  python run.py --events output/logs/run.ndjson    # Also log NDJSON events
+  python run.py --profile                          # Per-stage flamegraphs + memory -> output/profile/
+
+Service mode (persistent job queue, warm workers):
+  python run.py serve --workers 2                  # Pull and run queued jobs until Ctrl+C
+  python run.py enqueue -c bennett_kew -d 2026-02-06 --priority 10 --from-stage 6
+  python run.py jobs                               # Show recent jobs and their status
+
+Daily ingestion (cron each evening; Friday then only extracts Friday):
+  python run.py ingest-day                         # Today's daily report (and any missed this week)
+  python run.py ingest-day --date 2026-02-04
+
+Backfill (regenerate past weeks concurrently, reusing checkpoints):
+  python run.py backfill --from 2025-09-15 --to 2026-02-06
+
+Monthly / quarterly rollups (from the weekly reports and stored daily extractions):
+  python run.py rollup --month 2026-01             # One model call per month
+  python run.py rollup --quarter 2026-Q1
+
+History index (past weeks' items retrieved for the synthesis and critical-items prompts):
+  python run.py history --rebuild                  # Index stored daily extractions + published reports
+  python run.py history "RFI footing rebar"        # Show what a query retrieves
+
+Daily metrics (personnel, equipment, weather per day, as NumPy columns in output/metrics/):
+  python run.py metrics                            # Manpower curve, equipment-days, weather-loss days
+  python run.py metrics --by month --from 2025-09-15 --rebuild
+
+Performance history (every run is recorded in output/perf.sqlite):
+  python run.py perf-report                        # Recent runs + stages vs rolling median
+  python run.py perf-report -c bennett_kew --threshold 50 --check
 """
 
 import sys
 import os
-import asyncio
+import time
 import argparse
 from pathlib import Path
-from dotenv import load_dotenv
 
 # Fix Windows console encoding
 os.environ["PYTHONUTF8"] = "1"
 if hasattr(sys.stdout, 'reconfigure'):
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
-# Load .env from project root
-load_dotenv(Path(__file__).parent / ".env")
-
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.orchestrator import run_pipeline
+from src.events import bus, ConsoleSink, NdjsonSink
 
+# The pipeline (orchestrator, agents, anthropic, fitz, ...) is imported by the
+# commands that run it, after argument parsing, so --help and the queue
+# commands start fast. See benchmarks/startup.py.
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Bennett-Kew Weekly Report Automation"
-    )
+
+def _load_env():
+    """Load .env from project root (API keys; only needed by commands that run the pipeline)."""
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent / ".env")
+
+
+def _add_run_options(parser: argparse.ArgumentParser):
+    """Per-run options shared by a direct run and a queued job."""
     parser.add_argument("--config", "-c", default="bennett_kew",
                         help="Project config name (default: bennett_kew)")
     parser.add_argument("--date", "-d", default=None,
@@ -54,10 +91,414 @@ def main():
                         help="Extract and assemble but don't generate PDF")
     parser.add_argument("--debug", action="store_true",
                         help="Save intermediate outputs for debugging")
+    parser.add_argument("--resume", action="store_true",
+                        help="Load unchanged stage outputs from checkpoints")
+    parser.add_argument("--from-stage", type=int, default=None,
+                        help="Rerun stages >= N (2=PDF text ... 7=email); earlier stages load from checkpoints")
+
+
+def _add_service_options(parser: argparse.ArgumentParser):
     parser.add_argument("--backend", "-b", choices=["api", "cli"], default="api",
                         help="AI backend: api (Anthropic API) or cli (Claude CLI)")
+    parser.add_argument("--events", default=None, metavar="PATH",
+                        help="Also write structured progress events to PATH as NDJSON")
+
+
+def _queue_path(arg: str | None) -> str:
+    from src.job_queue import DEFAULT_QUEUE
+    return arg or os.environ.get("REPORT_QUEUE") or str(DEFAULT_QUEUE)
+
+
+def serve_main(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="run.py serve",
+                                     description="Run queued report jobs on warm workers")
+    parser.add_argument("--queue", default=None,
+                        help="Queue database (default: $REPORT_QUEUE or output/queue.sqlite)")
+    parser.add_argument("--workers", "-w", type=int, default=2,
+                        help="Jobs run concurrently on this host (default: 2)")
+    parser.add_argument("--max-concurrency", type=int, default=6,
+                        help="Max concurrent AI calls across this host's jobs (default: 6)")
+    parser.add_argument("--poll", type=float, default=2.0,
+                        help="Seconds between queue polls when idle (default: 2)")
+    parser.add_argument("--lease", type=float, default=600.0,
+                        help="Seconds before a silent worker's job is handed to another (default: 600)")
+    parser.add_argument("--once", action="store_true",
+                        help="Exit when the queue is empty instead of waiting for more jobs")
+    _add_service_options(parser)
+    args = parser.parse_args(argv)
+    _load_env()
+    import asyncio
+    from src.service import serve
+    from src.multi_runner import print_summary
+
+    bus.subscribe(ConsoleSink(show_project=True))
+    if args.events:
+        bus.subscribe(NdjsonSink(args.events))
+
+    start = time.time()
+    try:
+        results = asyncio.run(serve(
+            _queue_path(args.queue), workers=args.workers,
+            max_concurrency=args.max_concurrency, backend=args.backend,
+            poll_interval=args.poll, lease_seconds=args.lease, exit_when_idle=args.once))
+    except KeyboardInterrupt:
+        print("\nStopped; running jobs will be retried when their lease expires.")
+        return
+    if results:
+        print_summary(results, wall_time=time.time() - start)
+
+
+def enqueue_main(argv: list[str]):
+    from src.job_queue import JobQueue
+    parser = argparse.ArgumentParser(prog="run.py enqueue",
+                                     description="Add report jobs to the service queue")
+    parser.add_argument("--queue", default=None,
+                        help="Queue database (default: $REPORT_QUEUE or output/queue.sqlite)")
+    parser.add_argument("--priority", "-p", type=int, default=0,
+                        help="Higher runs first (default: 0)")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="Attempts before the job is marked failed (default: 3)")
+    _add_run_options(parser)
+    parser.add_argument("--configs", default=None,
+                        help="Comma-separated configs: enqueue one job per project")
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(_queue_path(args.queue))
+    names = [n.strip() for n in args.configs.split(",") if n.strip()] if args.configs \
+        else [args.config]
+    options = {k: v for k, v in {
+        "report_number": args.report_num,
+        "skip_email": args.skip_email,
+        "skip_photos": args.skip_photos,
+        "skip_outlook": args.skip_outlook,
+        "dry_run": args.dry_run,
+        "debug": args.debug,
+        "resume": args.resume,
+        "from_stage": args.from_stage,
+    }.items() if v not in (None, False)}
+    for name in names:
+        job_id = queue.enqueue(name, target_date=args.date, priority=args.priority,
+                               max_attempts=args.max_attempts, **options)
+        print(f"Enqueued job {job_id}: {name} {args.date or 'current'} "
+              f"(priority {args.priority})")
+
+
+def jobs_main(argv: list[str]):
+    from src.job_queue import JobQueue
+    parser = argparse.ArgumentParser(prog="run.py jobs", description="Show queued report jobs")
+    parser.add_argument("--queue", default=None,
+                        help="Queue database (default: $REPORT_QUEUE or output/queue.sqlite)")
+    parser.add_argument("--status", choices=["queued", "running", "done", "failed"], default=None)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(_queue_path(args.queue))
+    counts = queue.counts()
+    print("  ".join(f"{k}: {counts.get(k, 0)}" for k in ("queued", "running", "done", "failed")))
+    for job in queue.jobs(status=args.status, limit=args.limit):
+        detail = job["error"] or (job["result"] or {}).get("pdf_path") or job["lease_owner"] or ""
+        print(f"  {job['id']:>5}  {job['config_name']:<20} {job['target_date'] or 'current':<12} "
+              f"p{job['priority']:<3} {job['status']:<8} {job['attempts']}/{job['max_attempts']}  {detail}")
+
+
+def backfill_main(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="run.py backfill",
+                                     description="Regenerate every report week in a date range")
+    parser.add_argument("--config", "-c", default="bennett_kew",
+                        help="Project config name (default: bennett_kew)")
+    parser.add_argument("--from", dest="date_from", required=True,
+                        help="First week (any date in it) YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", required=True,
+                        help="Last report Friday YYYY-MM-DD (inclusive)")
+    parser.add_argument("--max-concurrency", type=int, default=6,
+                        help="Max concurrent AI calls across all weeks (default: 6)")
+    parser.add_argument("--max-jobs", type=int, default=4,
+                        help="Weeks processed at once (default: 4)")
+    parser.add_argument("--from-stage", type=int, default=None,
+                        help="Rerun stages >= N for every week; earlier stages load from checkpoints")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore existing checkpoints and rerun every stage")
+    parser.add_argument("--skip-photos", action="store_true",
+                        help="Skip AI photo selection")
+    parser.add_argument("--with-email", action="store_true",
+                        help="Also draft principal emails (off by default for history)")
+    parser.add_argument("--publish", action="store_true",
+                        help="Copy PDFs to the NAS reports folder (off by default)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Extract and assemble but don't generate PDFs")
+    _add_service_options(parser)
+    args = parser.parse_args(argv)
+    _load_env()
+    import asyncio
+    from src.backfill import backfill_jobs, write_index
+    from src.multi_runner import run_many, print_summary
+    from src.rate_limiter import BACKFILL_PRIORITY
+
+    bus.subscribe(ConsoleSink(show_project=True))
+    if args.events:
+        bus.subscribe(NdjsonSink(args.events))
+
+    jobs = backfill_jobs(
+        args.config, args.date_from, args.date_to,
+        skip_email=not args.with_email,
+        skip_outlook=True,
+        skip_photos=args.skip_photos,
+        skip_nas=not args.publish,
+        dry_run=args.dry_run,
+        resume=not args.fresh,
+        from_stage=2 if args.fresh else args.from_stage,  # 2 also bypasses the daily store
+    )
+    if not jobs:
+        print(f"No report Fridays between {args.date_from} and {args.date_to}")
+        sys.exit(1)
+
+    start = time.time()
+    results = asyncio.run(run_many(jobs, max_concurrency=args.max_concurrency,
+                                   backend=args.backend, max_jobs=args.max_jobs,
+                                   job_priority=BACKFILL_PRIORITY))
+    print_summary(results, wall_time=time.time() - start)
+    index_path = write_index(results, args.config, args.date_from, args.date_to)
+    print(f"Index: {index_path}")
+    if any(r.get("error") for r in results):
+        sys.exit(1)
+
+
+def ingest_day_main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="run.py ingest-day",
+        description="Extract and store this week's daily reports as they land on the NAS")
+    parser.add_argument("--config", "-c", default="bennett_kew",
+                        help="Project config name (default: bennett_kew)")
+    parser.add_argument("--date", "-d", default=None,
+                        help="Ingest the week's reports up to this date YYYY-MM-DD (default: today)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract days that are already stored")
+    _add_service_options(parser)
+    args = parser.parse_args(argv)
+    _load_env()
+    import asyncio
+    from src.orchestrator import ingest_day
+
+    bus.subscribe(ConsoleSink())
+    if args.events:
+        bus.subscribe(NdjsonSink(args.events))
+
+    result = asyncio.run(ingest_day(args.config, day=args.date, backend=args.backend,
+                                    force=args.force))
+    print(f"Ingested: {len(result['ingested'])}  Missing: {len(result['missing'])}  "
+          f"Failed: {len(result['failed'])}")
+    if result["failed"]:
+        sys.exit(1)
+
+
+def rollup_main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="run.py rollup",
+        description="Monthly or quarterly summary from the weekly reports already generated")
+    parser.add_argument("--config", "-c", default="bennett_kew",
+                        help="Project config name (default: bennett_kew)")
+    period = parser.add_mutually_exclusive_group(required=True)
+    period.add_argument("--month", help="Month to summarize, YYYY-MM")
+    period.add_argument("--quarter", help="Quarter to summarize, YYYY-Qn (e.g. 2026-Q1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Redo the model calls even if nothing changed")
+    parser.add_argument("--events", default=None, metavar="PATH",
+                        help="Also append pipeline events as NDJSON to PATH")
+    args = parser.parse_args(argv)
+    _load_env()
+    import asyncio
+    from src.orchestrator import rollup_report
+
+    bus.subscribe(ConsoleSink())
+    if args.events:
+        bus.subscribe(NdjsonSink(args.events))
+
+    try:
+        result = asyncio.run(rollup_report(args.config, period=args.month or args.quarter,
+                                           force=args.force))
+    except ValueError as e:
+        parser.error(str(e))
+    if result.get("error"):
+        sys.exit(1)
+    print(f"Rollup: {result['md_path']}")
+
+
+def perf_report_main(argv: list[str]):
+    from src.perf_history import (PerfHistory, format_report, PERF_DB,
+                                  DEFAULT_THRESHOLD, DEFAULT_WINDOW)
+    parser = argparse.ArgumentParser(prog="run.py perf-report",
+                                     description="Run-time trends and stage regressions")
+    parser.add_argument("--config", "-c", default=None,
+                        help="Only this project (default: all projects)")
+    parser.add_argument("--runs", type=int, default=10, help="Recent runs to list (default: 10)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD * 100,
+                        help="Flag stages this many percent slower than their median (default: 25)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="Earlier runs in the rolling median (default: 10)")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if the latest run has a flagged stage")
+    parser.add_argument("--db", default=None, help="History database (default: output/perf.sqlite)")
+    args = parser.parse_args(argv)
+
+    history = PerfHistory(args.db or PERF_DB)
+    threshold = args.threshold / 100
+    print(format_report(history, args.config, runs=args.runs, threshold=threshold,
+                        window=args.window))
+    latest = history.runs(args.config, limit=1)
+    if args.check and latest and history.regressions(latest[0]["run_id"], threshold, args.window):
+        sys.exit(1)
+
+
+def history_main(argv: list[str]):
+    from datetime import date
+    from src.history_index import HistoryIndex, format_history, rebuild, HISTORY_DB, TOP_K
+    from src.daily_store import DAILY_DIR
+    from src.workspace import REPORTS_DIR
+    parser = argparse.ArgumentParser(prog="run.py history",
+                                     description="Search or rebuild the past-weeks history index")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--config", "-c", default="bennett_kew",
+                        help="Project config name (default: bennett_kew)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-index the stored daily extractions and published report data")
+    parser.add_argument("--before", default=None, metavar="YYYY-MM-DD",
+                        help="Only weeks ending before this date (default: all)")
+    parser.add_argument("-k", type=int, default=TOP_K, help=f"Results (default: {TOP_K})")
+    parser.add_argument("--db", default=None, help="Index database (default: output/history.sqlite)")
+    args = parser.parse_args(argv)
+
+    index = HistoryIndex(args.db or HISTORY_DB)
+    if args.rebuild:
+        n = rebuild(args.config, index, DAILY_DIR / args.config, REPORTS_DIR / args.config)
+        print(f"Indexed {n} document(s) for {args.config}")
+    if args.query:
+        before = date.fromisoformat(args.before) if args.before else date.max
+        hits = index.search(args.config, [" ".join(args.query)], before, k=args.k)
+        print(format_history(hits, max_chars=10_000) or "No matches")
+    elif not args.rebuild:
+        counts = index.counts(args.config)
+        for source, n in sorted(counts.items()):
+            print(f"  {source:<24} {n:>6}")
+        print(f"  {'total':<24} {sum(counts.values()):>6}")
+
+
+def metrics_main(argv: list[str]):
+    from datetime import date
+    parser = argparse.ArgumentParser(prog="run.py metrics",
+                                     description="Manpower, equipment-days and weather-loss days "
+                                                 "from the daily report metrics")
+    parser.add_argument("--config", "-c", default="bennett_kew",
+                        help="Project config name (default: bennett_kew)")
+    parser.add_argument("--by", choices=("day", "week", "month"), default="week",
+                        help="Period for the manpower and weather tables (default: week)")
+    parser.add_argument("--from", dest="date_from", default=None, metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", default=None, metavar="YYYY-MM-DD")
+    parser.add_argument("--top", type=int, default=10, help="Equipment items to list (default: 10)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Rewrite the metrics from the stored daily extractions first")
+    args = parser.parse_args(argv)
+    from src.metrics_store import MetricsStore, rebuild
+    from src.daily_store import DAILY_DIR
+
+    store = MetricsStore(args.config)
+    if args.rebuild:
+        print(f"Rebuilt metrics from {rebuild(store, DAILY_DIR / args.config)} stored day(s)")
+    start = date.fromisoformat(args.date_from) if args.date_from else None
+    end = date.fromisoformat(args.date_to) if args.date_to else None
+
+    t0 = time.perf_counter()
+    manpower = store.manpower(args.by, start, end)
+    equipment = store.equipment_days(start, end)
+    weather = store.weather_days(args.by, start, end)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    print(f"Manpower by {args.by}:")
+    print(f"  {'Period':<12} {'Worker-days':>11} {'Days':>5} {'Avg crew':>9}")
+    for period, wd, n, avg in zip(manpower["period"], manpower["worker_days"],
+                                  manpower["days"], manpower["average"]):
+        print(f"  {str(period):<12} {wd:>11} {n:>5} {avg:>9.1f}")
+    print(f"\nEquipment-days (top {args.top}):")
+    for item, n in zip(equipment["item"][:args.top], equipment["days"][:args.top]):
+        print(f"  {n:>5}  {item}")
+    print(f"\nWeather by {args.by}:")
+    print(f"  {'Period':<12} {'Days':>5} {'Bad weather':>11} {'Lost':>5}")
+    for period, n, bad, lost in zip(weather["period"], weather["days"],
+                                    weather["weather"], weather["lost"]):
+        print(f"  {str(period):<12} {n:>5} {bad:>11} {lost:>5}")
+    print(f"\n{int(weather['days'].sum())} day(s), {int(weather['lost'].sum())} lost to weather "
+          f"(queried in {elapsed:.1f} ms)")
+
+
+COMMANDS = {
+    "serve": serve_main,
+    "enqueue": enqueue_main,
+    "jobs": jobs_main,
+    "backfill": backfill_main,
+    "ingest-day": ingest_day_main,
+    "rollup": rollup_main,
+    "perf-report": perf_report_main,
+    "history": history_main,
+    "metrics": metrics_main,
+}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Bennett-Kew Weekly Report Automation",
+        epilog="Commands: " + ", ".join(COMMANDS) + " (run.py <command> --help)",
+    )
+    _add_run_options(parser)
+    _add_service_options(parser)
+    parser.add_argument("--all-configs", action="store_true",
+                        help="Run every project in config/ in one process")
+    parser.add_argument("--configs", default=None,
+                        help="Comma-separated project configs to run in one process")
+    parser.add_argument("--max-concurrency", type=int, default=6,
+                        help="Max concurrent AI calls for multi-project runs (default: 6)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and memory of PDF extraction, XER parsing, photo encoding "
+                             "and rendering; write flamegraphs to output/profile/ (single project only)")
 
     args = parser.parse_args()
+    if args.profile and (args.all_configs or args.configs):
+        # The sampler sees every thread in the process, so concurrent projects would blur together
+        parser.error("--profile profiles one project; run it without --all-configs/--configs")
+    _load_env()
+    import asyncio
+    from src.orchestrator import run_pipeline
+    from src.multi_runner import list_configs, jobs_for_configs, run_many, print_summary
+
+    multi = bool(args.all_configs or args.configs)
+    bus.subscribe(ConsoleSink(show_project=multi))
+    if args.events:
+        bus.subscribe(NdjsonSink(args.events))
+
+    if multi:
+        names = list_configs() if args.all_configs else [
+            n.strip() for n in args.configs.split(",") if n.strip()]
+        jobs = jobs_for_configs(
+            names,
+            target_date=args.date,
+            report_number=args.report_num,
+            skip_email=args.skip_email,
+            skip_photos=args.skip_photos,
+            skip_outlook=args.skip_outlook,
+            dry_run=args.dry_run,
+            debug=args.debug,
+            resume=args.resume,
+            from_stage=args.from_stage,
+        )
+        start = time.time()
+        results = asyncio.run(run_many(jobs, max_concurrency=args.max_concurrency,
+                                       backend=args.backend))
+        print_summary(results, wall_time=time.time() - start)
+        if any(r.get("error") for r in results):
+            sys.exit(1)
+        return
 
     result = asyncio.run(run_pipeline(
         config_name=args.config,
@@ -69,6 +510,9 @@ def main():
         dry_run=args.dry_run,
         debug=args.debug,
         backend=args.backend,
+        resume=args.resume,
+        from_stage=args.from_stage,
+        profile=args.profile,
     ))
 
     if result.get("error"):
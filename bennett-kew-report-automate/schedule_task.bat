@@ -11,6 +11,7 @@ set LOG_DIR=%PROJECT_DIR%\output\logs
 set TIMESTAMP=%date:~10,4%%date:~4,2%%date:~7,2%_%time:~0,2%%time:~3,2%
 set TIMESTAMP=%TIMESTAMP: =0%
 set LOG_FILE=%LOG_DIR%\run_%TIMESTAMP%.log
+set EVENTS_FILE=%LOG_DIR%\run_%TIMESTAMP%.ndjson
 
 REM Create log directory if needed
 if not exist "%LOG_DIR%" mkdir "%LOG_DIR%"
@@ -20,7 +21,7 @@ echo ================================================== >> "%LOG_FILE%"
 
 cd /d "%PROJECT_DIR%"
 
-C:\Python314\python.exe run.py --backend api >> "%LOG_FILE%" 2>&1
+C:\Python314\python.exe run.py --backend api --events "%EVENTS_FILE%" >> "%LOG_FILE%" 2>&1
 
 if %ERRORLEVEL% EQU 0 (
     echo [%date% %time%] SUCCESS - Report generated >> "%LOG_FILE%"
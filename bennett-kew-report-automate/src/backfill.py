@@ -0,0 +1,52 @@
+"""
+Backfill: regenerate every report week in a date range as one bounded batch.
+Weeks run concurrently through the multi-project runner (one API client, a global
+cap on AI calls) with checkpoints on, so unchanged PDF text and per-day extractions
+are reused and only stages whose prompt or model changed are recomputed.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from .calendar_utils import report_fridays
+
+BACKFILL_DIR = Path(__file__).parent.parent / "output" / "backfill"
+
+
+def backfill_jobs(config_name: str, date_from: str, date_to: str,
+                  **pipeline_kwargs) -> list[dict]:
+    """One run_pipeline kwargs dict per report Friday in the range."""
+    return [
+        {"config_name": config_name, "target_date": friday.isoformat(), **pipeline_kwargs}
+        for friday in report_fridays(date_from, date_to)
+    ]
+
+
+def write_index(results: list[dict], config_name: str, date_from: str, date_to: str,
+                out_dir: str | Path = BACKFILL_DIR) -> Path:
+    """Write a JSON index of the generated reports, one entry per week, oldest first."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    reports = []
+    for r in sorted(results, key=lambda r: r["job"]["target_date"]):
+        reports.append({
+            "week_ending": r["job"]["target_date"],
+            "report_number": r.get("report_number"),
+            "status": "failed" if r.get("error") else "ok",
+            "pdf_path": str(r["pdf_path"]) if r.get("pdf_path") else None,
+            "json_path": str(r["json_path"]) if r.get("json_path") else None,
+            "duration": round(r.get("duration", 0), 1),
+            "error": r.get("error"),
+        })
+    index = {
+        "config": config_name,
+        "from": date_from,
+        "to": date_to,
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "reports": reports,
+    }
+    path = out_dir / f"index_{config_name}_{date_from}_{date_to}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return path
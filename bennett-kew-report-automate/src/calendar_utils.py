@@ -41,16 +41,7 @@ def get_report_week(target_date: str = None, report_number: int = None,
         rs = REPORT_START
 
     if target_date:
-        friday = datetime.strptime(target_date, "%Y-%m-%d").date()
-        # If not a Friday, find the Friday of that week
-        if friday.weekday() != 4:
-            days_to_friday = (4 - friday.weekday()) % 7
-            if days_to_friday == 0:
-                days_to_friday = 7
-            friday = friday + timedelta(days=days_to_friday)
-            # If target is past Friday, use previous Friday
-            if friday > datetime.strptime(target_date, "%Y-%m-%d").date() + timedelta(days=6):
-                friday -= timedelta(days=7)
+        friday = week_ending(datetime.strptime(target_date, "%Y-%m-%d").date())
     else:
         today = date.today()
         days_since_friday = (today.weekday() - 4) % 7
@@ -90,11 +81,31 @@ def get_report_week(target_date: str = None, report_number: int = None,
     )
 
 
+def report_fridays(date_from: str, date_to: str) -> list[date]:
+    """Every report Friday from the week containing date_from through date_to (inclusive)."""
+    friday = week_ending(datetime.strptime(date_from, "%Y-%m-%d").date())
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    fridays = []
+    while friday <= end:
+        fridays.append(friday)
+        friday += timedelta(days=7)
+    return fridays
+
+
 def weekday_dates(rw: ReportWeek) -> list[date]:
     """Return all 5 weekday dates."""
     return [rw.monday, rw.tuesday, rw.wednesday, rw.thursday, rw.friday]
 
 
+def week_ending(day: date) -> date:
+    """
+    The report Friday of the week containing day. A weekend day belongs to the
+    week ahead (the next Friday), as get_report_week places it; the pipeline,
+    daily store, history index and metrics store all key weeks this way.
+    """
+    return day + timedelta(days=(4 - day.weekday()) % 7)
+
+
 # School/federal holidays relevant to IUSD calendar (2025-2026 school year)
 KNOWN_HOLIDAYS = {
     date(2025, 9, 1): "Labor Day",
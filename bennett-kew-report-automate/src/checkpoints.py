@@ -0,0 +1,118 @@
+"""
+Checkpoints: content-addressed cache of stage outputs.
+Each entry is keyed by a hash of everything the stage output depends on
+(inputs, prompt files, model, input file contents), so a rerun can load
+unchanged stages from disk instead of repeating AI calls and PDF extraction.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import dataclasses
+from datetime import date, datetime
+from pathlib import Path
+
+
+def file_digest(path: str | Path) -> str | None:
+    """sha256 of a file's bytes, or None if it doesn't exist."""
+    if not path or not os.path.isfile(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _default(value):
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def fingerprint(material) -> str:
+    """Stable sha256 of any JSON-like value (dataclasses, dates and paths allowed)."""
+    blob = json.dumps(material, sort_keys=True, default=_default, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    On-disk checkpoint store under root/<stage>/<key>.json.
+    resume: load checkpoints on hit (writes always happen).
+    from_stage: if set, stages numbered below it load from checkpoints and
+                stages at or after it always rerun.
+    """
+
+    def __init__(self, root: str | Path, resume: bool = False, from_stage: int = None):
+        self.root = Path(root)
+        self.resume = resume or from_stage is not None
+        self.from_stage = from_stage
+        self.hits = 0
+        self.misses = 0
+
+    def may_reuse(self, stage_number: int) -> bool:
+        if not self.resume:
+            return False
+        if self.from_stage is not None:
+            return stage_number < self.from_stage
+        return True
+
+    def key(self, stage: str, material) -> str:
+        return fingerprint([stage, material])
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.json"
+
+    def load(self, stage: str, key: str) -> tuple[bool, object]:
+        path = self._path(stage, key)
+        if not path.exists():
+            self.misses += 1
+            return False, None
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, value
+
+    def save(self, stage: str, key: str, value):
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"stage": stage, "created": datetime.now().isoformat(), "value": value}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, default=_default)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    async def cached(self, stage: str, stage_number: int, material, compute, cacheable=None):
+        """
+        Return the checkpointed value for material, or await compute() and save
+        it (unless cacheable(value) is false, e.g. a failed call, so it is retried).
+        """
+        key = self.key(stage, material)
+        if self.may_reuse(stage_number):
+            hit, value = self.load(stage, key)
+            if hit:
+                return value
+        value = await compute()
+        if cacheable is None or cacheable(value):
+            self.save(stage, key, value)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
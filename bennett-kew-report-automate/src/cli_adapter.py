@@ -7,6 +7,19 @@ import json
 import asyncio
 from pathlib import Path
 
+from .tracing import span, set_attributes
+from . import events
+from .events import warning
+
+# Optional process-wide cap on concurrent CLI subprocesses (multi-project runs)
+_limit: asyncio.Semaphore | None = None
+
+
+def set_max_concurrency(n: int):
+    """Limit how many claude CLI processes may run at once across all callers."""
+    global _limit
+    _limit = asyncio.Semaphore(n)
+
 
 async def call_claude(
     prompt: str,
@@ -33,6 +46,17 @@ async def call_claude(
     Returns:
         Parsed JSON dict if json_schema provided, else raw text string.
     """
+    with span("cli.call_claude", **{"llm.model": model, "llm.prompt_chars": len(prompt)}):
+        if _limit is not None:
+            async with _limit:
+                return await _call_claude(prompt, system_prompt, model, json_schema,
+                                          tools, allowed_tools, add_dir, timeout)
+        return await _call_claude(prompt, system_prompt, model, json_schema,
+                                  tools, allowed_tools, add_dir, timeout)
+
+
+async def _call_claude(prompt, system_prompt, model, json_schema,
+                       tools, allowed_tools, add_dir, timeout) -> dict | str:
     cmd = [
         "claude",
         "-p",
@@ -69,7 +93,8 @@ async def call_claude(
             if proc.returncode != 0:
                 err_msg = stderr.decode("utf-8", errors="replace").strip()
                 if attempt == 0:
-                    print(f"  CLI attempt {attempt+1} failed (exit {proc.returncode}): {err_msg[:300]}")
+                    warning(f"  CLI attempt {attempt+1} failed (exit {proc.returncode}): {err_msg[:300]}",
+                            source="cli")
                     continue
                 raise RuntimeError(f"claude CLI failed (exit {proc.returncode}): {err_msg[:500]}")
 
@@ -77,11 +102,25 @@ async def call_claude(
             if not output:
                 err_msg = stderr.decode("utf-8", errors="replace").strip()
                 if attempt == 0:
-                    print(f"  CLI attempt {attempt+1}: empty stdout. stderr: {err_msg[:300]}")
+                    warning(f"  CLI attempt {attempt+1}: empty stdout. stderr: {err_msg[:300]}",
+                            source="cli")
                     continue
                 raise RuntimeError(f"claude CLI returned empty output. stderr: {err_msg[:500]}")
 
             envelope = json.loads(output)
+            usage = envelope.get("usage") or {}
+            set_attributes(**{
+                "llm.input_tokens": usage.get("input_tokens"),
+                "llm.output_tokens": usage.get("output_tokens"),
+                "llm.cost_usd": envelope.get("total_cost_usd"),
+                "cli.attempts": attempt + 1,
+            })
+            events.emit(events.LLM_CALL_FINISHED, backend="cli", model=model,
+                        input_tokens=usage.get("input_tokens"),
+                        output_tokens=usage.get("output_tokens"),
+                        cost_usd=envelope.get("total_cost_usd"),
+                        duration_ms=envelope.get("duration_ms"),
+                        attempts=attempt + 1)
 
             # --json-schema puts structured data in "structured_output", not "result"
             if json_schema:
@@ -107,7 +146,7 @@ async def call_claude(
                 msg = f"  CLI attempt {attempt+1} timed out after {timeout}s, retrying..."
                 if err_info:
                     msg += f"\n  [stderr] {err_info}"
-                print(msg)
+                warning(msg, source="cli")
                 continue
             raise TimeoutError(
                 f"claude CLI timed out after {timeout}s (2 attempts)"
@@ -117,9 +156,8 @@ async def call_claude(
         except json.JSONDecodeError as e:
             raw = output[:300] if 'output' in dir() else ""
             if attempt == 0:
-                print(f"  CLI attempt {attempt+1}: JSON parse error: {e}")
-                if raw:
-                    print(f"  [raw output] {raw}")
+                warning(f"  CLI attempt {attempt+1}: JSON parse error: {e}"
+                        + (f"\n  [raw output] {raw}" if raw else ""), source="cli")
                 continue
             raise RuntimeError(f"claude CLI returned invalid JSON: {e}\nRaw: {raw[:500]}")
 
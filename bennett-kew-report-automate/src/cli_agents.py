@@ -7,6 +7,8 @@ import os
 from pathlib import Path
 
 from .cli_adapter import call_claude
+from .daily_report_agent import day_label
+from .events import progress, warning
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
@@ -115,7 +117,7 @@ EMAIL_SCHEMA = {
 
 # ── Daily Report Agent (CLI) ────────────────────────────────────────────
 
-async def _extract_single_day_cli(text: str, day_label: str) -> dict:
+async def extract_single_day_cli(text: str, day_label: str) -> dict:
     """Extract data from one daily report via CLI."""
     system = (PROMPTS_DIR / "daily_report_system.md").read_text(encoding="utf-8")
     try:
@@ -126,11 +128,11 @@ async def _extract_single_day_cli(text: str, day_label: str) -> dict:
             json_schema=EXTRACT_DAILY_SCHEMA,
         )
     except Exception as e:
-        print(f"  CLI extraction failed for {day_label}: {e}")
+        warning(f"  CLI extraction failed for {day_label}: {e}")
         return {"date": day_label, "activities": [], "error": str(e)}
 
 
-async def _synthesize_week_cli(daily_extractions: list[dict],
+async def synthesize_week_cli(daily_extractions: list[dict],
                                report_week: str) -> dict:
     """Combine daily extractions into weekly narrative via CLI."""
     system = (PROMPTS_DIR / "weekly_synthesis_system.md").read_text(encoding="utf-8")
@@ -156,24 +158,23 @@ async def _synthesize_week_cli(daily_extractions: list[dict],
             json_schema=WEEKLY_SYNTHESIS_SCHEMA,
         )
     except Exception as e:
-        print(f"  CLI synthesis failed: {e}")
+        warning(f"  CLI synthesis failed: {e}")
         return {"error": str(e), "activities_completed": []}
 
 
 async def process_daily_reports_cli(daily_texts: list[dict],
                                     report_week_str: str) -> dict:
     """Process 5 daily reports sequentially, then synthesize."""
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
     extractions = []
 
     for i, dt in enumerate(daily_texts):
-        day_label = day_names[i] if i < len(day_names) else f"Day {i+1}"
-        print(f"  [CLI] Extracting {day_label}: {dt['filename']}")
-        ext = await _extract_single_day_cli(dt["full_text"], day_label)
+        label = day_label(i)
+        progress(f"  [CLI] Extracting {label}: {dt['filename']}")
+        ext = await extract_single_day_cli(dt["full_text"], label)
         extractions.append(ext)
 
-    print("  [CLI] Synthesizing weekly summary...")
-    result = await _synthesize_week_cli(extractions, report_week_str)
+    progress("  [CLI] Synthesizing weekly summary...")
+    result = await synthesize_week_cli(extractions, report_week_str)
     result["_daily_extractions"] = extractions
     return result
 
@@ -211,7 +212,7 @@ async def process_schedule_cli(schedule_text: str, report_week_str: str) -> dict
             json_schema=SCHEDULE_SCHEMA,
         )
     except Exception as e:
-        print(f"  CLI schedule extraction failed: {e}")
+        warning(f"  CLI schedule extraction failed: {e}")
         return empty_schedule_cli()
 
 
@@ -238,7 +239,7 @@ async def process_minutes_cli(minutes_text: str) -> dict:
             json_schema=MINUTES_SCHEMA,
         )
     except Exception as e:
-        print(f"  CLI minutes extraction failed: {e}")
+        warning(f"  CLI minutes extraction failed: {e}")
         return empty_minutes_cli()
 
 
@@ -286,7 +287,7 @@ async def select_photos_cli(candidate_photos: list, activities_completed: list[s
         )
         scores = result.get("scores", [])
     except Exception as e:
-        print(f"  CLI photo scoring failed: {e}")
+        warning(f"  CLI photo scoring failed: {e}")
         scores = []
 
     if not scores:
@@ -329,9 +330,11 @@ async def select_photos_cli(candidate_photos: list, activities_completed: list[s
 
 # ── Email Drafter (CLI) ──────────────────────────────────────────────────
 
-async def draft_email_cli(report_data: dict, config: dict) -> dict:
-    """Generate principal email via CLI."""
-    system = (PROMPTS_DIR / "email_draft_system.md").read_text(encoding="utf-8")
+async def draft_email_cli(report_data: dict, config: dict,
+                          prompt: str = "email_draft_system.md",
+                          audience: str = "principal") -> dict:
+    """Generate principal email via CLI (prompt/audience: see draft_email)."""
+    system = (PROMPTS_DIR / prompt).read_text(encoding="utf-8")
 
     context = (
         f"Report #{report_data['report_number']} for week of {report_data['report_week']}\n"
@@ -353,14 +356,14 @@ async def draft_email_cli(report_data: dict, config: dict) -> dict:
     try:
         # Use opus for email (same as premium API setting)
         return await call_claude(
-            prompt=f"Draft the principal email based on this week's data:\n\n{context}",
+            prompt=f"Draft the {audience} email based on this week's data:\n\n{context}",
             system_prompt=system,
             model="opus",
             json_schema=EMAIL_SCHEMA,
             timeout=120,
         )
     except Exception as e:
-        print(f"  CLI email draft failed: {e}")
+        warning(f"  CLI email draft failed: {e}")
         return {
             "subject": f"IUSD: Week #{report_data['report_number']} Construction Update - Bennett-Kew Project",
             "body": "(Email draft generation failed — please write manually)",
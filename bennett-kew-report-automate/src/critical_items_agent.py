@@ -5,9 +5,13 @@ Uses Sonnet for strong judgment and instruction-following.
 """
 
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+MODEL = "claude-sonnet-4-5-20250929"
 
 CRITICAL_ITEMS_TOOLS = [{
     "name": "critical_items_assessment",
@@ -27,14 +31,18 @@ CRITICAL_ITEMS_TOOLS = [{
 
 
 async def assess_critical_items(
-    client: AsyncAnthropic,
+    client: "AsyncAnthropic",
     daily_result: dict,
     schedule_result: dict,
     minutes_result: dict,
     report_week_str: str,
     weather_context: str = None,
+    history_context: str = None,
 ) -> list[str]:
-    """Review all extracted data and return 0-2 critical items."""
+    """
+    Review all extracted data and return 0-2 critical items.
+    history_context: related items from past weeks (history_index.format_history).
+    """
     system = (PROMPTS_DIR / "critical_items_system.md").read_text(encoding="utf-8")
 
     # Build context from all sources
@@ -98,10 +106,14 @@ async def assess_critical_items(
     if weather_context:
         sections.append(weather_context)
 
+    # Similar items from earlier weeks, to spot recurring or long-open issues
+    if history_context:
+        sections.append(f"RELATED ITEMS FROM PAST WEEKS:\n{history_context}")
+
     context = "\n\n".join(sections)
 
     response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+        model=MODEL,
         max_tokens=500,
         system=system,
         tools=CRITICAL_ITEMS_TOOLS,
@@ -6,10 +6,23 @@ Uses Anthropic API (Sonnet) for construction domain knowledge.
 import json
 import asyncio
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
+from .events import progress
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+EXTRACT_MODEL = "claude-haiku-4-5-20251001"
+SYNTHESIS_MODEL = "claude-sonnet-4-5-20250929"
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+def day_label(i: int) -> str:
+    return DAY_NAMES[i] if i < len(DAY_NAMES) else f"Day {i+1}"
+
 
 def _load_prompt(name: str) -> str:
     return (PROMPTS_DIR / name).read_text(encoding="utf-8")
@@ -54,11 +67,11 @@ SYNTHESIS_TOOLS = [{
 }]
 
 
-async def extract_single_day(client: AsyncAnthropic, text: str, day_label: str) -> dict:
+async def extract_single_day(client: "AsyncAnthropic", text: str, day_label: str) -> dict:
     """Extract data from one daily report. Sequential to manage tokens."""
     system = _load_prompt("daily_report_system.md")
     response = await client.messages.create(
-        model="claude-haiku-4-5-20251001",
+        model=EXTRACT_MODEL,
         max_tokens=1500,
         system=system,
         tools=EXTRACT_TOOLS,
@@ -74,9 +87,12 @@ async def extract_single_day(client: AsyncAnthropic, text: str, day_label: str)
     return {"date": day_label, "activities": [], "error": "No extraction"}
 
 
-async def synthesize_week(client: AsyncAnthropic, daily_extractions: list[dict],
-                          report_week: str) -> dict:
-    """Combine 5 daily extractions into weekly narrative summary."""
+async def synthesize_week(client: "AsyncAnthropic", daily_extractions: list[dict],
+                          report_week: str, history_context: str = None) -> dict:
+    """
+    Combine 5 daily extractions into weekly narrative summary.
+    history_context: related items from past weeks (history_index.format_history).
+    """
     system = _load_prompt("weekly_synthesis_system.md")
 
     # Build summary of all 5 days
@@ -89,9 +105,11 @@ async def synthesize_week(client: AsyncAnthropic, daily_extractions: list[dict],
         days_text += f"Testing: {'; '.join(ext.get('testing', []))}\n"
         days_text += f"Weather: {ext.get('weather', 'N/A')}\n"
         days_text += f"Coordination: {'; '.join(ext.get('coordination', []))}\n"
+    if history_context:
+        days_text += f"\nRELATED ITEMS FROM PAST WEEKS:\n{history_context}\n"
 
     response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+        model=SYNTHESIS_MODEL,
         max_tokens=2000,
         system=system,
         tools=SYNTHESIS_TOOLS,
@@ -110,22 +128,21 @@ async def synthesize_week(client: AsyncAnthropic, daily_extractions: list[dict],
     return {"error": "No synthesis", "activities_completed": []}
 
 
-async def process_daily_reports(client: AsyncAnthropic, daily_texts: list[dict],
+async def process_daily_reports(client: "AsyncAnthropic", daily_texts: list[dict],
                                 report_week_str: str) -> dict:
     """
     Main entry: process 5 daily reports sequentially, then synthesize.
     daily_texts: list of dicts from pdf_extractor.extract_daily_report()
     """
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
     extractions = []
 
     for i, dt in enumerate(daily_texts):
-        day_label = day_names[i] if i < len(day_names) else f"Day {i+1}"
-        print(f"  Extracting {day_label}: {dt['filename']}")
-        ext = await extract_single_day(client, dt["full_text"], day_label)
+        label = day_label(i)
+        progress(f"  Extracting {label}: {dt['filename']}")
+        ext = await extract_single_day(client, dt["full_text"], label)
         extractions.append(ext)
 
-    print("  Synthesizing weekly summary...")
+    progress("  Synthesizing weekly summary...")
     result = await synthesize_week(client, extractions, report_week_str)
     result["_daily_extractions"] = extractions  # keep for audit
     return result
@@ -0,0 +1,61 @@
+"""
+Daily Store: structured extractions of individual daily reports, persisted per day.
+`run.py ingest-day` fills it during the week as each PDF lands on the NAS; the
+Friday run reads it and only sends days that are missing (or whose PDF, model
+or prompt changed) to the model.
+"""
+
+import os
+import json
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+DAILY_DIR = Path(__file__).parent.parent / "output" / "daily"
+
+
+class DailyStore:
+    """One JSON file per project and day: root/<project>/<YYYY-MM-DD>.json."""
+
+    def __init__(self, project: str, root: str | Path = DAILY_DIR):
+        self.project = project
+        self.root = Path(root) / project
+
+    def path(self, day: date) -> Path:
+        return self.root / f"{day.isoformat()}.json"
+
+    def load(self, day: date, key: str = None) -> dict | None:
+        """
+        The stored record for day if it was extracted with the same key, else
+        None. key=None accepts whatever is stored (rollups).
+        """
+        path = self.path(day)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if key is None or record.get("key") == key else None
+
+    def save(self, day: date, key: str, source_path: str, extraction: dict) -> Path:
+        path = self.path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "date": day.isoformat(),
+            "key": key,
+            "source": os.path.basename(source_path),
+            "extracted_at": datetime.now().isoformat(timespec="seconds"),
+            "extraction": extraction,
+        }
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, indent=2)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
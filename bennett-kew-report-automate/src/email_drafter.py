@@ -5,9 +5,13 @@ NEVER sends email — saves to file for review.
 """
 
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+MODEL = "claude-opus-4-6"
 
 EMAIL_TOOLS = [{
     "name": "email_draft",
@@ -23,10 +27,15 @@ EMAIL_TOOLS = [{
 }]
 
 
-async def draft_email(client: AsyncAnthropic, report_data: dict,
-                      config: dict) -> dict:
-    """Generate principal email from assembled report data."""
-    system = (PROMPTS_DIR / "email_draft_system.md").read_text(encoding="utf-8")
+async def draft_email(client: "AsyncAnthropic", report_data: dict,
+                      config: dict, prompt: str = "email_draft_system.md",
+                      audience: str = "principal") -> dict:
+    """
+    Generate principal email from assembled report data.
+    prompt: system prompt file in prompts/; audience: who the email is for
+    (output profiles draft district or board emails the same way).
+    """
+    system = (PROMPTS_DIR / prompt).read_text(encoding="utf-8")
 
     # Build context for email generation
     context = (
@@ -47,14 +56,14 @@ async def draft_email(client: AsyncAnthropic, report_data: dict,
     )
 
     response = await client.messages.create(
-        model="claude-opus-4-6",
+        model=MODEL,
         max_tokens=1000,
         system=system,
         tools=EMAIL_TOOLS,
         tool_choice={"type": "tool", "name": "email_draft"},
         messages=[{
             "role": "user",
-            "content": f"Draft the principal email based on this week's data:\n\n{context}"
+            "content": f"Draft the {audience} email based on this week's data:\n\n{context}"
         }],
     )
 
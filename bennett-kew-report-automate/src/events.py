@@ -0,0 +1,142 @@
+"""
+Events: typed progress events with pluggable sinks.
+Pipeline code emits events instead of printing; sinks decide where they go
+(console pretty-printer, NDJSON log file, in-process subscribers such as
+dashboards or alerting). Emitting with no subscribers costs almost nothing.
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Iterable
+
+# ── Event types ──────────────────────────────────────────────────────────
+RUN_STARTED = "run_started"
+RUN_FINISHED = "run_finished"
+STAGE_STARTED = "stage_started"
+STAGE_FINISHED = "stage_finished"
+LLM_CALL_FINISHED = "llm_call_finished"
+FILE_RESOLVED = "file_resolved"
+ARTIFACT_WRITTEN = "artifact_written"
+PROGRESS = "progress"
+WARNING = "warning"
+ERROR = "error"
+
+EVENT_TYPES = {
+    RUN_STARTED, RUN_FINISHED, STAGE_STARTED, STAGE_FINISHED, LLM_CALL_FINISHED,
+    FILE_RESOLVED, ARTIFACT_WRITTEN, PROGRESS, WARNING, ERROR,
+}
+
+
+@dataclass
+class Event:
+    type: str
+    message: str = ""  # human-readable line; empty for machine-only events
+    data: dict = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+    run_id: str | None = None
+    project: str | None = None
+
+
+# Run identity stamped onto every event emitted inside run_context()
+_run: ContextVar[dict] = ContextVar("event_run", default={})
+
+
+@contextmanager
+def run_context(run_id: str, project: str):
+    token = _run.set({"run_id": run_id, "project": project})
+    try:
+        yield
+    finally:
+        _run.reset(token)
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers: list[tuple[Callable[[Event], None], set | None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Event], None],
+                  types: Iterable[str] = None) -> Callable[[], None]:
+        """Register callback for all events (or only the given types). Returns an unsubscribe function."""
+        entry = (callback, set(types) if types else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def _unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return _unsubscribe
+
+    def emit(self, event: Event):
+        if event.type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event.type}")
+        run = _run.get()
+        event.run_id = event.run_id or run.get("run_id")
+        event.project = event.project or run.get("project")
+        for callback, types in list(self._subscribers):
+            if types is None or event.type in types:
+                try:
+                    callback(event)
+                except Exception:
+                    pass  # a broken sink must never break the pipeline
+
+
+bus = EventBus()
+
+
+def emit(event_type: str, message: str = "", **data):
+    bus.emit(Event(type=event_type, message=message, data=data))
+
+
+def progress(message: str, **data):
+    emit(PROGRESS, message, **data)
+
+
+def warning(message: str, **data):
+    emit(WARNING, message, **data)
+
+
+# ── Sinks ────────────────────────────────────────────────────────────────
+
+class ConsoleSink:
+    """Pretty-prints every event that carries a message (same look as the old prints)."""
+
+    def __init__(self, show_project: bool = False):
+        self.show_project = show_project
+
+    def __call__(self, event: Event):
+        if not event.message:
+            return
+        if self.show_project and event.project:
+            lead = event.message[:len(event.message) - len(event.message.lstrip("\n"))]
+            print(f"{lead}[{event.project}] {event.message.lstrip(chr(10))}")
+        else:
+            print(event.message)
+
+
+class NdjsonSink:
+    """Appends one JSON object per event to a file (flushed per line, thread-safe)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        record = asdict(event)
+        record["message"] = record["message"].strip()
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,196 @@
+"""
+History Index: BM25 full-text index (SQLite FTS5) over past weeks' issues,
+OAC minutes items and reported critical items/milestones. Updated as each
+week's extractions are produced; the synthesis and critical-items prompts get
+only the few past snippets most relevant to this week, so recurring problems
+(an RFI open for four weeks) are visible without resending old reports.
+"""
+
+import re
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from .calendar_utils import week_ending
+
+HISTORY_DB = Path(__file__).parent.parent / "output" / "history.sqlite"
+
+TOP_K = 6
+MAX_CHARS = 1200  # ~300 tokens of history per prompt
+
+# The principal report's data; profile variants (report_data_22_district.json)
+# share its doc id and would replace its items
+_REPORT_DATA = re.compile(r"report_data_\d+\.json")
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS snippets USING fts5(
+    text,
+    project UNINDEXED,
+    doc UNINDEXED,
+    week UNINDEXED,
+    source UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# Which fields of each document are worth remembering
+DAILY_FIELDS = {"issues": "daily issue", "coordination": "daily coordination",
+                "testing": "daily testing"}
+MINUTES_FIELDS = {"critical_items": "OAC critical item",
+                  "coordination_items": "OAC coordination item"}
+REPORT_FIELDS = {"critical_items": "reported critical item",
+                 "milestones_achieved": "reported milestone"}
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "w", "of", "to", "in", "on", "at", "by", "a", "an",
+    "is", "are", "was", "were", "be", "been", "this", "that", "from", "as", "or",
+    "all", "per", "ops", "work", "week", "day", "daily", "site", "continued",
+}
+
+
+class HistoryIndex:
+    """FTS5 index shared by all projects; one connection per operation."""
+
+    def __init__(self, path: str | Path = HISTORY_DB, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # ── Updates (idempotent: a document's rows are replaced) ─────────────
+
+    def add(self, project: str, doc: str, week: date, items: list[tuple[str, str]]):
+        """Replace the snippets of one document with (source, text) items."""
+        rows = [(text.strip(), project, doc, week.isoformat(), source)
+                for source, text in items if text and text.strip()]
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM snippets WHERE project = ? AND doc = ?", (project, doc))
+                db.executemany("INSERT INTO snippets (text, project, doc, week, source) "
+                               "VALUES (?, ?, ?, ?, ?)", rows)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def add_daily(self, project: str, day: date, extraction: dict):
+        self.add(project, f"daily:{day.isoformat()}", week_ending(day),
+                 _items(extraction, DAILY_FIELDS))
+
+    def add_minutes(self, project: str, week: date, minutes_result: dict):
+        self.add(project, f"minutes:{week.isoformat()}", week,
+                 _items(minutes_result, MINUTES_FIELDS))
+
+    def add_report(self, project: str, week: date, report_data: dict):
+        self.add(project, f"report:{week.isoformat()}", week,
+                 _items(report_data, REPORT_FIELDS))
+
+    # ── Retrieval ───────────────────────────────────────────────────────
+
+    def search(self, project: str, texts: list[str], before: date,
+               k: int = TOP_K) -> list[dict]:
+        """
+        Past snippets (weeks ending before `before`) most relevant to texts, by
+        BM25. Identical snippets from several weeks are merged into one hit
+        listing every week, best first.
+        """
+        query = _fts_query(texts)
+        if not query:
+            return []
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT text, week, source, bm25(snippets) AS score FROM snippets "
+                "WHERE snippets MATCH ? AND project = ? AND week < ? "
+                "ORDER BY score LIMIT ?",
+                (query, project, before.isoformat(), k * 8)).fetchall()
+        hits: dict[str, dict] = {}
+        for row in rows:
+            key = " ".join(row["text"].lower().split())
+            hit = hits.setdefault(key, {"text": row["text"], "source": row["source"],
+                                        "score": row["score"], "weeks": set()})
+            hit["weeks"].add(row["week"])
+        ranked = sorted(hits.values(), key=lambda h: h["score"])[:k]
+        for hit in ranked:
+            hit["weeks"] = sorted(hit["weeks"])
+        return ranked
+
+    def counts(self, project: str = None) -> dict[str, int]:
+        query, params = "SELECT source, COUNT(*) AS n FROM snippets", []
+        if project:
+            query += " WHERE project = ?"
+            params.append(project)
+        with self._connect() as db:
+            return {r["source"]: r["n"] for r in db.execute(query + " GROUP BY source", params)}
+
+
+def _items(doc: dict, fields: dict[str, str]) -> list[tuple[str, str]]:
+    items = []
+    for field, source in fields.items():
+        value = doc.get(field) or []
+        for text in ([value] if isinstance(value, str) else value):
+            items.append((source, text))
+    return items
+
+
+def _fts_query(texts: list[str], max_terms: int = 64) -> str:
+    """OR of the distinct meaningful words in texts, each quoted (no FTS syntax leaks in)."""
+    terms = []
+    for text in texts:
+        for word in re.findall(r"\w+", (text or "").lower()):
+            if (len(word) > 2 or word.isdigit()) and word not in _STOPWORDS and word not in terms:
+                terms.append(word)
+    return " OR ".join(f'"{t}"' for t in terms[:max_terms])
+
+
+def format_history(hits: list[dict], max_chars: int = MAX_CHARS) -> str:
+    """Prompt section listing past snippets with the weeks they appeared in, within max_chars."""
+    lines = []
+    used = 0
+    for hit in hits:
+        weeks = ", ".join(datetime.strptime(w, "%Y-%m-%d").strftime("%m/%d") for w in hit["weeks"])
+        plural = "s" if len(hit["weeks"]) > 1 else ""
+        line = f"- {hit['text']} ({hit['source']}; week{plural} ending {weeks})"
+        if used + len(line) > max_chars:
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return "\n".join(lines)
+
+
+def rebuild(project: str, index: HistoryIndex, daily_dir: str | Path,
+            reports_dir: str | Path) -> int:
+    """
+    Re-index a project's stored daily extractions and published (principal)
+    report data; minutes are only indexed as runs produce them. Returns documents indexed.
+    """
+    n = 0
+    for path in sorted(Path(daily_dir).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        index.add_daily(project, date.fromisoformat(record["date"]), record["extraction"])
+        n += 1
+    for path in sorted(Path(reports_dir).glob("report_data_*.json")):
+        if not _REPORT_DATA.fullmatch(path.name):
+            continue
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            issued = datetime.strptime(data["issued_date"].split(", ", 1)[1], "%B %d, %Y").date()
+        except (KeyError, IndexError, ValueError):
+            continue
+        index.add_report(project, issued, data)
+        n += 1
+    return n
@@ -0,0 +1,197 @@
+"""
+Job Queue: persistent SQLite queue of report runs with priorities, leases and retries.
+A job is "project X, week Y, with options Z" (run_pipeline kwargs). Workers on any
+host that can open the database claim jobs under a time-limited lease, so a worker
+that dies mid-run simply lets its job become claimable again.
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_QUEUE = Path(__file__).parent.parent / "output" / "queue.sqlite"
+
+# A failed attempt is retried after RETRY_DELAY seconds, doubling per attempt
+RETRY_DELAY = 60.0
+RETRY_DELAY_MAX = 3600.0
+
+# run_pipeline kwargs a job may carry (everything except the project/week)
+JOB_OPTIONS = {
+    "report_number", "skip_email", "skip_photos", "skip_outlook",
+    "dry_run", "debug", "resume", "from_stage", "skip_nas",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    config_name   TEXT NOT NULL,
+    target_date   TEXT,
+    options       TEXT NOT NULL DEFAULT '{}',
+    priority      INTEGER NOT NULL DEFAULT 0,
+    status        TEXT NOT NULL DEFAULT 'queued',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 3,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    not_before    REAL,
+    enqueued_at   REAL NOT NULL,
+    started_at    REAL,
+    finished_at   REAL,
+    result        TEXT,
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, id);
+"""
+
+
+def worker_name(index: int = 0) -> str:
+    """Lease owner id unique per host, process and worker slot."""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue. Safe to share between processes and hosts: every
+    state change is a single short write transaction. On a NAS share the
+    default rollback journal is used (WAL needs shared memory, which network
+    filesystems don't provide).
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            columns = {r["name"] for r in db.execute("PRAGMA table_info(jobs)")}
+            if "not_before" not in columns:  # queues created before retry backoff
+                db.execute("ALTER TABLE jobs ADD COLUMN not_before REAL")
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit connection per operation: nothing holds the file open between calls
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # ── Producers ───────────────────────────────────────────────────────
+
+    def enqueue(self, config_name: str, target_date: str = None, priority: int = 0,
+                max_attempts: int = 3, **options) -> int:
+        """Add a job. Higher priority runs first; ties run oldest first. Returns job id."""
+        unknown = set(options) - JOB_OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown job options: {sorted(unknown)}")
+        with self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO jobs (config_name, target_date, options, priority, "
+                "max_attempts, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (config_name, target_date, json.dumps(options), priority,
+                 max_attempts, time.time()))
+            return cur.lastrowid
+
+    # ── Workers ─────────────────────────────────────────────────────────
+
+    def claim(self, owner: str, lease_seconds: float) -> dict | None:
+        """
+        Atomically take the next runnable job: queued (and past its retry
+        delay), or running with an expired lease (its worker died). Returns
+        the job, or None if idle.
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases that are out of attempts can never run again
+                db.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, "
+                    "error = COALESCE(error, 'lease expired') "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                    (FAILED, now, RUNNING, now))
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE attempts < max_attempts AND "
+                    "((status = ? AND (not_before IS NULL OR not_before <= ?)) "
+                    "OR (status = ? AND lease_expires < ?)) "
+                    "ORDER BY priority DESC, id LIMIT 1",
+                    (QUEUED, now, RUNNING, now)).fetchone()
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+                db.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, started_at = ? WHERE id = ?",
+                    (RUNNING, owner, now + lease_seconds, now, row["id"]))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        job = _row_to_job(row)
+        job.update(status=RUNNING, attempts=row["attempts"] + 1, lease_owner=owner)
+        return job
+
+    def heartbeat(self, job_id: int, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease. False if the lease was lost (expired and taken over)."""
+        with self._connect() as db:
+            cur = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? "
+                "AND status = ?", (time.time() + lease_seconds, job_id, owner, RUNNING))
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result: dict):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = NULL, "
+                "lease_expires = NULL WHERE id = ? AND lease_owner = ?",
+                (DONE, time.time(), json.dumps(result, default=str), job_id, owner))
+
+    def fail(self, job_id: int, owner: str, error: str, retry_delay: float = RETRY_DELAY):
+        """
+        Record a failed attempt. The job is requeued until max_attempts is
+        reached, claimable again after retry_delay seconds, doubled for every
+        earlier attempt (at most RETRY_DELAY_MAX).
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                "finished_at = ?, error = ?, lease_expires = NULL, "
+                "not_before = ? + MIN(?, ? * (1 << (attempts - 1))) "
+                "WHERE id = ? AND lease_owner = ?",
+                (QUEUED, FAILED, now, error, now, RETRY_DELAY_MAX, retry_delay, job_id, owner))
+
+    # ── Inspection ──────────────────────────────────────────────────────
+
+    def jobs(self, status: str = None, limit: int = 50) -> list[dict]:
+        """Most recent jobs first, optionally filtered by status."""
+        query, params = "SELECT * FROM jobs", []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as db:
+            return [_row_to_job(r) for r in db.execute(query, params)]
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as db:
+            return {r["status"]: r["n"] for r in db.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["options"] = json.loads(job["options"] or "{}")
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
@@ -7,6 +7,32 @@ import json
 import re
 from pathlib import Path
 from .calendar_utils import ReportWeek
+from .events import progress, warning
+
+INPUT_DIR = Path(__file__).parent.parent / "input"
+OVERRIDES_PATH = INPUT_DIR / "overrides.json"  # shared by projects without their own
+
+
+def overrides_path(project: str) -> Path:
+    """input/<project>/overrides.json if the project has one, else input/overrides.json."""
+    own = INPUT_DIR / project / "overrides.json"
+    return own if own.exists() else OVERRIDES_PATH
+
+
+def load_overrides(project: str) -> dict:
+    """
+    Manual field overrides for a project, read once at the start of a run so
+    edits made while it runs can't mix into half of it.
+    """
+    path = overrides_path(project)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        warning(f"  Warning: Could not load overrides from {path}: {e}", source="overrides")
+        return {}
 
 
 def apply_abbreviations(text: str, abbreviations: dict) -> str:
@@ -26,9 +52,11 @@ def apply_abbreviations_to_list(items: list[str], abbreviations: dict) -> list[s
 def assemble_json(config: dict, rw: ReportWeek,
                   daily_result: dict, schedule_result: dict,
                   minutes_result: dict, photo_result: dict,
-                  critical_items: list[str] = None) -> dict:
+                  critical_items: list[str] = None,
+                  overrides: dict = None) -> dict:
     """
     Merge all pipeline outputs into the final data dict.
+    overrides: manual field values applied last (see load_overrides).
     Returns the flat dict that generate_report.py expects.
     """
     static = config["static_data"]
@@ -83,15 +111,9 @@ def assemble_json(config: dict, rw: ReportWeek,
     data["logo_iusd"] = os.path.join(logos_dir, "iusd_logo.jpg")
 
     # Apply overrides if present
-    overrides_path = Path(__file__).parent.parent / "input" / "overrides.json"
-    if overrides_path.exists():
-        try:
-            with open(overrides_path) as f:
-                overrides = json.load(f)
-            data.update(overrides)
-            print(f"  Applied {len(overrides)} manual overrides")
-        except Exception as e:
-            print(f"  Warning: Could not load overrides: {e}")
+    if overrides:
+        data.update(overrides)
+        progress(f"  Applied {len(overrides)} manual overrides")
 
     # Validation
     _validate(data)
@@ -120,11 +142,11 @@ def _validate(data: dict):
     ]
     missing = [k for k in required if k not in data or not data[k]]
     if missing:
-        print(f"  WARNING: Missing required fields: {missing}")
+        warning(f"  WARNING: Missing required fields: {missing}", source="assemble")
 
     acts = data.get("activities_completed", [])
     if len(acts) < 5:
-        print(f"  WARNING: Only {len(acts)} activities (minimum 5 expected)")
+        warning(f"  WARNING: Only {len(acts)} activities (minimum 5 expected)", source="assemble")
     elif len(acts) > 7:
-        print(f"  WARNING: {len(acts)} activities (maximum 7 expected)")
+        warning(f"  WARNING: {len(acts)} activities (maximum 7 expected)", source="assemble")
         data["activities_completed"] = acts[:7]
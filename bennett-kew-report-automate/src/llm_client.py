@@ -0,0 +1,60 @@
+"""
+LLM client wrappers: intercept client.messages.create so one AsyncAnthropic
+client can be shared across agents and projects with common policies applied.
+Agents only ever call client.messages.create, so a wrapper is a drop-in client.
+"""
+
+import time
+
+from .tracing import span
+from . import events
+
+
+class _Messages:
+    def __init__(self, owner: "ClientWrapper"):
+        self._owner = owner
+
+    async def create(self, **kwargs):
+        return await self._owner._create(**kwargs)
+
+
+class ClientWrapper:
+    """Base wrapper: forwards everything to the wrapped client."""
+
+    def __init__(self, client):
+        self._client = client
+        self.messages = _Messages(self)
+
+    async def _create(self, **kwargs):
+        return await self._client.messages.create(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class TracedClient(ClientWrapper):
+    """
+    Wraps every messages.create call in a span with model and token usage,
+    and emits an llm_call_finished event.
+    """
+
+    async def _create(self, **kwargs):
+        model = kwargs.get("model")
+        tool = (kwargs.get("tool_choice") or {}).get("name")
+        start = time.perf_counter()
+        with span("llm.messages.create", **{"llm.model": model, "llm.tool": tool,
+                                            "llm.max_tokens": kwargs.get("max_tokens")}) as s:
+            response = await super()._create(**kwargs)
+            usage = getattr(response, "usage", None)
+            input_tokens = getattr(usage, "input_tokens", None)
+            output_tokens = getattr(usage, "output_tokens", None)
+            if s:
+                s.set(**{
+                    "llm.input_tokens": input_tokens,
+                    "llm.output_tokens": output_tokens,
+                    "llm.cache_read_tokens": getattr(usage, "cache_read_input_tokens", None),
+                })
+        events.emit(events.LLM_CALL_FINISHED, backend="api", model=model, tool=tool,
+                    input_tokens=input_tokens, output_tokens=output_tokens,
+                    duration=time.perf_counter() - start)
+        return response
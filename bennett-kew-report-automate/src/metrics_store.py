@@ -0,0 +1,203 @@
+"""
+Metrics Store: the per-day numbers from daily report extraction (personnel,
+equipment, subcontractors, testing, weather) as NumPy columns, one .npz
+partition per project and report week: output/metrics/<project>/<friday>.npz.
+A week's partition is written whole whenever its days are extracted (ingest-day
+and the Friday run), so queries over the whole project (manpower curves,
+equipment-days, weather-loss days) are a few vectorized array operations
+instead of a scan of the daily JSON files.
+"""
+
+import io
+import re
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from .calendar_utils import week_ending
+from .publisher import write_atomic
+
+METRICS_DIR = Path(__file__).parent.parent / "output" / "metrics"
+
+# Rain/wind/heat in the weather field, and signs that it cost the day's work
+_WEATHER = re.compile(r"\b(rain\w*|storm\w*|thunder\w*|showers?|flood\w*|high winds?|"
+                      r"red flag|excessive heat|heat advisory)\b", re.I)
+_NO_RAIN = re.compile(r"\bno (rain|precip\w*)\b", re.I)
+_LOST = re.compile(r"\b(no work|weather day|rain day|rained out|cancel\w*|suspend\w*|"
+                   r"halt\w*|stopp\w*|shut ?down|delay\w*|postpon\w*|lost)\b", re.I)
+_INT = re.compile(r"\d+")
+
+# Column names and dtypes of a partition; items are one row per (day, item)
+DAY_COLUMNS = {"day": "datetime64[D]", "personnel": np.int32, "tests": np.int16,
+               "weather": np.bool_, "weather_loss": np.bool_}
+ITEM_TABLES = ("equipment", "subcontractors")
+
+
+def _personnel(value) -> int:
+    """First number in the personnel count ("12", "approx. 12 workers"); -1 if none."""
+    m = _INT.search(str(value or ""))
+    return int(m.group()) if m else -1
+
+
+def _item(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def day_row(extraction: dict) -> dict:
+    """Per-day values of one extraction: personnel, tests, weather, weather_loss."""
+    weather = extraction.get("weather") or ""
+    personnel = _personnel(extraction.get("personnel_count"))
+    bad_weather = bool(_WEATHER.search(weather)) and not _NO_RAIN.search(weather)
+    impact = " ".join([weather, *extraction.get("issues", [])])
+    return {
+        "personnel": personnel,
+        "tests": len(extraction.get("testing", [])),
+        "weather": bad_weather,
+        "weather_loss": bad_weather and (personnel == 0 or bool(_LOST.search(impact))),
+    }
+
+
+def to_columns(days: list[tuple[date, dict]]) -> dict[str, np.ndarray]:
+    """(date, extraction) pairs -> the partition's arrays."""
+    rows = [day_row(e) for _, e in days]
+    cols = {"day": np.array([d.isoformat() for d, _ in days], dtype="datetime64[D]")}
+    for name, dtype in DAY_COLUMNS.items():
+        if name != "day":
+            cols[name] = np.array([r[name] for r in rows], dtype=dtype)
+    for table in ITEM_TABLES:
+        pairs = sorted({(d.isoformat(), _item(i)) for d, e in days
+                        for i in e.get(table, []) if i and i.strip()})
+        cols[f"{table}.day"] = np.array([p[0] for p in pairs], dtype="datetime64[D]")
+        cols[f"{table}.item"] = np.array([p[1] for p in pairs], dtype=str)
+    return cols
+
+
+def _period(days: np.ndarray, by: str) -> np.ndarray:
+    """Bucket each day: itself, its report Friday (as week_ending), or the first of its month."""
+    if by == "day":
+        return days
+    if by == "week":
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        return days + (4 - weekday) % 7
+    if by == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"by must be day, week or month, got {by!r}")
+
+
+class MetricsStore:
+    """Columnar daily metrics for one project; partitions are cached by mtime."""
+
+    def __init__(self, project: str, root: str | Path = METRICS_DIR):
+        self.project = project
+        self.root = Path(root) / project
+        self._lock = threading.Lock()
+        self._cache: tuple | None = None  # (partition stamps, columns)
+
+    def partition(self, friday: date) -> Path:
+        return self.root / f"{friday.isoformat()}.npz"
+
+    def write_days(self, days: list[tuple[date, dict]]) -> list[Path]:
+        """
+        Write the partitions of the weeks these (date, extraction) days fall in.
+        Each partition holds exactly the given days of its week, so pass every
+        extracted day of a week (as extract_days does). Failed extractions are skipped.
+        """
+        weeks: dict[date, list] = {}
+        for d, e in days:
+            if not e.get("error"):
+                weeks.setdefault(week_ending(d), []).append((d, e))
+        paths = []
+        for friday, week in sorted(weeks.items()):
+            buf = io.BytesIO()
+            np.savez(buf, **to_columns(sorted(week, key=lambda x: x[0])))
+            paths.append(write_atomic(self.partition(friday), buf.getvalue()))
+        return paths
+
+    def columns(self, start: date = None, end: date = None) -> dict[str, np.ndarray]:
+        """All partitions concatenated (then filtered to start..end inclusive)."""
+        files = sorted(self.root.glob("*.npz"))
+        stamps = tuple((f.name, f.stat().st_mtime_ns) for f in files)
+        with self._lock:
+            if self._cache and self._cache[0] == stamps:
+                cols = self._cache[1]
+            else:
+                parts = []
+                for f in files:
+                    with np.load(f) as z:
+                        parts.append({k: z[k] for k in z.files})
+                cols = {}
+                for name, dtype in [*DAY_COLUMNS.items(),
+                                    *((f"{t}.day", "datetime64[D]") for t in ITEM_TABLES),
+                                    *((f"{t}.item", str) for t in ITEM_TABLES)]:
+                    arrays = [p[name] for p in parts if name in p]
+                    cols[name] = np.concatenate(arrays) if arrays else np.array([], dtype=dtype)
+                self._cache = (stamps, cols)
+        if start is None and end is None:
+            return cols
+        lo = np.datetime64(start or date.min, "D")
+        hi = np.datetime64(end or date.max, "D")
+        out = {}
+        for name, values in cols.items():
+            table = name.split(".")[0] if "." in name else None
+            days = cols[f"{table}.day"] if table else cols["day"]
+            out[name] = values[(days >= lo) & (days <= hi)]
+        return out
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def manpower(self, by: str = "week", start: date = None, end: date = None) -> dict[str, np.ndarray]:
+        """
+        Manpower curve: per period, worker-days, days with a reported count,
+        and the average crew size on those days. Days without a count are left out.
+        """
+        cols = self.columns(start, end)
+        known = cols["personnel"] >= 0
+        periods, idx = np.unique(_period(cols["day"][known], by), return_inverse=True)
+        worker_days = np.bincount(idx, weights=cols["personnel"][known],
+                                  minlength=len(periods)).astype(np.int64)
+        days = np.bincount(idx, minlength=len(periods))
+        return {"period": periods, "worker_days": worker_days, "days": days,
+                "average": np.divide(worker_days, days, out=np.zeros(len(periods)),
+                                     where=days > 0)}
+
+    def item_days(self, table: str = "equipment", start: date = None,
+                  end: date = None) -> dict[str, np.ndarray]:
+        """Days on site per equipment item (or subcontractor), most days first."""
+        if table not in ITEM_TABLES:
+            raise ValueError(f"table must be one of {ITEM_TABLES}, got {table!r}")
+        cols = self.columns(start, end)
+        items, counts = np.unique(cols[f"{table}.item"], return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        return {"item": items[order], "days": counts[order]}
+
+    def equipment_days(self, start: date = None, end: date = None) -> dict[str, np.ndarray]:
+        return self.item_days("equipment", start, end)
+
+    def weather_days(self, by: str = "month", start: date = None,
+                     end: date = None) -> dict[str, np.ndarray]:
+        """Per period: workdays reported, bad-weather days and weather-loss days."""
+        cols = self.columns(start, end)
+        periods, idx = np.unique(_period(cols["day"], by), return_inverse=True)
+        n = len(periods)
+        return {"period": periods, "days": np.bincount(idx, minlength=n),
+                "weather": np.bincount(idx, weights=cols["weather"], minlength=n).astype(np.int64),
+                "lost": np.bincount(idx, weights=cols["weather_loss"], minlength=n).astype(np.int64)}
+
+    def weather_loss_days(self, start: date = None, end: date = None) -> np.ndarray:
+        """The dates on which weather cost the day's work."""
+        cols = self.columns(start, end)
+        return cols["day"][cols["weather_loss"]]
+
+
+def rebuild(store: MetricsStore, daily_dir: str | Path) -> int:
+    """Rewrite every partition from a project's stored daily extractions. Returns days."""
+    days = []
+    for path in sorted(Path(daily_dir).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        days.append((date.fromisoformat(record["date"]), record["extraction"]))
+    store.write_days(days)
+    return len(days)
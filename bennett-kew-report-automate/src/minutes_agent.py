@@ -4,9 +4,13 @@ Uses Anthropic API (Haiku) for simple text extraction.
 """
 
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+MODEL = "claude-sonnet-4-5-20250929"
 
 MINUTES_TOOLS = [{
     "name": "minutes_data",
@@ -25,12 +29,12 @@ MINUTES_TOOLS = [{
 }]
 
 
-async def process_minutes(client: AsyncAnthropic, minutes_text: str) -> dict:
+async def process_minutes(client: "AsyncAnthropic", minutes_text: str) -> dict:
     """Extract key information from meeting minutes text."""
     system = (PROMPTS_DIR / "minutes_extraction_system.md").read_text(encoding="utf-8")
 
     response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+        model=MODEL,
         max_tokens=1000,
         system=system,
         tools=MINUTES_TOOLS,
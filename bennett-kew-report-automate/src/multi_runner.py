@@ -0,0 +1,99 @@
+"""
+Multi-project runner: fans out run_pipeline over several project configs in one
+process, sharing a single rate-limited API client and one worker-thread pool,
+then prints a combined summary table.
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .orchestrator import PROJECT_ROOT, run_pipeline
+from .rate_limiter import new_client, priority
+from .events import progress
+from . import cli_adapter
+
+
+def list_configs() -> list[str]:
+    """All project config names in config/, skipping templates (leading underscore)."""
+    return sorted(
+        p.stem for p in (PROJECT_ROOT / "config").glob("*.json")
+        if not p.stem.startswith("_")
+    )
+
+
+def jobs_for_configs(config_names: list[str], **pipeline_kwargs) -> list[dict]:
+    """One run_pipeline kwargs dict per config, with shared options applied."""
+    return [{"config_name": name, **pipeline_kwargs} for name in config_names]
+
+
+async def run_many(jobs: list[dict],
+                   max_concurrency: int = 6,
+                   workers: int = 8,
+                   backend: str = "api",
+                   max_jobs: int = None,
+                   job_priority: int = 0) -> list[dict]:
+    """
+    Run several pipelines concurrently in this process.
+    jobs: run_pipeline kwargs per run (config_name, target_date, ...).
+    max_concurrency: cap on in-flight AI calls across every job and model (the
+                     adaptive limiter may run fewer when the API pushes back).
+    workers: size of the shared thread pool for PDF extraction/rendering.
+    max_jobs: cap on pipelines running at once (default: all of them).
+    job_priority: queueing priority of these jobs' AI calls on the shared client.
+    Returns one result dict per job, in job order, each tagged with "job".
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=workers))
+
+    client = None
+    if backend == "api":
+        client = new_client(max_concurrency)
+    else:
+        cli_adapter.set_max_concurrency(max_concurrency)
+
+    job_slots = asyncio.Semaphore(max_jobs or len(jobs) or 1)
+
+    async def _one(job: dict) -> dict:
+        async with job_slots:
+            start = time.time()
+            try:
+                with priority(job_priority):
+                    result = await run_pipeline(**job, backend=backend, client=client)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+        result.setdefault("duration", time.time() - start)
+        result["job"] = job
+        return result
+
+    print(f"Running {len(jobs)} report(s), max {max_concurrency} concurrent AI calls, "
+          f"{workers} worker threads")
+    results = list(await asyncio.gather(*(_one(job) for job in jobs)))
+    if client is not None and client.limiters:
+        progress(f"AI calls: {client.format_stats()}")
+    return results
+
+
+def print_summary(results: list[dict], wall_time: float = None):
+    """Combined table: one row per job."""
+    print("\n" + "=" * 78)
+    print(f"  {'Project':<22} {'Week':<12} {'#':>3}  {'Status':<8} {'Time':>7}  Output")
+    print("-" * 78)
+    for r in results:
+        job = r.get("job", {})
+        name = job.get("config_name", "?")
+        week = job.get("target_date") or "current"
+        num = r.get("report_number", "")
+        num = f"{num:02d}" if isinstance(num, int) else "--"
+        status = "FAILED" if r.get("error") else "OK"
+        detail = r.get("error") or r.get("pdf_path") or r.get("json_path") or ""
+        print(f"  {name:<22} {week:<12} {num:>3}  {status:<8} "
+              f"{r.get('duration', 0):>6.1f}s  {detail}")
+    print("-" * 78)
+    failed = sum(1 for r in results if r.get("error"))
+    line = f"  {len(results) - failed}/{len(results)} succeeded"
+    if wall_time is not None:
+        serial = sum(r.get("duration", 0) for r in results)
+        line += f" in {wall_time:.1f}s wall ({serial:.1f}s if run one at a time)"
+    print(line)
+    print("=" * 78)
@@ -6,25 +6,54 @@ import os
 import sys
 import json
 import time
-import shutil
+import uuid
 import asyncio
+import sqlite3
+import threading
+import importlib.util
+from contextlib import contextmanager
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from datetime import date, datetime, timedelta
 
-from .calendar_utils import get_report_week, ReportWeek, upcoming_holidays
-from .file_resolver import resolve_all_files, ResolvedFiles
+from .calendar_utils import get_report_week, ReportWeek, upcoming_holidays, weekday_dates
+from .file_resolver import resolve_all_files, resolve_daily_reports, ResolvedFiles
 from .pdf_extractor import extract_daily_report, extract_schedule_table, extract_meeting_minutes
-from .daily_report_agent import process_daily_reports
+from . import daily_report_agent, schedule_agent, minutes_agent
+from . import photo_selector, critical_items_agent
+from .daily_report_agent import extract_single_day, synthesize_week
 from .schedule_agent import process_schedule, empty_schedule
 from .minutes_agent import process_minutes, empty_minutes
 from .photo_selector import select_photos
-from .json_assembler import assemble_json
+from .json_assembler import assemble_json, load_overrides
+from .output_profiles import OutputProfile, load_profiles
 from .email_drafter import draft_email
 from .critical_items_agent import assess_critical_items
 from .xer_parser import format_master_schedule_context
+from .stage_graph import Stage, run_graph
+from .checkpoints import CheckpointStore, file_digest, fingerprint
+from .daily_store import DailyStore
+from . import rollup
+from .history_index import HistoryIndex, format_history
+from .perf_history import PerfHistory, summarize_trace, PERF_DB
+from .workspace import Workspace, prune_workspaces
+from .project_book import ProjectBook, BOOK_NAME
+from .publisher import write_all, write_atomic, copy_verified
+from .llm_client import TracedClient
+from .rate_limiter import new_client
+from .tracing import trace_run, span, current_span, set_attributes
+from . import events
+from .events import progress, warning, emit
 
 PROJECT_ROOT = Path(__file__).parent.parent
 PDF_GENERATOR_DIR = None  # Set from config
+PROMPTS_DIR = PROJECT_ROOT / "prompts"
+CHECKPOINT_DIR = PROJECT_ROOT / "output" / "checkpoints"
+TRACE_DIR = PROJECT_ROOT / "output" / "traces"
+PROFILE_DIR = PROJECT_ROOT / "output" / "profile"
+
+
+def _prompt_digest(*names: str) -> list:
+    return [file_digest(PROMPTS_DIR / n) for n in names]
 
 
 def _load_config(config_name: str) -> dict:
@@ -36,44 +65,234 @@ def _load_config(config_name: str) -> dict:
         return json.load(f)
 
 
+def _day_key(path: str, day, backend: str) -> str:
+    """Daily store key: the PDF's bytes plus everything its extraction depends on."""
+    return fingerprint([file_digest(path), day.strftime("%A"), backend,
+                        daily_report_agent.EXTRACT_MODEL, _prompt_digest("daily_report_system.md")])
+
+
+async def extract_days(days: list, store: DailyStore, backend: str, client,
+                       reuse: bool = True, history: HistoryIndex = None) -> list[dict]:
+    """
+    Structured extraction for each (date, pdf_path), in order.
+    Days already in the store with an unchanged key are loaded (reuse=False
+    ignores the store). PDF text for the rest is extracted in parallel, then
+    each day goes to the model one at a time (to manage tokens) and is stored.
+    Every day is (re)indexed in history, if given, and the week's columnar
+    metrics partition is rewritten.
+    """
+    keys = await asyncio.gather(*(asyncio.to_thread(_day_key, p, d, backend) for d, p in days))
+    records = [store.load(d, k) if reuse else None for (d, _), k in zip(days, keys)]
+    todo = [i for i, r in enumerate(records) if r is None]
+    set_attributes(**{"daily.stored": len(days) - len(todo), "daily.extracted": len(todo)})
+    texts = await asyncio.gather(*(
+        asyncio.to_thread(extract_daily_report, days[i][1]) for i in todo))
+
+    extractions = [r["extraction"] if r else None for r in records]
+    for (d, _), r in zip(days, records):
+        if r:
+            progress(f"  {d.strftime('%A')}: ingested {r['extracted_at']} ({r['source']})")
+    for i, dt in zip(todo, texts):
+        d, path = days[i]
+        label = d.strftime("%A")
+        progress(f"  Extracting {label}: {dt['filename']}")
+        if backend == "cli":
+            from .cli_agents import extract_single_day_cli
+            extraction = await extract_single_day_cli(dt["full_text"], label)
+        else:
+            extraction = await extract_single_day(client, dt["full_text"], label)
+        if not extraction.get("error"):
+            store.save(d, keys[i], path, extraction)
+        extractions[i] = extraction
+    good = [(d, e) for (d, _), e in zip(days, extractions) if not e.get("error")]
+    if history:
+        await _update_history(history.add_daily, store.project, good)
+    await _update_metrics(store.project, good)
+    return extractions
+
+
+async def _update_history(add, project: str, docs: list[tuple]):
+    """Index (date, doc) pairs off the loop; the index is context only, so errors just warn."""
+    def _add_all():
+        for day, doc in docs:
+            add(project, day, doc)
+    try:
+        await asyncio.to_thread(_add_all)
+    except sqlite3.Error as e:
+        warning(f"  WARNING: history index not updated: {e}", source="history")
+
+
+async def _update_metrics(project: str, days: list[tuple]):
+    """Rewrite the metrics partitions of these (date, extraction) days off the loop."""
+    def _write():
+        from .metrics_store import MetricsStore  # numpy
+        MetricsStore(project).write_days(days)
+    try:
+        await asyncio.to_thread(_write)
+    except (OSError, ImportError) as e:
+        warning(f"  WARNING: daily metrics not updated: {e}", source="metrics")
+
+
+async def _update_book(config: dict, rw: ReportWeek, pdf: bytes, publish_dir: Path,
+                       skip_nas: bool) -> tuple[Path | None, str | None]:
+    """
+    Append the week's report to the project book (constants.project_book, ""
+    to turn it off) and archive the book on the NAS. The book is a convenience
+    copy, so errors just warn. Returns (book path, NAS path).
+    """
+    name = config["constants"].get("project_book", BOOK_NAME)
+    if not name:
+        return None, None
+    book = ProjectBook(publish_dir / name)
+    try:
+        with span("project_book.add", week=rw.friday.isoformat()):
+            mode = await asyncio.to_thread(book.add_week, rw.report_number, rw.friday, pdf)
+            set_attributes(mode=mode)
+    except Exception as e:
+        warning(f"  WARNING: project book not updated: {e}", source="project_book")
+        return None, None
+    emit(events.ARTIFACT_WRITTEN, f"  Project book: week {rw.report_number:02d} {mode} ({name})",
+         kind="project_book", path=str(book.path), mode=mode)
+
+    nas_dir = None if skip_nas else config["paths"].get("weekly_reports_dir")
+    if not nas_dir or not os.path.isdir(nas_dir):
+        return book.path, None
+    nas_path = os.path.join(nas_dir, name)
+    try:
+        data = await asyncio.to_thread(book.snapshot)
+        with span("nas.copy", file=name, bytes=len(data)):
+            sha256 = await asyncio.to_thread(copy_verified, data, nas_path)
+    except OSError as e:
+        warning(f"  WARNING: NAS copy of the project book failed: {e}", source="nas")
+        return book.path, None
+    emit(events.ARTIFACT_WRITTEN, f"  Copied to: {nas_path}", kind="nas_book",
+         path=nas_path, sha256=sha256)
+    return book.path, nas_path
+
+
 def _print_header(rw: ReportWeek):
-    print("=" * 56)
-    print(f"  Bennett-Kew Weekly Report #{rw.report_number:02d}")
-    print(f"  Week: {rw.report_week_str}")
-    print(f"  Issued: {rw.issued_date_str}")
-    print(f"  Countdown: {rw.countdown_days} calendar days")
-    print("=" * 56)
+    progress("=" * 56)
+    progress(f"  Bennett-Kew Weekly Report #{rw.report_number:02d}")
+    progress(f"  Week: {rw.report_week_str}")
+    progress(f"  Issued: {rw.issued_date_str}")
+    progress(f"  Countdown: {rw.countdown_days} calendar days")
+    progress("=" * 56)
 
 
 def _print_files(files: ResolvedFiles):
-    print(f"\nInput files resolved:")
-    print(f"  Daily reports: {len(files.daily_reports)}/5 found")
+    progress(f"\nInput files resolved:")
+    progress(f"  Daily reports: {len(files.daily_reports)}/5 found")
     for d, p in files.daily_reports:
-        print(f"    {d.strftime('%A %m/%d')}: {os.path.basename(p)}")
-    print(f"  Schedule: {'Found' if files.schedule else 'MISSING'}")
+        emit(events.FILE_RESOLVED, f"    {d.strftime('%A %m/%d')}: {os.path.basename(p)}",
+             kind="daily_report", date=d.isoformat(), path=p)
+    progress(f"  Schedule: {'Found' if files.schedule else 'MISSING'}")
     if files.schedule:
-        print(f"    {os.path.basename(files.schedule)}")
-    print(f"  Minutes: {'Found' if files.minutes else 'MISSING'}")
+        emit(events.FILE_RESOLVED, f"    {os.path.basename(files.schedule)}",
+             kind="schedule", path=files.schedule)
+    progress(f"  Minutes: {'Found' if files.minutes else 'MISSING'}")
     if files.minutes:
-        print(f"    {os.path.basename(files.minutes)}")
-    print(f"  Candidate photos: {len(files.candidate_photos)}")
+        emit(events.FILE_RESOLVED, f"    {os.path.basename(files.minutes)}",
+             kind="minutes", path=files.minutes)
+    progress(f"  Candidate photos: {len(files.candidate_photos)}")
+    for d, p in files.candidate_photos:
+        emit(events.FILE_RESOLVED, kind="photo", date=d.isoformat(), path=p)
     if files.warnings:
-        print(f"\n  WARNINGS:")
+        progress(f"\n  WARNINGS:")
         for w in files.warnings:
-            print(f"    ! {w}")
+            warning(f"    ! {w}", source="file_resolver")
+
+
+_generator_modules: dict[str, object] = {}
+_generator_lock = threading.Lock()
+
+
+def _generator_module(config: dict, name: str):
+    """
+    Load a module from the PDF generator project's src/ (generate_report,
+    profiling) by file path, once per generator directory. sys.path is left
+    alone, so projects pointing at different generator checkouts get their own.
+    """
+    path = (Path(config["paths"]["pdf_generator_dir"]) / "src" / f"{name}.py").resolve()
+    with _generator_lock:
+        if str(path) not in _generator_modules:
+            module_name = f"_pdf_generator_{fingerprint(str(path))[:8]}_{name}"
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            if spec is None:
+                raise FileNotFoundError(f"PDF generator module not found: {path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module  # dataclasses etc. look themselves up here
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[module_name]
+                raise
+            _generator_modules[str(path)] = module
+    return _generator_modules[str(path)]
+
+
+@contextmanager
+def _profiling(config_name: str, run_id: str, enabled: bool):
+    """Sample CPU and memory per stage for the block; write results to output/profile/."""
+    if not enabled:
+        yield
+        return
+    profiler = _generator_module(_load_config(config_name), "profiling").Profiler()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        written = profiler.write(PROFILE_DIR, f"profile_{run_id}")
+        progress("\n" + profiler.format_table())
+        progress(f"Profile: {PROFILE_DIR}  (*.speedscope.json -> speedscope.app, "
+                 f"*.collapsed -> flamegraph.pl)")
+        for path in written:
+            emit(events.ARTIFACT_WRITTEN, kind="profile", path=str(path))
+
+
+def _record_perf(tracer, run: dict):
+    """Append the run to the perf history and warn about stages slower than usual."""
+    try:
+        metrics, stages = summarize_trace(tracer)
+        history = PerfHistory(PERF_DB)
+        history.record({**metrics, **run}, stages)
+        regressions = history.regressions(run["run_id"])
+    except Exception as e:  # the history is advisory; never fail a run over it
+        warning(f"Perf history not updated: {e}", source="perf")
+        return
+    for r in regressions:
+        warning(f"  SLOWER: {r.stage} took {r.duration:.1f}s, {r.change:+.0%} vs its "
+                f"median {r.median:.1f}s over the last {r.runs} runs",
+                source="perf", stage=r.stage, duration=r.duration, median=r.median)
+    if regressions:
+        progress("  (python run.py perf-report for the trend)")
+
+
+# config["constants"] passed through to the generator: how photos are embedded
+# and the PDF size budget they are stepped down to fit
+PHOTO_SETTINGS = ("photo_dpi", "photo_quality", "pdf_budget_kb")
 
 
 def _generate_pdf(config: dict, report_data: dict, rw: ReportWeek,
-                  output_dir: Path) -> str:
-    """Import and run the existing PDF generator."""
-    pdf_gen_dir = Path(config["paths"]["pdf_generator_dir"])
-    sys.path.insert(0, str(pdf_gen_dir / "src"))
-    from generate_report import generate_report, SAMPLE_DATA
+                  workspace: Workspace, template: str = "generate_report",
+                  tag: str = "") -> tuple[str, bytes]:
+    """
+    Render with the existing PDF generator (or another template module beside
+    it) and save the PDF to the workspace. Returns (path, PDF bytes), so the
+    NAS copy is written from memory instead of re-reading the file.
+    """
+    gen = _generator_module(config, template)
 
-    merged = {**SAMPLE_DATA, **report_data}
-    output_path = output_dir / f"Weekly_Progress_Report_{rw.report_number:02d}.pdf"
-    generate_report(merged, str(output_path))
-    return str(output_path)
+    merged = {**gen.SAMPLE_DATA, **report_data}
+    merged.update({k: config["constants"][k] for k in PHOTO_SETTINGS if k in config["constants"]})
+    output_path = workspace.path(f"Weekly_Progress_Report_{rw.report_number:02d}{tag}.pdf")
+    if hasattr(gen, "render_report_bytes"):
+        pdf = gen.render_report_bytes(merged)
+        write_atomic(output_path, pdf)
+    else:  # template with only generate_report(data, path)
+        gen.generate_report(merged, str(output_path))
+        pdf = output_path.read_bytes()
+    return str(output_path), pdf
 
 
 async def run_pipeline(config_name: str = "bennett_kew",
@@ -84,12 +303,192 @@ async def run_pipeline(config_name: str = "bennett_kew",
                        skip_outlook: bool = False,
                        dry_run: bool = False,
                        debug: bool = False,
-                       backend: str = "api") -> dict:
+                       backend: str = "api",
+                       client=None,
+                       resume: bool = False,
+                       from_stage: int = None,
+                       skip_nas: bool = False,
+                       profile: bool = False) -> dict:
     """
     Main pipeline entry point.
     backend: "api" (direct Anthropic API) or "cli" (Claude CLI subprocess)
+    client: shared API client (multi-project runs); created per run if omitted.
+    resume: load unchanged stage outputs from checkpoints instead of rerunning.
+    from_stage: rerun stages numbered >= N, load earlier ones from checkpoints.
+    skip_nas: don't copy the PDF to the NAS reports folder (e.g. backfills).
+    profile: sample CPU/memory of the heavy stages into output/profile/.
     Returns dict with generated file paths and summary.
+    Files are written to a private workspace (output/runs/...) and promoted to
+    output/reports/<project>/ only when every stage succeeded.
+    Every run is traced; spans are exported to output/traces/ (OTLP + Chrome)
+    and summarized into the perf history (output/perf.sqlite).
+    """
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    run_id = f"{config_name}-{stamp}-{uuid.uuid4().hex[:6]}"
+    start = time.time()
+    with events.run_context(run_id, config_name), \
+            trace_run("bennett-kew-report", project=config_name, backend=backend) as tracer, \
+            _profiling(config_name, run_id, profile):
+        emit(events.RUN_STARTED, target_date=target_date, backend=backend,
+             dry_run=dry_run, resume=resume, from_stage=from_stage)
+        result = {"error": "interrupted"}
+        try:
+            with span("pipeline", project=config_name, backend=backend,
+                      target_date=target_date or "current"):
+                result = await _run_pipeline(
+                    config_name, target_date, report_number, skip_email, skip_photos,
+                    skip_outlook, dry_run, debug, backend, client, resume, from_stage,
+                    skip_nas, run_id)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+            emit(events.ERROR, f"\nERROR: {result['error']}", exception=type(e).__name__)
+            raise
+        finally:
+            duration = time.time() - start
+            status = "failed" if result.get("error") else "ok"
+            _, chrome_path = tracer.export(TRACE_DIR, f"trace_{run_id}")
+            progress(f"Trace: {chrome_path}  (open in chrome://tracing)")
+            _record_perf(tracer, {
+                "run_id": run_id, "project": config_name, "started_at": start,
+                "target_date": target_date, "backend": backend, "dry_run": dry_run,
+                "status": status, "error": result.get("error"), "duration": duration,
+            })
+            emit(events.RUN_FINISHED, status=status, error=result.get("error"),
+                 duration=duration, report_number=result.get("report_number"),
+                 trace_path=str(chrome_path))
+    result["trace_path"] = str(chrome_path)
+    return result
+
+
+async def ingest_day(config_name: str = "bennett_kew",
+                     day: str = None,
+                     backend: str = "api",
+                     client=None,
+                     force: bool = False) -> dict:
+    """
+    Extract and store this week's daily reports up to `day` (YYYY-MM-DD,
+    default today) that aren't in the daily store yet, so the Friday run only
+    has to extract Friday. Earlier days missed by a failed evening run are
+    picked up too. force: re-extract days that are already stored.
+    Returns dict with the ingested, missing and failed dates.
+    """
+    config = _load_config(config_name)
+    constants = config["constants"]
+    target = datetime.strptime(day, "%Y-%m-%d").date() if day else date.today()
+    friday_or_earlier = target - timedelta(days=max(0, target.weekday() - 4))
+    rw = get_report_week(
+        target_date=friday_or_earlier.isoformat(),
+        start_date=constants.get("report_start_date"),
+        completion_date=constants.get("substantial_completion_date"),
+    )
+    wanted = [d for d in weekday_dates(rw) if d <= target]
+    found = dict(resolve_daily_reports(config["paths"]["daily_reports_dir"], rw))
+    days = [(d, found[d]) for d in wanted if d in found]
+    missing = [d for d in wanted if d not in found]
+
+    with events.run_context(f"{config_name}-ingest-{target.isoformat()}", config_name):
+        progress(f"Ingesting daily reports for week {rw.report_week_str} "
+                 f"(report #{rw.report_number:02d}) through {target.strftime('%A %m/%d')}")
+        for d in missing:
+            warning(f"  {d.strftime('%A %m/%d')}: no daily report on the NAS yet",
+                    source="file_resolver")
+        extractions = []
+        if days:
+            if backend == "api":
+                client = TracedClient(client or new_client())
+            extractions = await extract_days(days, DailyStore(config_name), backend, client,
+                                             reuse=not force, history=HistoryIndex())
+        failed = [d.isoformat() for (d, _), e in zip(days, extractions) if e.get("error")]
+        for d in failed:
+            warning(f"  {d}: extraction failed; will retry on the next run", source="ingest")
+
+    return {
+        "ingested": [d.isoformat() for d, _ in days if d.isoformat() not in failed],
+        "missing": [d.isoformat() for d in missing],
+        "failed": failed,
+    }
+
+
+async def rollup_report(config_name: str = "bennett_kew",
+                        period: str = None,
+                        client=None,
+                        force: bool = False) -> dict:
+    """
+    Monthly ('YYYY-MM') or quarterly ('YYYY-Qn') summary built from the
+    published weekly report data and stored daily extractions. Weeks need no
+    model call; each month is one call and a quarter one more. Month summaries
+    are checkpointed, so a quarter reuses months already rolled up.
+    force: redo the model calls even if the inputs are unchanged.
+    Returns the rollup dict plus json_path, md_path and llm_calls.
     """
+    config = _load_config(config_name)
+    p = rollup.parse_period(period)
+    project_name = config.get("project_name", config_name)
+    checkpoints = CheckpointStore(CHECKPOINT_DIR, resume=not force)
+    store = DailyStore(config_name)
+    calls = 0
+
+    def _summarized(summary: dict) -> bool:
+        return not summary.get("error")
+
+    async def _summarize(level: rollup.Period, items: list[dict]) -> dict:
+        nonlocal calls
+        calls += 1
+        progress(f"  Summarizing {level.title} from {len(items)} "
+                 f"{'week' if level.kind == 'month' else 'month'}(s)...")
+        return await rollup.summarize_period(client, project_name, level, items)
+
+    async def _month(m: rollup.Period) -> dict:
+        weeks = await asyncio.to_thread(rollup.collect_weeks, config, config_name, m, store)
+        by_source = {s: sum(w["source"] == s for w in weeks) for s in ("report", "daily")}
+        progress(f"  {m.title}: {by_source['report']} weekly report(s), "
+                 f"{by_source['daily']} week(s) from daily extractions")
+        summary = None
+        if weeks:
+            material = [weeks, project_name, rollup.MODEL, _prompt_digest("rollup_system.md")]
+            summary = await checkpoints.cached("rollup_month", 0, material,
+                                               lambda: _summarize(m, weeks), _summarized)
+        return {"period": m.label, "title": m.title, "weeks": weeks, "summary": summary}
+
+    with events.run_context(f"{config_name}-rollup-{p.label}", config_name):
+        progress(f"Rollup for {p.title} ({project_name})")
+        client = TracedClient(client or new_client())
+        months = [m for m in await asyncio.gather(*(_month(m) for m in p.months()))
+                  if m["summary"]]
+        if not months:
+            emit(events.ERROR, f"No weekly reports or daily extractions for {p.title}")
+            return {"error": f"Nothing to roll up for {p.title}"}
+        # A failed summary is neither checkpointed nor written: the next rollup retries it
+        failed = [m["title"] for m in months if not _summarized(m["summary"])]
+        if p.kind == "month":
+            summary = months[0]["summary"]
+        elif not failed:
+            material = [[(m["period"], m["summary"]) for m in months], project_name,
+                        rollup.MODEL, _prompt_digest("rollup_system.md")]
+            summary = await checkpoints.cached("rollup_quarter", 0, material,
+                                               lambda: _summarize(p, months), _summarized)
+            failed = [] if _summarized(summary) else [p.title]
+        if failed:
+            emit(events.ERROR, f"Rollup summary failed for {', '.join(failed)}")
+            return {"error": f"Rollup summary failed for {p.title}"}
+        result = {
+            "project": config_name, "project_name": project_name,
+            "period": p.label, "kind": p.kind, "title": p.title,
+            "from": p.start.isoformat(), "to": p.end.isoformat(),
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "weeks_covered": sum(len(m["weeks"]) for m in months),
+            "summary": summary, "months": months,
+        }
+        json_path, md_path = await asyncio.to_thread(rollup.write_rollup, result, config_name)
+        emit(events.ARTIFACT_WRITTEN, f"  Saved: {md_path}", kind="rollup", path=str(md_path))
+        progress(f"  {calls} model call(s), {checkpoints.hits} reused")
+    return {**result, "json_path": str(json_path), "md_path": str(md_path), "llm_calls": calls}
+
+
+async def _run_pipeline(config_name, target_date, report_number, skip_email,
+                        skip_photos, skip_outlook, dry_run, debug, backend, client,
+                        resume, from_stage, skip_nas, run_id) -> dict:
+    """Pipeline body; see run_pipeline for arguments."""
     start_time = time.time()
 
     # ── Stage 0: Load config + calendar validation ───────────────────────
@@ -103,106 +502,149 @@ async def run_pipeline(config_name: str = "bennett_kew",
         completion_date=constants.get("substantial_completion_date"),
     )
     _print_header(rw)
-    print(f"  Backend: {backend.upper()}")
+    progress(f"  Backend: {backend.upper()}")
+    current_span().set(**{"report.number": rw.report_number, "report.week": rw.report_week_str})
 
     # ── Stage 1: File resolution ─────────────────────────────────────────
-    print("\nStage 1: Resolving input files...")
+    progress("\nStage 1: Resolving input files...")
     files = resolve_all_files(config, rw)
     _print_files(files)
+    current_span().set(**{"input.daily_reports": len(files.daily_reports),
+                          "input.photos": len(files.candidate_photos)})
 
     if not files.daily_reports:
-        print("\nFATAL: No daily reports found. Cannot generate report.")
+        emit(events.ERROR, "\nFATAL: No daily reports found. Cannot generate report.")
         return {"error": "No daily reports found"}
 
-    # ── Stage 2: PDF text extraction ─────────────────────────────────────
-    print("\nStage 2: Extracting PDF text...")
-    daily_texts = []
-    for d, path in files.daily_reports:
-        print(f"  Extracting {d.strftime('%A')}: {os.path.basename(path)}")
-        daily_texts.append(extract_daily_report(path))
-
-    schedule_text = None
-    if files.schedule:
-        print(f"  Extracting schedule: {os.path.basename(files.schedule)}")
-        schedule_text = extract_schedule_table(files.schedule)
-
-    minutes_text = None
-    if files.minutes:
-        print(f"  Extracting minutes: {os.path.basename(files.minutes)}")
-        minutes_text = extract_meeting_minutes(files.minutes)
-
-    # ── Stage 3: AI content extraction (parallel where possible) ─────────
-    print(f"\nStage 3: AI content extraction ({backend.upper()})...")
+    # Everything this run writes goes to its own workspace until it succeeds
+    prune_workspaces()
+    workspace = Workspace(config_name, rw.friday.isoformat(), run_id)
+    overrides = load_overrides(config_name)
+    profiles = load_profiles(config)
+    if backend == "api":
+        client = TracedClient(client or new_client())
+    checkpoints = CheckpointStore(CHECKPOINT_DIR, resume=resume, from_stage=from_stage)
+    daily_store = DailyStore(config_name)
+    history = HistoryIndex()
 
     if backend == "cli":
         from .cli_agents import (
-            process_daily_reports_cli,
+            synthesize_week_cli,
             process_schedule_cli, empty_schedule_cli,
             process_minutes_cli, empty_minutes_cli,
             select_photos_cli,
             draft_email_cli,
         )
-        print("  Starting parallel CLI agents...")
-
-        async def _get_schedule():
-            if schedule_text:
-                return await process_schedule_cli(schedule_text, rw.report_week_str)
-            return empty_schedule_cli()
-
-        async def _get_minutes():
-            if minutes_text:
-                return await process_minutes_cli(minutes_text)
-            return empty_minutes_cli()
-
-        daily_result, schedule_result, minutes_result = await asyncio.gather(
-            process_daily_reports_cli(daily_texts, rw.report_week_str),
-            _get_schedule(),
-            _get_minutes(),
-        )
-    else:
-        client = AsyncAnthropic()
-        print("  Starting parallel API agents...")
 
-        holidays = upcoming_holidays(rw)
+    # ── Stage 2: PDF text extraction (blocking PyMuPDF work runs in threads)
+    # Daily report text is extracted in stage 3, and only for days not ingested yet.
+    async def _extract_schedule(files):
+        progress("\nStage 2: Extracting PDF text...")
+        if not files.schedule:
+            return {"schedule_text": None}
+        progress(f"  Extracting schedule: {os.path.basename(files.schedule)}")
+        return {"schedule_text": await asyncio.to_thread(extract_schedule_table, files.schedule)}
+
+    async def _extract_minutes(files):
+        if not files.minutes:
+            return {"minutes_text": None}
+        progress(f"  Extracting minutes: {os.path.basename(files.minutes)}")
+        return {"minutes_text": await asyncio.to_thread(extract_meeting_minutes, files.minutes)}
 
-        # Generate master schedule context from XER (for Week 3 gap-fill)
-        master_ctx = None
+    # Master schedule context from XER (for Week 3 gap-fill), parsed alongside PDFs
+    async def _master_schedule():
         xer_path = config["paths"].get("master_schedule_xer")
-        if xer_path:
-            from datetime import timedelta
-            week1_monday = rw.friday + timedelta(days=3)  # Monday after report Friday
-            master_ctx = format_master_schedule_context(xer_path, week1_monday, num_weeks=3)
-            if master_ctx:
-                print(f"  Master schedule loaded for gap-fill")
-
-        async def _get_schedule():
-            if schedule_text:
-                return await process_schedule(client, schedule_text, rw.report_week_str,
-                                              holidays=holidays,
-                                              master_schedule_context=master_ctx)
-            return empty_schedule()
-
-        async def _get_minutes():
-            if minutes_text:
-                return await process_minutes(client, minutes_text)
-            return empty_minutes()
-
-        daily_result, schedule_result, minutes_result = await asyncio.gather(
-            process_daily_reports(client, daily_texts, rw.report_week_str),
-            _get_schedule(),
-            _get_minutes(),
-        )
-    print("  AI extraction complete.")
+        if backend != "api" or not xer_path:
+            return {"master_ctx": None}
+        week1_monday = rw.friday + timedelta(days=3)  # Monday after report Friday
+        master_ctx = await asyncio.to_thread(
+            format_master_schedule_context, xer_path, week1_monday, num_weeks=3)
+        if master_ctx:
+            progress(f"  Master schedule loaded for gap-fill")
+        return {"master_ctx": master_ctx}
+
+    # ── Stage 3: AI content extraction ──────────────────────────────────
+    # Days ingested during the week (run.py ingest-day) come from the daily
+    # store; the rest are extracted now and stored, so an unchanged day is
+    # never sent to the model twice. --from-stage 3 or lower re-extracts all.
+    async def _daily_extract(files):
+        progress(f"\nStage 3: AI content extraction ({backend.upper()})...")
+        reuse = from_stage is None or from_stage > 3
+        extractions = await extract_days(files.daily_reports, daily_store, backend, client,
+                                         reuse, history=history)
+        return {"daily_extractions": extractions}
+
+    # Past weeks' items most like this week's (BM25 over the history index),
+    # so the synthesis and critical-items prompts see recurring issues
+    def _search_history(texts: list[str]) -> str | None:
+        try:
+            hits = history.search(config_name, texts, before=rw.friday)
+        except sqlite3.Error as e:
+            warning(f"  WARNING: history search failed: {e}", source="history")
+            return None
+        set_attributes(**{"history.hits": len(hits)})
+        return format_history(hits) or None
+
+    async def _daily_history(daily_extractions):
+        if backend != "api":
+            return {"daily_history": None}
+        texts = [t for e in daily_extractions
+                 for f in ("activities", "issues", "coordination", "testing") for t in e.get(f, [])]
+        return {"daily_history": await asyncio.to_thread(_search_history, texts)}
+
+    async def _critical_history(daily_extractions, minutes_result):
+        if backend != "api":
+            return {"critical_history": None}
+        await _update_history(history.add_minutes, config_name, [(rw.friday, minutes_result)])
+        texts = [t for e in daily_extractions for f in ("issues", "coordination") for t in e.get(f, [])]
+        texts += minutes_result.get("critical_items", []) + minutes_result.get("coordination_items", [])
+        return {"critical_history": await asyncio.to_thread(_search_history, texts)}
+
+    async def _daily_synthesis(daily_extractions, daily_history):
+        progress("  Synthesizing weekly summary...")
+        if backend == "cli":
+            result = await synthesize_week_cli(daily_extractions, rw.report_week_str)
+        else:
+            result = await synthesize_week(client, daily_extractions, rw.report_week_str,
+                                           history_context=daily_history)
+        result["_daily_extractions"] = daily_extractions  # keep for audit
+        progress("  Daily report synthesis complete.")
+        if debug:
+            _save_debug(result, "daily_result", rw, workspace)
+        return {"daily_result": result}
+
+    async def _schedule_agent(schedule_text, master_ctx):
+        if not schedule_text:
+            result = empty_schedule_cli() if backend == "cli" else empty_schedule()
+        elif backend == "cli":
+            result = await process_schedule_cli(schedule_text, rw.report_week_str)
+        else:
+            result = await process_schedule(client, schedule_text, rw.report_week_str,
+                                            holidays=upcoming_holidays(rw),
+                                            master_schedule_context=master_ctx)
+        if debug:
+            _save_debug(result, "schedule_result", rw, workspace)
+        return {"schedule_result": result}
 
-    if debug:
-        _save_debug(daily_result, "daily_result", rw)
-        _save_debug(schedule_result, "schedule_result", rw)
-        _save_debug(minutes_result, "minutes_result", rw)
+    async def _minutes_agent(minutes_text):
+        if not minutes_text:
+            result = empty_minutes_cli() if backend == "cli" else empty_minutes()
+        elif backend == "cli":
+            result = await process_minutes_cli(minutes_text)
+        else:
+            result = await process_minutes(client, minutes_text)
+        if debug:
+            _save_debug(result, "minutes_result", rw, workspace)
+        return {"minutes_result": result}
 
     # ── Stage 4: Photo selection ─────────────────────────────────────────
-    photo_result = {"photos": [], "photo_captions": [], "photo_scores": [], "mismatch_warning": None}
-    if not skip_photos and files.candidate_photos:
-        print(f"\nStage 4: Photo selection ({backend.upper()})...")
+    async def _photos(daily_result):
+        photo_result = {"photos": [], "photo_captions": [], "photo_scores": [], "mismatch_warning": None}
+        if skip_photos or not files.candidate_photos:
+            progress("\nStage 4: Skipping photo selection")
+            return {"photo_result": photo_result}
+
+        progress(f"\nStage 4: Photo selection ({backend.upper()})...")
         activities = daily_result.get("activities_completed", [])
         num_photos = config["constants"].get("photos_per_report", 2)
         if backend == "cli":
@@ -214,187 +656,412 @@ async def run_pipeline(config_name: str = "bennett_kew",
                 client, files.candidate_photos, activities, num_photos=num_photos
             )
         if photo_result.get("mismatch_warning"):
-            print(f"  PHOTO WARNING: {photo_result['mismatch_warning']}")
+            warning(f"  PHOTO WARNING: {photo_result['mismatch_warning']}", source="photos")
         else:
             for i, cap in enumerate(photo_result.get("photo_captions", [])):
-                print(f"  Photo {i+1}: {cap}")
-    else:
-        print("\nStage 4: Skipping photo selection")
+                progress(f"  Photo {i+1}: {cap}")
+        return {"photo_result": photo_result}
 
     # ── Stage 4b: Critical items assessment ───────────────────────────────
-    critical_items = []
-    if backend == "api":
-        print(f"\nStage 4b: Critical items assessment (API)...")
-
-        # Check weather forecast for conflicts with planned work
-        weather_context = None
+    # The forecast fetch only needs the site location, so it runs up front;
+    # the conflict check waits for the schedule's planned activities.
+    async def _forecast():
         weather_cfg = config.get("weather", {})
-        if weather_cfg.get("enabled", True):
-            from .weather import get_forecast, check_weather_conflicts
-            lat = weather_cfg.get("latitude", 33.9617)
-            lon = weather_cfg.get("longitude", -118.3531)
-            print(f"  Checking weather for {weather_cfg.get('location_name', 'project site')}...")
-            forecast = get_forecast(lat, lon)
-            if forecast:
-                all_planned = (
-                    schedule_result.get("planned_activities", []) +
-                    schedule_result.get("week1_activities", []) +
-                    schedule_result.get("week2_activities", [])
-                )
-                weather_context = check_weather_conflicts(forecast, all_planned)
-                if weather_context:
-                    print(f"  Weather conflict detected")
-                else:
-                    print(f"  No weather conflicts")
+        if backend != "api" or not weather_cfg.get("enabled", True):
+            return {"forecast": None}
+        from .weather import get_forecast
+        lat = weather_cfg.get("latitude", 33.9617)
+        lon = weather_cfg.get("longitude", -118.3531)
+        progress(f"  Checking weather for {weather_cfg.get('location_name', 'project site')}...")
+        return {"forecast": await asyncio.to_thread(get_forecast, lat, lon)}
 
+    async def _weather(forecast, schedule_result):
+        if not forecast:
+            return {"weather_context": None}
+        from .weather import check_weather_conflicts
+        all_planned = (
+            schedule_result.get("planned_activities", []) +
+            schedule_result.get("week1_activities", []) +
+            schedule_result.get("week2_activities", [])
+        )
+        weather_context = check_weather_conflicts(forecast, all_planned)
+        if weather_context:
+            warning(f"  Weather conflict detected", source="weather", detail=weather_context)
+        else:
+            progress(f"  No weather conflicts")
+        return {"weather_context": weather_context}
+
+    async def _critical_items(daily_result, schedule_result, minutes_result, weather_context,
+                              critical_history):
+        if backend != "api":
+            return {"critical_items": []}
+        progress(f"\nStage 4b: Critical items assessment (API)...")
         critical_items = await assess_critical_items(
             client, daily_result, schedule_result, minutes_result,
             rw.report_week_str,
             weather_context=weather_context,
+            history_context=critical_history,
         )
         if critical_items:
             for ci in critical_items:
-                print(f"  ! {ci}")
+                progress(f"  ! {ci}")
         else:
-            print("  No critical items this week")
+            progress("  No critical items this week")
+        return {"critical_items": critical_items}
 
-    # ── Stage 5: JSON assembly ───────────────────────────────────────────
-    print("\nStage 5: Assembling report data...")
-    report_data = assemble_json(config, rw, daily_result, schedule_result,
-                                minutes_result, photo_result,
-                                critical_items=critical_items)
+    # ── Stage 5 onwards: once per output profile (principal, district, ...),
+    # all profiles concurrently, from the single set of stage 3-4 results.
+    # Overrides apply to the primary report only.
+    async def _assemble(profile: OutputProfile, daily_result, schedule_result, minutes_result,
+                        photo_result, critical_items):
+        progress(f"\nStage 5: Assembling report data{_for(profile)}...")
+        report_data = assemble_json(profile.config, rw, daily_result, schedule_result,
+                                    minutes_result, photo_result, critical_items=critical_items,
+                                    overrides=overrides if profile.primary else None)
+        return {"report_data": report_data}
 
-    output_dir = PROJECT_ROOT / "output"
-    output_dir.mkdir(exist_ok=True)
+    async def _save_data(profile: OutputProfile, report_data, photo_result):
+        # Assembled JSON (audit trail) and photo selections, written together off the loop
+        json_path = workspace.path(f"report_data_{rw.report_number:02d}{profile.tag}.json")
+        files = {json_path: json.dumps(report_data, indent=2, default=str)}
+        photo_log = None
+        if profile.primary and photo_result.get("photo_scores"):
+            photo_log = workspace.path(f"photo_selections_{rw.report_number:02d}.json")
+            files[photo_log] = json.dumps(photo_result, indent=2, default=str)
+        await write_all(files)
+        emit(events.ARTIFACT_WRITTEN, f"  Saved: {json_path.name}", kind="report_data",
+             path=str(json_path))
+        if photo_log:
+            emit(events.ARTIFACT_WRITTEN, kind="photo_log", path=str(photo_log))
+        return {"json_path": json_path}
 
-    # Save assembled JSON (audit trail)
-    json_path = output_dir / f"report_data_{rw.report_number:02d}.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, indent=2, default=str)
-    print(f"  Saved: {json_path.name}")
+    # Checkpoint material: everything each stage's output depends on
+    def _master_key():
+        xer_path = config["paths"].get("master_schedule_xer")
+        return [backend, file_digest(xer_path), rw.friday]
 
-    # Save photo selections
-    if photo_result.get("photo_scores"):
-        photo_log = output_dir / f"photo_selections_{rw.report_number:02d}.json"
-        with open(photo_log, "w", encoding="utf-8") as f:
-            json.dump(photo_result, f, indent=2, default=str)
+    def _extract_key(files):
+        # File stat rather than content: the daily store already keys each day on
+        # the PDF's bytes, and a resume shouldn't re-hash the whole week on the NAS
+        return [[(d, p, st.st_size, st.st_mtime_ns)
+                 for d, p in files.daily_reports for st in [os.stat(p)]],
+                backend, daily_report_agent.EXTRACT_MODEL, _prompt_digest("daily_report_system.md")]
 
-    if dry_run:
-        print("\nDRY RUN: Skipping PDF generation and email.")
-        return {"report_data": report_data, "json_path": str(json_path)}
+    def _forecast_key():
+        # One forecast per report week, so a later --resume sees the same
+        # weather and the critical-items checkpoint still matches
+        weather_cfg = config.get("weather", {})
+        return [rw.friday, backend, weather_cfg.get("enabled", True),
+                weather_cfg.get("latitude"), weather_cfg.get("longitude")]
+
+    # Failed results are not checkpointed (nor anything built on them), so
+    # --resume retries the days and the forecast instead of reusing the failure
+    def _extracted(outputs):
+        return not any(e.get("error") for e in outputs["daily_extractions"])
+
+    def _forecast_fetched(outputs):
+        # None: weather disabled; [] is what get_forecast returns on failure
+        return outputs["forecast"] is None or bool(outputs["forecast"])
+
+    def _daily_key(daily_extractions, daily_history):
+        return [daily_extractions, daily_history, rw.report_week_str, backend,
+                daily_report_agent.SYNTHESIS_MODEL, _prompt_digest("weekly_synthesis_system.md")]
+
+    def _schedule_key(schedule_text, master_ctx):
+        return [schedule_text, master_ctx, rw.report_week_str, upcoming_holidays(rw),
+                backend, schedule_agent.MODEL, _prompt_digest("schedule_extraction_system.md")]
+
+    def _minutes_key(minutes_text):
+        return [minutes_text, backend, minutes_agent.MODEL,
+                _prompt_digest("minutes_extraction_system.md")]
+
+    def _photos_key(daily_result):
+        return [[(d, p, file_digest(p)) for d, p in files.candidate_photos],
+                daily_result.get("activities_completed", []), skip_photos,
+                config["constants"].get("photos_per_report", 2), backend,
+                photo_selector.MODEL, _prompt_digest("photo_selection_system.md")]
+
+    def _critical_key(daily_result, schedule_result, minutes_result, weather_context,
+                      critical_history):
+        return [daily_result, schedule_result, minutes_result, weather_context,
+                critical_history, rw.report_week_str, backend, critical_items_agent.MODEL,
+                _prompt_digest("critical_items_system.md")]
+
+    def _assemble_key(profile: OutputProfile, daily_result, schedule_result, minutes_result,
+                      photo_result, critical_items):
+        return [profile.config, rw, daily_result, schedule_result, minutes_result,
+                photo_result, critical_items, overrides if profile.primary else None]
 
     # ── Stage 6: PDF generation ──────────────────────────────────────────
-    print("\nStage 6: Generating PDF...")
-    pdf_path = _generate_pdf(config, report_data, rw, output_dir)
-    print(f"  Generated: {os.path.basename(pdf_path)}")
-
-    # Copy to NAS archive location
-    nas_reports_dir = config["paths"].get("weekly_reports_dir")
-    nas_pdf_path = None
-    if nas_reports_dir and os.path.isdir(nas_reports_dir):
-        nas_name = f"Bennett-Kew Weekly Progress Report {rw.friday.strftime('%Y.%m.%d')}.pdf"
-        nas_pdf_path = os.path.join(nas_reports_dir, nas_name)
-        shutil.copy2(pdf_path, nas_pdf_path)
-        print(f"  Copied to: {nas_pdf_path}")
-    elif nas_reports_dir:
-        print(f"  WARNING: NAS reports dir not found: {nas_reports_dir}")
-
-    # ── Stage 7: Email draft ─────────────────────────────────────────────
-    email_path = None
-    if not skip_email:
-        print(f"\nStage 7: Drafting principal email ({backend.upper()})...")
+    async def _pdf(profile: OutputProfile, report_data):
+        progress(f"\nStage 6: Generating PDF{_for(profile)}...")
+        pdf_path, pdf_bytes = await asyncio.to_thread(_generate_pdf, profile.config, report_data,
+                                                      rw, workspace, profile.template, profile.tag)
+        emit(events.ARTIFACT_WRITTEN, f"  Generated: {os.path.basename(pdf_path)}",
+             kind="pdf", path=pdf_path, bytes=len(pdf_bytes))
+        return {"pdf_path": pdf_path, "pdf_bytes": pdf_bytes}
+
+    # Copy to NAS archive location: verified, retried and resumed, never a partial file.
+    # Written from the rendered bytes; the workspace file is what Outlook attaches
+    async def _nas_copy(profile: OutputProfile, pdf_bytes):
+        nas_reports_dir = None
+        if not skip_nas and profile.nas:
+            nas_reports_dir = profile.config["paths"].get("weekly_reports_dir")
+        nas_pdf_path = None
+        if nas_reports_dir and os.path.isdir(nas_reports_dir):
+            label = "" if profile.primary else f" - {profile.label}"
+            nas_name = f"Bennett-Kew Weekly Progress Report {rw.friday.strftime('%Y.%m.%d')}{label}.pdf"
+            nas_pdf_path = os.path.join(nas_reports_dir, nas_name)
+            try:
+                with span("nas.copy", file=nas_name, bytes=len(pdf_bytes)):
+                    sha256 = await asyncio.to_thread(copy_verified, pdf_bytes, nas_pdf_path)
+            except OSError as e:
+                warning(f"  WARNING: NAS copy failed, report not archived: {e}", source="nas")
+                return {"nas_pdf_path": None}
+            emit(events.ARTIFACT_WRITTEN, f"  Copied to: {nas_pdf_path}",
+                 kind="nas_pdf", path=nas_pdf_path, sha256=sha256)
+        elif nas_reports_dir:
+            warning(f"  WARNING: NAS reports dir not found: {nas_reports_dir}", source="nas")
+        return {"nas_pdf_path": nas_pdf_path}
+
+    # ── Stage 7: Email draft (only needs report data, so overlaps the PDF render)
+    async def _email(profile: OutputProfile, report_data):
+        if skip_email or not profile.email:
+            if profile.primary:
+                progress("\nStage 7: Skipping email draft")
+            return {"email_result": None, "email_path": None}
+        audience = profile.label.lower()
+        progress(f"\nStage 7: Drafting {audience} email ({backend.upper()})...")
         if backend == "cli":
-            email_result = await draft_email_cli(report_data, config)
+            email_result = await draft_email_cli(report_data, profile.config,
+                                                 profile.email_prompt, audience)
         else:
-            email_result = await draft_email(client, report_data, config)
-        email_path = output_dir / f"principal_email_{rw.report_number:02d}.txt"
-        with open(email_path, "w", encoding="utf-8") as f:
-            f.write(f"Subject: {email_result['subject']}\n\n")
-            f.write(email_result['body'])
-        print(f"  Saved: {email_path.name}")
-    else:
-        print("\nStage 7: Skipping email draft")
+            email_result = await draft_email(client, report_data, profile.config,
+                                             profile.email_prompt, audience)
+        email_path = workspace.path(f"{profile.name}_email_{rw.report_number:02d}.txt")
+        await asyncio.to_thread(write_atomic, email_path,
+                                f"Subject: {email_result['subject']}\n\n{email_result['body']}")
+        emit(events.ARTIFACT_WRITTEN, f"  Saved: {email_path.name}", kind="email",
+             path=str(email_path))
+        return {"email_result": email_result, "email_path": email_path}
 
     # ── Stage 8: Outlook draft ──────────────────────────────────────────
-    outlook_draft = None
-    outlook_config = config.get("outlook", {})
-    if (not skip_email and not dry_run and not skip_outlook
-            and outlook_config.get("enabled")):
-        print("\nStage 8: Creating Outlook draft...")
-        try:
-            from .outlook_drafter import create_outlook_draft
-            outlook_draft = await create_outlook_draft(
-                subject=email_result["subject"],
-                body_text=email_result["body"],
-                pdf_path=pdf_path,
-                config=config,
-            )
-            if outlook_draft.get("error"):
-                print(f"  WARNING: {outlook_draft['error']}")
-            else:
-                print(f"  Draft created in Outlook Drafts folder")
-                if outlook_draft.get("web_link"):
-                    print(f"  Link: {outlook_draft['web_link']}")
-        except Exception as e:
-            print(f"  WARNING: Outlook draft failed: {e}")
-            if email_path:
-                print(f"  (Email text file still saved at {email_path.name})")
-    elif not skip_email and not dry_run and not skip_outlook:
-        pass  # outlook not enabled in config, skip silently
-    else:
-        print("\nStage 8: Skipping Outlook draft")
+    async def _outlook(profile: OutputProfile, email_result, email_path, pdf_path):
+        outlook_draft = None
+        outlook_config = profile.config.get("outlook", {})
+        if email_result and not skip_outlook and outlook_config.get("enabled"):
+            progress(f"\nStage 8: Creating Outlook draft{_for(profile)}...")
+            try:
+                from .outlook_drafter import create_outlook_draft
+                outlook_draft = await create_outlook_draft(
+                    subject=email_result["subject"],
+                    body_text=email_result["body"],
+                    pdf_path=pdf_path,
+                    config=profile.config,
+                )
+                if outlook_draft.get("error"):
+                    warning(f"  WARNING: {outlook_draft['error']}", source="outlook")
+                else:
+                    progress(f"  Draft created in Outlook Drafts folder")
+                    if outlook_draft.get("web_link"):
+                        progress(f"  Link: {outlook_draft['web_link']}")
+            except Exception as e:
+                warning(f"  WARNING: Outlook draft failed: {e}", source="outlook")
+                if email_path:
+                    progress(f"  (Email text file still saved at {email_path.name})")
+        elif email_result and not skip_outlook:
+            pass  # outlook not enabled in config, skip silently
+        elif profile.primary:
+            progress("\nStage 8: Skipping Outlook draft")
+        return {"outlook_draft": outlook_draft}
+
+    def _for(profile: OutputProfile) -> str:
+        return "" if profile.primary else f" ({profile.label})"
+
+    def _profile_stage(profile: OutputProfile, name, run, inputs, outputs, number,
+                       checkpoint=None) -> Stage:
+        """
+        A stage for one profile. Its own values (PROFILE_VALUES) and stage name
+        get the profile's suffix (report_data.district); results shared by all
+        profiles are read as they are.
+        """
+        def own(key):
+            return key + profile.suffix if key in PROFILE_VALUES else key
+
+        def plain(kwargs):
+            return {k.removesuffix(profile.suffix) if profile.suffix else k: v
+                    for k, v in kwargs.items()}
+
+        async def _run(**kwargs):
+            result = await run(profile, **plain(kwargs))
+            return {own(k): v for k, v in result.items()}
+
+        key = (lambda **kwargs: checkpoint(profile, **plain(kwargs))) if checkpoint else None
+        return Stage(name + profile.suffix, _run, tuple(own(i) for i in inputs),
+                     tuple(own(o) for o in outputs), number=number, checkpoint=key)
+
+    assemble_inputs = ("daily_result", "schedule_result", "minutes_result",
+                       "photo_result", "critical_items")
+    PROFILE_VALUES = {"report_data", "json_path", "pdf_path", "pdf_bytes", "nas_pdf_path",
+                      "email_result", "email_path", "outlook_draft"}
+    stages = [
+        Stage("extract_schedule", _extract_schedule, ("files",), ("schedule_text",),
+              number=2, checkpoint=lambda files: (files.schedule, file_digest(files.schedule))),
+        Stage("extract_minutes", _extract_minutes, ("files",), ("minutes_text",),
+              number=2, checkpoint=lambda files: (files.minutes, file_digest(files.minutes))),
+        Stage("master_schedule", _master_schedule, (), ("master_ctx",),
+              number=2, checkpoint=_master_key),
+        Stage("daily_extract", _daily_extract, ("files",), ("daily_extractions",),
+              number=3, checkpoint=_extract_key, cacheable=_extracted),
+        Stage("daily_history", _daily_history, ("daily_extractions",), ("daily_history",),
+              number=3),
+        Stage("daily_synthesis", _daily_synthesis, ("daily_extractions", "daily_history"),
+              ("daily_result",), number=3, checkpoint=_daily_key),
+        Stage("schedule_agent", _schedule_agent, ("schedule_text", "master_ctx"), ("schedule_result",),
+              number=3, checkpoint=_schedule_key),
+        Stage("minutes_agent", _minutes_agent, ("minutes_text",), ("minutes_result",),
+              number=3, checkpoint=_minutes_key),
+        Stage("photos", _photos, ("daily_result",), ("photo_result",),
+              number=4, checkpoint=_photos_key),
+        Stage("forecast", _forecast, (), ("forecast",), number=4, checkpoint=_forecast_key,
+              cacheable=_forecast_fetched),
+        Stage("weather", _weather, ("forecast", "schedule_result"), ("weather_context",),
+              number=4),
+        Stage("critical_history", _critical_history, ("daily_extractions", "minutes_result"),
+              ("critical_history",), number=4),
+        Stage("critical_items", _critical_items,
+              ("daily_result", "schedule_result", "minutes_result", "weather_context",
+               "critical_history"),
+              ("critical_items",), number=4, checkpoint=_critical_key),
+    ]
+    for profile in profiles:
+        stages += [
+            _profile_stage(profile, "assemble", _assemble, assemble_inputs, ("report_data",),
+                           number=5, checkpoint=_assemble_key),
+            _profile_stage(profile, "save_data", _save_data, ("report_data", "photo_result"),
+                           ("json_path",), number=5),
+        ]
+        if not dry_run:
+            stages += [
+                _profile_stage(profile, "pdf", _pdf, ("report_data",), ("pdf_path", "pdf_bytes"),
+                               number=6),
+                _profile_stage(profile, "nas_copy", _nas_copy, ("pdf_bytes",), ("nas_pdf_path",),
+                               number=6),
+                _profile_stage(profile, "email", _email, ("report_data",),
+                               ("email_result", "email_path"), number=7),
+                _profile_stage(profile, "outlook", _outlook,
+                               ("email_result", "email_path", "pdf_path"), ("outlook_draft",),
+                               number=8),
+            ]
+
+    if len(profiles) > 1:
+        progress(f"\nOutput profiles: {', '.join(p.label for p in profiles)}")
+    progress(f"\nRunning {len(stages)} stages ({backend.upper()})...")
+    if checkpoints.resume:
+        scope = f"stages < {from_stage}" if from_stage is not None else "all stages"
+        progress(f"  Resuming from checkpoints ({scope})")
+    graph = await run_graph(stages, {"files": files}, checkpoints=checkpoints)
+    current_span().set(**{"checkpoint.hits": checkpoints.hits,
+                          "checkpoint.misses": checkpoints.misses})
+    if checkpoints.hits:
+        progress(f"  Checkpoints: {checkpoints.hits} loaded, {checkpoints.misses} recomputed")
+    values = graph.values
+
+    # Publish the workspace into output/reports/<project>/ now that every stage succeeded
+    published = await asyncio.to_thread(workspace.promote)
+    for path in published.values():
+        emit(events.ARTIFACT_WRITTEN, kind="published", path=str(path))
+    progress(f"  Published {len(published)} file(s) to {workspace.publish_dir}")
+    await _update_history(history.add_report, config_name, [(rw.friday, values["report_data"])])
+
+    def _published(path):
+        return workspace.publish_dir / Path(path).relative_to(workspace.dir) if path else None
+
+    report_data = values["report_data"]
+    json_path = _published(values["json_path"])
+    photo_result = values["photo_result"]
+
+    # Every other profile's artifacts, by profile name
+    extra = {}
+    for profile in profiles[1:]:
+        v = {k: values.get(k + profile.suffix) for k in PROFILE_VALUES}
+        extra[profile.name] = {
+            "json_path": str(_published(v["json_path"])),
+            "pdf_path": str(_published(v["pdf_path"])) if v["pdf_path"] else None,
+            "nas_pdf_path": v["nas_pdf_path"],
+            "email_path": str(_published(v["email_path"])) if v["email_path"] else None,
+        }
+
+    if dry_run:
+        progress("\nDRY RUN: Skipping PDF generation and email.")
+        progress(f"  {graph.format_critical_path()}")
+        return {"report_data": report_data, "json_path": str(json_path),
+                "report_number": rw.report_number, "profiles": extra}
+
+    pdf_path = str(_published(values["pdf_path"]))
+    nas_pdf_path = values["nas_pdf_path"]
+    email_path = _published(values["email_path"])
+    book_path, nas_book_path = await _update_book(config, rw, values["pdf_bytes"],
+                                                  workspace.publish_dir, skip_nas)
 
     # ── Stage 9: Summary ─────────────────────────────────────────────────
     elapsed = time.time() - start_time
-    print("\n" + "=" * 56)
-    print(f"  REPORT GENERATION COMPLETE")
-    print(f"  Duration: {elapsed:.1f} seconds")
-    print("=" * 56)
-    print(f"\nGenerated files:")
-    print(f"  PDF:   {pdf_path}")
+    progress("\n" + "=" * 56)
+    progress(f"  REPORT GENERATION COMPLETE")
+    progress(f"  Duration: {elapsed:.1f} seconds")
+    progress("=" * 56)
+    progress(f"\n{graph.format_critical_path()}")
+    progress(f"\nGenerated files:")
+    progress(f"  PDF:   {pdf_path}")
     if nas_pdf_path:
-        print(f"  NAS:   {nas_pdf_path}")
-    print(f"  Data:  {json_path}")
+        progress(f"  NAS:   {nas_pdf_path}")
+    progress(f"  Data:  {json_path}")
     if email_path:
-        print(f"  Email: {email_path}")
+        progress(f"  Email: {email_path}")
+    if book_path:
+        progress(f"  Book:  {book_path}" + (f"  (NAS: {nas_book_path})" if nas_book_path else ""))
+    for profile in profiles[1:]:
+        for kind, path in (("PDF", "pdf_path"), ("NAS", "nas_pdf_path"), ("Email", "email_path")):
+            if extra[profile.name][path]:
+                progress(f"  {profile.label} {kind}: {extra[profile.name][path]}")
 
     if photo_result.get("photo_captions"):
-        print(f"\nPhoto selections:")
+        progress(f"\nPhoto selections:")
         for i, cap in enumerate(photo_result["photo_captions"]):
             score = photo_result["photo_scores"][i] if i < len(photo_result.get("photo_scores", [])) else {}
             s = score.get("total_score", "N/A")
-            print(f"  Photo {i+1}: {os.path.basename(photo_result['photos'][i])}  [Score: {s}]")
-            print(f"           Caption: \"{cap}\"")
+            progress(f"  Photo {i+1}: {os.path.basename(photo_result['photos'][i])}  [Score: {s}]")
+            progress(f"           Caption: \"{cap}\"")
 
     if files.warnings:
-        print(f"\nWarnings:")
+        progress(f"\nWarnings:")
         for w in files.warnings:
-            print(f"  ! {w}")
+            progress(f"  ! {w}")
     if photo_result.get("mismatch_warning"):
-        print(f"  ! PHOTOS: {photo_result['mismatch_warning']}")
+        progress(f"  ! PHOTOS: {photo_result['mismatch_warning']}")
 
-    print(f"\nNext steps:")
-    print(f"  1. Review PDF for accuracy")
+    progress(f"\nNext steps:")
+    progress(f"  1. Review PDF for accuracy")
     if email_path:
-        print(f"  2. Review {email_path.name}")
-        print(f"  3. Send email when ready")
-    print()
+        progress(f"  2. Review {email_path.name}")
+        progress(f"  3. Send email when ready")
 
     return {
         "pdf_path": pdf_path,
         "json_path": str(json_path),
         "email_path": str(email_path) if email_path else None,
+        "book_path": str(book_path) if book_path else None,
         "report_number": rw.report_number,
         "duration": elapsed,
+        "critical_path": [t.name for t in graph.critical_path()],
         "warnings": files.warnings,
+        "profiles": extra,
     }
 
 
-def _save_debug(data: dict, name: str, rw: ReportWeek):
+def _save_debug(data: dict, name: str, rw: ReportWeek, workspace: Workspace):
     """Save intermediate result for debugging."""
-    output_dir = PROJECT_ROOT / "output"
-    output_dir.mkdir(exist_ok=True)
-    path = output_dir / f"debug_{name}_{rw.report_number:02d}.json"
+    path = workspace.path(f"debug_{name}_{rw.report_number:02d}.json")
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, default=str)
-    print(f"  [debug] Saved: {path.name}")
+    emit(events.ARTIFACT_WRITTEN, f"  [debug] Saved: {path.name}", kind="debug", path=str(path))
@@ -0,0 +1,91 @@
+"""
+Output Profiles: the audiences one run produces a report for.
+The project config itself is the primary profile (the principal report). Each
+entry under "output_profiles" adds another audience (district, board) that
+reuses the run's extraction, synthesis, schedule, minutes and photo results and
+only repeats assembly, PDF rendering and the email draft, with its own
+template, static text, abbreviations, email prompt and recipients.
+
+    "output_profiles": {
+        "district": {
+            "label": "District",
+            "static_data": {"commitment_text": "..."},
+            "abbreviations": {"building": "bldg"},
+            "email_prompt": "email_district_system.md",
+            "outlook": {"recipients_to": [{"name": "...", "email": "..."}]}
+        },
+        "board": {"label": "Board", "template": "generate_report", "email": false, "nas": true}
+    }
+"""
+
+import copy
+from dataclasses import dataclass
+
+PRIMARY = "principal"
+DEFAULT_TEMPLATE = "generate_report"
+DEFAULT_EMAIL_PROMPT = "email_draft_system.md"
+
+# Sections a profile merges over the project's (its keys win); abbreviations
+# are replaced as a whole set
+_MERGED = ("static_data", "email_template", "outlook", "paths", "constants")
+_SETTINGS = ("label", "template", "email_prompt", "email", "nas")
+
+
+@dataclass
+class OutputProfile:
+    name: str
+    label: str
+    config: dict        # the project config with this profile's settings applied
+    template: str       # generator module in pdf_generator_dir/src
+    email_prompt: str   # prompts/ file for the email draft
+    email: bool         # draft an email (and Outlook draft) for this audience
+    nas: bool           # archive this profile's PDF on the NAS
+
+    @property
+    def primary(self) -> bool:
+        return self.name == PRIMARY
+
+    @property
+    def suffix(self) -> str:
+        """Stage and value name suffix: none for the primary profile."""
+        return "" if self.primary else f".{self.name}"
+
+    @property
+    def tag(self) -> str:
+        """File name tag: report_data_22.json, report_data_22_district.json."""
+        return "" if self.primary else f"_{self.name}"
+
+
+def profile_config(config: dict, settings: dict) -> dict:
+    """The project config with a profile's sections applied."""
+    derived = copy.deepcopy(config)
+    derived.pop("output_profiles", None)
+    for section in _MERGED:
+        if section in settings:
+            derived[section] = {**derived.get(section, {}), **settings[section]}
+    if "abbreviations" in settings:
+        derived["abbreviations"] = dict(settings["abbreviations"])
+    return derived
+
+
+def load_profiles(config: dict) -> list[OutputProfile]:
+    """The primary profile followed by the config's output_profiles, in order."""
+    profiles = [OutputProfile(PRIMARY, "Principal", profile_config(config, {}),
+                              DEFAULT_TEMPLATE, DEFAULT_EMAIL_PROMPT, email=True, nas=True)]
+    for name, settings in config.get("output_profiles", {}).items():
+        if name == PRIMARY or not name.isidentifier():
+            raise ValueError(f"Output profile name must be an identifier other than "
+                             f"'{PRIMARY}', got {name!r}")
+        unknown = set(settings) - set(_MERGED) - set(_SETTINGS) - {"abbreviations"}
+        if unknown:
+            raise ValueError(f"Output profile {name!r}: unknown settings {sorted(unknown)}")
+        profiles.append(OutputProfile(
+            name=name,
+            label=settings.get("label", name.title()),
+            config=profile_config(config, settings),
+            template=settings.get("template", DEFAULT_TEMPLATE),
+            email_prompt=settings.get("email_prompt", DEFAULT_EMAIL_PROMPT),
+            email=settings.get("email", True),
+            nas=settings.get("nas", False),
+        ))
+    return profiles
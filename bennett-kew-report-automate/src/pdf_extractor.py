@@ -6,27 +6,33 @@ import os
 import zipfile
 import tempfile
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    fitz = None
+from .tracing import span
 
 
-def _check_fitz():
-    if fitz is None:
-        raise ImportError("PyMuPDF not installed. Run: pip install pymupdf")
+
+def _fitz():
+    """Import PyMuPDF on first use (it is slow to import and only stage 2 needs it)."""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError("PyMuPDF not installed. Run: pip install pymupdf") from None
+    return fitz
 
 
 def extract_text(pdf_path: str) -> str:
     """Extract full text from a PDF. Handles ZIP-wrapped PDFs."""
-    _check_fitz()
-
-    path = _unwrap_zip(pdf_path)
-    doc = fitz.open(path)
-    text = ""
-    for page in doc:
-        text += page.get_text() + "\n"
-    doc.close()
+    fitz = _fitz()
+
+    with span("pdf.extract_text", file=os.path.basename(pdf_path),
+              bytes=os.path.getsize(pdf_path)) as s:
+        path = _unwrap_zip(pdf_path)
+        doc = fitz.open(path)
+        text = ""
+        for page in doc:
+            text += page.get_text() + "\n"
+        if s:
+            s.set(pages=len(doc), chars=len(text))
+        doc.close()
     return text.strip()
 
 
@@ -43,22 +49,26 @@ def extract_daily_report(pdf_path: str) -> dict:
 
 def extract_schedule_table(pdf_path: str) -> str:
     """Extract text from 3-week look-ahead PDF, preserving table structure."""
-    _check_fitz()
-    path = _unwrap_zip(pdf_path)
-    doc = fitz.open(path)
-    text = ""
-    for page in doc:
-        # Use dict mode for better table extraction
-        blocks = page.get_text("dict")["blocks"]
-        lines = []
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    line_text = " ".join(span["text"] for span in line["spans"]).strip()
-                    if line_text:
-                        lines.append(line_text)
-        text += "\n".join(lines) + "\n\n"
-    doc.close()
+    fitz = _fitz()
+    with span("pdf.extract_schedule_table", file=os.path.basename(pdf_path),
+              bytes=os.path.getsize(pdf_path)) as s:
+        path = _unwrap_zip(pdf_path)
+        doc = fitz.open(path)
+        text = ""
+        for page in doc:
+            # Use dict mode for better table extraction
+            blocks = page.get_text("dict")["blocks"]
+            lines = []
+            for block in blocks:
+                if "lines" in block:
+                    for line in block["lines"]:
+                        line_text = " ".join(sp["text"] for sp in line["spans"]).strip()
+                        if line_text:
+                            lines.append(line_text)
+            text += "\n".join(lines) + "\n\n"
+        if s:
+            s.set(pages=len(doc), chars=len(text))
+        doc.close()
     return text.strip()
 
 
@@ -0,0 +1,299 @@
+"""
+Perf History: every run's stage timings, token counts, input sizes and cache
+hit rates, appended to a local SQLite database. Each run is compared against
+the rolling median of earlier successful runs of the same project, so a prompt
+change or library upgrade that makes a stage much slower shows up on the next run.
+"""
+
+import time
+import sqlite3
+import statistics
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+PERF_DB = Path(__file__).parent.parent / "output" / "perf.sqlite"
+
+DEFAULT_THRESHOLD = 0.25  # flag stages more than 25% slower than their median
+DEFAULT_WINDOW = 10       # median over this many earlier runs
+MIN_RUNS = 3              # ...once at least this many exist
+MIN_SECONDS = 1.0         # ignore stages too short to time reliably
+
+TOTAL = "(total)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id            TEXT PRIMARY KEY,
+    project           TEXT NOT NULL,
+    started_at        REAL NOT NULL,
+    target_date       TEXT,
+    report_number     INTEGER,
+    backend           TEXT,
+    dry_run           INTEGER NOT NULL DEFAULT 0,
+    status            TEXT NOT NULL,
+    error             TEXT,
+    duration          REAL,
+    llm_calls         INTEGER NOT NULL DEFAULT 0,
+    input_tokens      INTEGER NOT NULL DEFAULT 0,
+    output_tokens     INTEGER NOT NULL DEFAULT 0,
+    cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+    pages             INTEGER NOT NULL DEFAULT 0,
+    daily_reports     INTEGER,
+    photos            INTEGER,
+    xer_rows          INTEGER,
+    checkpoint_hits   INTEGER,
+    checkpoint_misses INTEGER,
+    daily_stored      INTEGER,
+    daily_extracted   INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_project ON runs (project, started_at);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id        TEXT NOT NULL,
+    stage         TEXT NOT NULL,
+    duration      REAL NOT NULL,
+    cached        INTEGER NOT NULL DEFAULT 0,
+    llm_calls     INTEGER NOT NULL DEFAULT 0,
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    pages         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, stage)
+);
+"""
+
+_RUN_COLUMNS = (
+    "run_id", "project", "started_at", "target_date", "report_number", "backend",
+    "dry_run", "status", "error", "duration", "llm_calls", "input_tokens",
+    "output_tokens", "cache_read_tokens", "pages", "daily_reports", "photos",
+    "xer_rows", "checkpoint_hits", "checkpoint_misses", "daily_stored", "daily_extracted",
+)
+_STAGE_COLUMNS = ("stage", "duration", "cached", "llm_calls", "input_tokens",
+                  "output_tokens", "pages")
+
+
+def summarize_trace(tracer) -> tuple[dict, list[dict]]:
+    """
+    Run-level and per-stage metrics from a finished trace: stage durations,
+    AI calls and tokens (attributed to the stage they ran under), PDF pages,
+    and the input sizes / cache counters the pipeline records on its spans.
+    """
+    by_id = {s.span_id: s for s in tracer.spans}
+    run = {k: 0 for k in ("llm_calls", "input_tokens", "output_tokens",
+                          "cache_read_tokens", "pages")}
+    stages = {}
+
+    def _stage_of(s):
+        while s is not None:
+            if s.name.startswith("stage:"):
+                return s.name.split(":", 1)[1]
+            s = by_id.get(s.parent_id)
+        return None
+
+    for s in tracer.spans:
+        attrs = s.attributes
+        if s.name.startswith("stage:"):
+            row = stages.setdefault(s.name.split(":", 1)[1], {k: 0 for k in _STAGE_COLUMNS[1:]})
+            row["duration"] = (s.end_ns - s.start_ns) / 1e9
+            row["cached"] = int(bool(attrs.get("stage.cached")))
+        elif s.name == "pipeline":
+            run.update({
+                "report_number": attrs.get("report.number"),
+                "daily_reports": attrs.get("input.daily_reports"),
+                "photos": attrs.get("input.photos"),
+                "checkpoint_hits": attrs.get("checkpoint.hits"),
+                "checkpoint_misses": attrs.get("checkpoint.misses"),
+            })
+        for attr, column in (("xer.task_rows", "xer_rows"), ("daily.stored", "daily_stored"),
+                             ("daily.extracted", "daily_extracted")):
+            if attr in attrs:
+                run[column] = (run.get(column) or 0) + attrs[attr]
+
+        counts = {}
+        if s.name in ("llm.messages.create", "cli.call_claude"):
+            counts = {"llm_calls": 1,
+                      "input_tokens": attrs.get("llm.input_tokens") or 0,
+                      "output_tokens": attrs.get("llm.output_tokens") or 0}
+            run["cache_read_tokens"] += attrs.get("llm.cache_read_tokens") or 0
+        elif s.name.startswith("pdf."):
+            counts = {"pages": attrs.get("pages") or 0}
+        stage = _stage_of(s) if counts else None
+        for k, v in counts.items():
+            run[k] += v
+            if stage:
+                stages.setdefault(stage, {k: 0 for k in _STAGE_COLUMNS[1:]})[k] += v
+
+    return run, [{"stage": name, **row} for name, row in stages.items()]
+
+
+@dataclass
+class Regression:
+    stage: str
+    duration: float
+    median: float
+    runs: int  # how many earlier runs the median covers
+
+    @property
+    def change(self) -> float:
+        return self.duration / self.median - 1
+
+
+class PerfHistory:
+    """SQLite run history; one connection per operation, like the job queue."""
+
+    def __init__(self, path: str | Path = PERF_DB, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def record(self, run: dict, stages: list[dict]):
+        """Append one run (see _RUN_COLUMNS) and its per-stage rows."""
+        run = {"started_at": time.time(), **run, "dry_run": int(bool(run.get("dry_run")))}
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    f"INSERT OR REPLACE INTO runs ({', '.join(_RUN_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_RUN_COLUMNS))})",
+                    [run.get(c) for c in _RUN_COLUMNS])
+                db.executemany(
+                    f"INSERT OR REPLACE INTO stages (run_id, {', '.join(_STAGE_COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' * len(_STAGE_COLUMNS))})",
+                    [[run["run_id"]] + [s.get(c, 0) for c in _STAGE_COLUMNS] for s in stages])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def runs(self, project: str = None, limit: int = 20) -> list[dict]:
+        """Most recent runs first, optionally for one project."""
+        query, params = "SELECT * FROM runs", []
+        if project:
+            query += " WHERE project = ?"
+            params.append(project)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as db:
+            return [dict(r) for r in db.execute(query, params)]
+
+    def stages(self, run_id: str) -> list[dict]:
+        with self._connect() as db:
+            return [dict(r) for r in db.execute(
+                "SELECT * FROM stages WHERE run_id = ? ORDER BY duration DESC", (run_id,))]
+
+    def stage_history(self, run: dict, window: int = DEFAULT_WINDOW) -> dict[str, list[float]]:
+        """
+        Durations of each stage (and TOTAL) over the `window` most recent successful
+        runs of the same project and backend before `run`, newest first. Stages
+        loaded from checkpoints are skipped; totals only compare like with like
+        (dry runs against dry runs).
+        """
+        history: dict[str, list[float]] = {}
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT s.stage, s.duration FROM stages s JOIN runs r ON r.run_id = s.run_id "
+                "WHERE r.project = ? AND r.backend IS ? AND r.status = 'ok' AND s.cached = 0 "
+                "AND r.started_at < ? ORDER BY r.started_at DESC",
+                (run["project"], run["backend"], run["started_at"]))
+            for row in rows:
+                durations = history.setdefault(row["stage"], [])
+                if len(durations) < window:
+                    durations.append(row["duration"])
+            history[TOTAL] = [r["duration"] for r in db.execute(
+                "SELECT duration FROM runs WHERE project = ? AND backend IS ? AND status = 'ok' "
+                "AND dry_run = ? AND started_at < ? AND duration IS NOT NULL "
+                "ORDER BY started_at DESC LIMIT ?",
+                (run["project"], run["backend"], run["dry_run"], run["started_at"], window))]
+        return history
+
+    def regressions(self, run_id: str, threshold: float = DEFAULT_THRESHOLD,
+                    window: int = DEFAULT_WINDOW, min_runs: int = MIN_RUNS,
+                    min_seconds: float = MIN_SECONDS) -> list[Regression]:
+        """Stages of run_id (and its total) slower than (1 + threshold) x their rolling median."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return []
+        run = dict(row)
+        history = self.stage_history(run, window)
+        current = {s["stage"]: s["duration"] for s in self.stages(run_id) if not s["cached"]}
+        if run["status"] == "ok" and run["duration"] is not None:
+            current[TOTAL] = run["duration"]
+
+        found = []
+        for stage, duration in current.items():
+            past = history.get(stage, [])
+            if len(past) < min_runs or duration < min_seconds:
+                continue
+            median = statistics.median(past)
+            if median > 0 and duration > median * (1 + threshold):
+                found.append(Regression(stage, duration, median, len(past)))
+        return sorted(found, key=lambda r: -r.change)
+
+
+def format_report(history: PerfHistory, project: str = None, runs: int = 10,
+                  threshold: float = DEFAULT_THRESHOLD, window: int = DEFAULT_WINDOW) -> str:
+    """Recent runs, then the latest run's stages against their rolling medians."""
+    recent = history.runs(project, limit=runs)
+    if not recent:
+        return "No runs recorded yet" + (f" for {project}" if project else "") + "."
+
+    lines = [f"  {'Started':<17} {'Project':<16} {'#':>3} {'Status':<7} {'Time':>7} "
+             f"{'Calls':>5} {'Tokens in/out':>15} {'Pages':>5} {'Photos':>6} {'XER':>6} "
+             f"{'Ckpt':>5} {'Days':>5}",
+             "  " + "-" * 108]
+    for r in recent:
+        num = f"{r['report_number']:02d}" if r["report_number"] is not None else "--"
+        tokens = f"{r['input_tokens']:,}/{r['output_tokens']:,}"
+        lines.append(
+            f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(r['started_at'])):<17} "
+            f"{r['project'][:16]:<16} {num:>3} {r['status']:<7} "
+            f"{(r['duration'] or 0):>6.1f}s {r['llm_calls']:>5} {tokens:>15} {r['pages']:>5} "
+            f"{_opt(r['photos']):>6} {_opt(r['xer_rows']):>6} "
+            f"{_rate(r['checkpoint_hits'], r['checkpoint_misses']):>5} "
+            f"{_rate(r['daily_stored'], r['daily_extracted']):>5}")
+    lines.append("  Ckpt = checkpoint hit rate, Days = daily extractions reused from the store")
+
+    latest = recent[0]
+    past = history.stage_history(latest, window)
+    flagged = {r.stage: r for r in history.regressions(latest["run_id"], threshold, window)}
+    lines += ["", f"Stages of {latest['run_id']} vs median of up to {window} earlier ok runs:",
+              f"  {'Stage':<20} {'Latest':>8} {'Median':>8} {'Change':>7}  Recent (newest first)",
+              "  " + "-" * 78]
+    stage_rows = history.stages(latest["run_id"])
+    if latest["duration"] is not None:
+        stage_rows.append({"stage": TOTAL, "duration": latest["duration"], "cached": 0})
+    for s in stage_rows:
+        durations = past.get(s["stage"], [])
+        median = statistics.median(durations) if durations else None
+        latest_str = "cached" if s["cached"] else f"{s['duration']:.1f}s"
+        median_str = f"{median:.1f}s" if median is not None else "--"
+        change = ("" if s["cached"] or not median
+                  else f"{(s['duration'] / median - 1) * 100:+.0f}%")
+        trend = " ".join(f"{d:.1f}" for d in durations[:8])
+        flag = "  << SLOWER" if s["stage"] in flagged else ""
+        lines.append(f"  {s['stage'][:20]:<20} {latest_str:>8} {median_str:>8} {change:>7}  "
+                     f"{trend}{flag}")
+    if flagged:
+        lines.append(f"\n{len(flagged)} stage(s) more than {threshold:.0%} slower than their median.")
+    return "\n".join(lines)
+
+
+def _opt(value) -> str:
+    return "--" if value is None else str(value)
+
+
+def _rate(hits, misses) -> str:
+    total = (hits or 0) + (misses or 0)
+    return f"{(hits or 0) / total:.0%}" if total else "--"
@@ -8,10 +8,15 @@ import json
 import base64
 from pathlib import Path
 from datetime import date
-from PIL import Image
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+from .events import warning
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+MODEL = "claude-sonnet-4-5-20250929"
 
 PHOTO_TOOLS = [{
     "name": "photo_scores",
@@ -48,6 +53,7 @@ def _encode_image(path: str, quality: int = 80) -> tuple[str, str]:
     media_types = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png'}
     media_type = media_types.get(ext, 'image/jpeg')
 
+    from PIL import Image
     img = Image.open(path)
     buf = io.BytesIO()
     fmt = 'PNG' if ext == '.png' else 'JPEG'
@@ -56,7 +62,7 @@ def _encode_image(path: str, quality: int = 80) -> tuple[str, str]:
     return data, media_type
 
 
-async def select_photos(client: AsyncAnthropic,
+async def select_photos(client: "AsyncAnthropic",
                         candidate_photos: list[tuple[date, str]],
                         activities_completed: list[str],
                         num_photos: int = 2) -> dict:
@@ -100,10 +106,10 @@ async def select_photos(client: AsyncAnthropic,
                 "source": {"type": "base64", "media_type": media_type, "data": data}
             })
         except Exception as e:
-            print(f"  Warning: Could not load photo {path}: {e}")
+            warning(f"  Warning: Could not load photo {path}: {e}", source="photos")
 
     response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+        model=MODEL,
         max_tokens=2000,
         system=system,
         tools=PHOTO_TOOLS,
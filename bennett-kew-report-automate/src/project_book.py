@@ -0,0 +1,162 @@
+"""
+Project Book: every weekly report of a project in one PDF with a bookmark per
+week, kept beside the reports in output/reports/<project>/ for closeout.
+Each run appends only the new week's pages and one outline entry with an
+incremental save (the bytes already in the file are never rewritten), so the
+update costs the same at week 50 as at week 2. A rerun of a week that is
+already in the book, or a backfilled week older than the newest one, rewrites
+the book in Friday order instead.
+"""
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+
+from .workspace import publish_lock
+
+# File name when the config sets none (constants.project_book)
+BOOK_NAME = "Weekly Reports – Cumulative.pdf"
+
+# Bookmark titles end in the report Friday: "Report 21 – February 6, 2026"
+_TITLE_DATE = re.compile(r"([A-Za-z]+ \d{1,2}, \d{4})$")
+
+
+@dataclass
+class BookWeek:
+    friday: date
+    title: str
+    first_page: int  # 0-based
+    pages: int
+
+
+def week_title(report_number: int, friday: date) -> str:
+    return f"Report {report_number:02d} – {friday.strftime('%B')} {friday.day}, {friday.year}"
+
+
+def _title_friday(title: str) -> date | None:
+    m = _TITLE_DATE.search(title)
+    try:
+        return datetime.strptime(m.group(1), "%B %d, %Y").date() if m else None
+    except ValueError:
+        return None
+
+
+def _append_outline_item(doc, title: str, page: int) -> bool:
+    """
+    Add one top-level bookmark after the last: a new item object plus updates
+    to the previous last item and the outline root. False if the document
+    has no outline to append to.
+    """
+    import fitz  # PyMuPDF
+    kind, value = doc.xref_get_key(doc.pdf_catalog(), "Outlines")
+    if kind != "xref":
+        return False
+    root = int(value.split()[0])
+    last_kind, last = doc.xref_get_key(root, "Last")
+    item = doc.get_new_xref()
+    prev = f"/Prev {last}" if last_kind == "xref" else ""
+    doc.update_object(item, f"<</Title {fitz.get_pdf_str(title)} /Parent {root} 0 R {prev} "
+                            f"/Dest [{doc[page].xref} 0 R /Fit]>>")
+    if last_kind == "xref":
+        doc.xref_set_key(int(last.split()[0]), "Next", f"{item} 0 R")
+    else:
+        doc.xref_set_key(root, "First", f"{item} 0 R")
+    doc.xref_set_key(root, "Last", f"{item} 0 R")
+    count_kind, count = doc.xref_get_key(root, "Count")
+    doc.xref_set_key(root, "Count", str((int(count) if count_kind == "int" else 0) + 1))
+    return True
+
+
+class ProjectBook:
+    """The cumulative PDF of one project's weekly reports."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def weeks(self, doc=None) -> list[BookWeek]:
+        """The weeks in the book, in page order, from its top-level bookmarks."""
+        import fitz
+        if doc is None:
+            if not self.path.exists():
+                return []
+            with fitz.open(self.path) as doc:
+                return self.weeks(doc)
+        marks = [(title, page) for level, title, page in doc.get_toc() if level == 1]
+        weeks = []
+        for i, (title, page) in enumerate(marks):
+            end = marks[i + 1][1] if i + 1 < len(marks) else doc.page_count + 1
+            friday = _title_friday(title)
+            if friday:
+                weeks.append(BookWeek(friday, title, page - 1, end - page))
+        return weeks
+
+    def add_week(self, report_number: int, friday: date, pdf: bytes) -> str:
+        """
+        Put one week's report PDF into the book. Returns "created", "appended"
+        (incremental save) or "rebuilt" (week replaced or inserted out of order).
+        """
+        import fitz
+        title = week_title(report_number, friday)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with publish_lock(self.path.parent), fitz.open(stream=pdf, filetype="pdf") as week:
+            if not self.path.exists():
+                self._write([(title, week, 0, week.page_count)])
+                return "created"
+            with fitz.open(self.path) as doc:
+                weeks = self.weeks(doc)
+                if weeks and friday > max(w.friday for w in weeks) and doc.can_save_incrementally():
+                    self._append(doc, title, week)
+                    return "appended"
+            # Rewritten from a copy in memory: the file is replaced while its pages are read
+            with fitz.open(stream=self.path.read_bytes(), filetype="pdf") as doc:
+                parts = [(w.title, doc, w.first_page, w.pages) for w in self.weeks(doc)
+                         if w.friday != friday]
+                parts.append((title, week, 0, week.page_count))
+                parts.sort(key=lambda part: _title_friday(part[0]))
+                self._write(parts)
+            return "rebuilt"
+
+    def snapshot(self) -> bytes:
+        """The book's bytes, read while no run is updating it (for the NAS copy)."""
+        with publish_lock(self.path.parent):
+            return self.path.read_bytes()
+
+    def _append(self, doc, title: str, week):
+        """Incremental save of the new pages and bookmark; the file is cut back on failure."""
+        size = self.path.stat().st_size
+        start = doc.page_count
+        doc.insert_pdf(week)
+        if not _append_outline_item(doc, title, start):
+            toc = doc.get_toc(simple=False)
+            doc.set_toc(toc + [[1, title, start + 1]])
+        try:
+            doc.saveIncr()
+        except BaseException:
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+            raise
+
+    def _write(self, parts: list[tuple]):
+        """Write a fresh book from (title, source doc, first page, pages) parts, atomically."""
+        import fitz
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            with fitz.open() as book:
+                toc = []
+                for title, src, first, pages in parts:
+                    if pages > 0:
+                        toc.append([1, title, book.page_count + 1])
+                        book.insert_pdf(src, from_page=first, to_page=first + pages - 1)
+                book.set_toc(toc)
+                book.set_metadata({"title": self.path.stem})
+                book.xref_set_key(book.pdf_catalog(), "PageMode", "/UseOutlines")  # bookmarks shown
+                book.save(tmp, garbage=3, deflate=True)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,126 @@
+"""
+Publisher: atomic, verified artifact writes.
+Local artifacts are written to a temp file in the target directory and renamed
+into place, several at once off the event loop. Copies to the NAS go to a
+hidden .partial file that is checksummed against the source before it is
+renamed, so a half-written PDF never appears in the archive; transient SMB
+errors are retried, resuming from the bytes already on the share. The source
+can be a file or bytes already in memory (a PDF rendered with
+render_report_bytes), which is then never re-read from disk.
+"""
+
+import os
+import hashlib
+import time
+import random
+import shutil
+import asyncio
+import tempfile
+from pathlib import Path
+
+from .checkpoints import file_digest
+from .tracing import set_attributes
+from .events import warning
+
+CHUNK_SIZE = 1 << 20
+RETRIES = 4
+
+
+class ChecksumMismatch(OSError):
+    """The copy on the share doesn't match the source."""
+
+
+def write_atomic(path: str | Path, data: str | bytes) -> Path:
+    """
+    Write data to path via a temp file in the same directory and os.replace.
+    str is written as UTF-8 text (platform newlines), bytes as-is.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with (os.fdopen(fd, "w", encoding="utf-8") if isinstance(data, str)
+              else os.fdopen(fd, "wb")) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+async def write_all(files: dict[Path, str | bytes]) -> list[Path]:
+    """Write several files concurrently in worker threads (each one atomically)."""
+    return list(await asyncio.gather(*(
+        asyncio.to_thread(write_atomic, path, data) for path, data in files.items())))
+
+
+def _partial_path(dest: Path) -> Path:
+    return dest.with_name(f".{dest.name}.partial")
+
+
+def _copy_from(src: Path | bytes, partial: Path, offset: int, chunk_size: int):
+    """Append src[offset:] to partial (truncated to offset) and flush it to the share."""
+    with open(partial, "r+b" if offset else "wb") as fout:
+        fout.seek(offset)
+        fout.truncate()
+        if isinstance(src, bytes):
+            view = memoryview(src)
+            for start in range(offset, len(src), chunk_size):
+                fout.write(view[start:start + chunk_size])
+        else:
+            with open(src, "rb") as fin:
+                fin.seek(offset)
+                for chunk in iter(lambda: fin.read(chunk_size), b""):
+                    fout.write(chunk)
+        fout.flush()
+        os.fsync(fout.fileno())
+
+
+def copy_verified(src: str | Path | bytes, dest: str | Path, retries: int = RETRIES,
+                  chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    Copy src (a file, or the bytes to write) to dest on a (possibly flaky)
+    network share. The data goes to
+    .<name>.partial next to dest, is read back and compared with the source's
+    sha256, and only then renamed to dest. On OSError the copy is retried with
+    backoff, resuming after the bytes already written; a checksum mismatch
+    starts over. Returns the sha256. Raises the last error when out of retries.
+    """
+    dest = Path(dest)
+    partial = _partial_path(dest)
+    if isinstance(src, bytes):
+        name, size, digest = dest.name, len(src), hashlib.sha256(src).hexdigest()
+    else:
+        src = Path(src)
+        name, size, digest = src.name, src.stat().st_size, file_digest(src)
+    resumed = 0
+    for attempt in range(retries + 1):
+        try:
+            offset = partial.stat().st_size if partial.exists() else 0
+            if offset > size:
+                offset = 0
+            resumed = max(resumed, offset)
+            _copy_from(src, partial, offset, chunk_size)
+            if file_digest(partial) != digest:
+                partial.unlink()
+                raise ChecksumMismatch(f"checksum mismatch copying {name} to {dest.parent}")
+            os.replace(partial, dest)
+            if not isinstance(src, bytes):
+                try:
+                    shutil.copystat(src, dest)  # keep the mtime, like copy2; not all shares allow it
+                except OSError:
+                    pass
+            set_attributes(**{"publish.attempts": attempt + 1, "publish.resumed_bytes": resumed,
+                              "publish.sha256": digest})
+            return digest
+        except OSError as e:
+            if attempt == retries:
+                raise
+            delay = min(30.0, 2 ** attempt) * (0.5 + random.random() / 2)
+            warning(f"  NAS copy of {name} failed ({e}); retrying in {delay:.1f}s",
+                    source="publisher", attempt=attempt + 1)
+            time.sleep(delay)
@@ -0,0 +1,219 @@
+"""
+Rate limiter: adaptive per-model concurrency for a shared Anthropic client.
+Each model gets an AIMD window: it grows by about one slot per window of
+successful calls while the anthropic-ratelimit-* headers show headroom, halves
+on 429/529 and pauses for retry-after. A fixed window shared by every model caps
+the client's total in-flight calls. Waiting calls are served by priority.
+"""
+
+import time
+import heapq
+import random
+import asyncio
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from .llm_client import ClientWrapper
+from .events import warning
+
+# Calls from interactive reruns should overtake backfills sharing the client
+_priority: ContextVar[int] = ContextVar("llm_priority", default=0)
+
+BACKFILL_PRIORITY = -10
+LOW_HEADROOM = 0.1  # stop growing when less than 10% of any quota is left
+
+
+@contextmanager
+def priority(level: int):
+    """Set the queueing priority of AI calls made in this block (higher runs first)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _headroom(headers) -> float:
+    """Smallest remaining/limit ratio across the request and token quotas (1.0 if unknown)."""
+    ratios = []
+    for quota in ("requests", "tokens", "input-tokens", "output-tokens"):
+        limit = headers.get(f"anthropic-ratelimit-{quota}-limit")
+        remaining = headers.get(f"anthropic-ratelimit-{quota}-remaining")
+        try:
+            if limit and remaining is not None and float(limit) > 0:
+                ratios.append(float(remaining) / float(limit))
+        except ValueError:
+            continue
+    return min(ratios, default=1.0)
+
+
+def _retry_after(headers) -> float | None:
+    """Seconds to wait from retry-after, else from the earliest exhausted quota's reset time."""
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    waits = []
+    for quota in ("requests", "tokens", "input-tokens", "output-tokens"):
+        if headers.get(f"anthropic-ratelimit-{quota}-remaining") not in ("0", 0):
+            continue
+        reset = headers.get(f"anthropic-ratelimit-{quota}-reset")
+        try:
+            at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            continue
+        waits.append((at - datetime.now(timezone.utc)).total_seconds())
+    return max(0.0, min(waits)) if waits else None
+
+
+def _backoff(attempt: int) -> float:
+    return min(30.0, 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+class ModelLimiter:
+    """AIMD concurrency window for one model, with a priority queue of waiting calls."""
+
+    def __init__(self, model: str, initial: int, max_limit: int, min_limit: int = 1):
+        self.model = model
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.completed = 0
+        self._hold_until = 0.0  # one decrease per congestion episode
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit) and time.monotonic() >= self.paused_until
+
+    async def acquire(self, level: int = 0):
+        if not self._waiters and self._has_slot():
+            self.in_flight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-level, next(self._seq), fut))
+        try:
+            await fut  # _wake hands the slot over (in_flight already counted)
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._has_slot():
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():  # cancelled while waiting
+                continue
+            self.in_flight += 1
+            fut.set_result(None)
+
+    def on_success(self, headers):
+        self.completed += 1
+        # No growth while recovering from a throttle or when a quota is nearly spent
+        if time.monotonic() >= self._hold_until and _headroom(headers) >= LOW_HEADROOM:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_throttle(self, wait: float):
+        now = time.monotonic()
+        self.throttled += 1
+        if now >= self._hold_until:
+            self.limit = max(self.min_limit, self.limit / 2)
+            self._hold_until = now + max(wait, 1.0)
+        self.paused_until = max(self.paused_until, now + wait)
+        asyncio.get_running_loop().call_later(wait, self._wake)
+
+
+class AdaptiveClient(ClientWrapper):
+    """
+    Shared-client wrapper: per-model AIMD concurrency under a global cap of
+    max_concurrency in-flight calls, priority queueing and retries driven by
+    the rate-limit headers. Wrap a client created with max_retries=0 so the
+    SDK doesn't retry underneath the limiter.
+    """
+
+    def __init__(self, client, max_concurrency: int = 8, initial: int = 4,
+                 max_retries: int = 4):
+        super().__init__(client)
+        self.max_concurrency = max_concurrency
+        self.initial = initial
+        self.max_retries = max_retries
+        self.limiters: dict[str, ModelLimiter] = {}
+        # Fixed window across all models: taken after the model's slot, so a
+        # call waiting on its model's window doesn't hold a global slot
+        self.total = ModelLimiter("*", max_concurrency, max_concurrency, min_limit=max_concurrency)
+
+    def limiter(self, model: str) -> ModelLimiter:
+        if model not in self.limiters:
+            self.limiters[model] = ModelLimiter(model, self.initial, self.max_concurrency)
+        return self.limiters[model]
+
+    async def _create(self, **kwargs):
+        import anthropic
+        limiter = self.limiter(kwargs.get("model"))
+        messages = self._client.messages
+        raw_api = getattr(messages, "with_raw_response", None)
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(_priority.get())
+            try:
+                await self.total.acquire(_priority.get())
+            except BaseException:
+                limiter.release()
+                raise
+            delay = None
+            try:
+                if raw_api is None:  # wrapped client without raw responses: no headers
+                    response = await messages.create(**kwargs)
+                    limiter.on_success({})
+                    return response
+                raw = await raw_api.create(**kwargs)
+                limiter.on_success(raw.headers)
+                return raw.parse()
+            except anthropic.APIStatusError as e:
+                if attempt == self.max_retries:
+                    raise
+                headers = getattr(e.response, "headers", None) or {}
+                if e.status_code in (429, 529):
+                    wait = _retry_after(headers) or _backoff(attempt)
+                    limiter.on_throttle(wait)
+                    warning(f"  {'Rate limited' if e.status_code == 429 else 'API overloaded'} "
+                            f"({limiter.model}): window {int(limiter.limit)}, retry in {wait:.1f}s",
+                            source="rate_limiter", status=e.status_code, model=limiter.model)
+                elif e.status_code in (408, 409) or e.status_code >= 500:
+                    delay = _backoff(attempt)
+                else:
+                    raise
+            except anthropic.APIConnectionError:
+                if attempt == self.max_retries:
+                    raise
+                delay = _backoff(attempt)
+            finally:
+                self.total.release()
+                limiter.release()
+            if delay:
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, dict]:
+        return {m: {"window": round(l.limit, 1), "completed": l.completed,
+                    "throttled": l.throttled} for m, l in self.limiters.items()}
+
+    def format_stats(self) -> str:
+        return ", ".join(f"{m}: {s['completed']} calls, {s['throttled']} throttled, "
+                         f"window {s['window']}" for m, s in self.stats().items())
+
+
+def new_client(max_concurrency: int = 8) -> AdaptiveClient:
+    """AsyncAnthropic behind an AdaptiveClient (the limiter owns retries)."""
+    from anthropic import AsyncAnthropic
+    return AdaptiveClient(AsyncAnthropic(max_retries=0), max_concurrency=max_concurrency)
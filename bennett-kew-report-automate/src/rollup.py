@@ -0,0 +1,248 @@
+"""
+Rollup: monthly and quarterly summaries built from what the weekly runs already
+produced. Days roll up into weeks without the model (the week's published
+report_data, else a merge of the stored daily extractions), weeks into a month
+with one call, and months into a quarter with one more, so a month costs one
+model call instead of re-extracting twenty-odd daily PDFs.
+"""
+
+import json
+import calendar
+from datetime import date, datetime
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
+from .calendar_utils import get_report_week, report_fridays, weekday_dates, ReportWeek
+from .daily_store import DailyStore
+from .workspace import REPORTS_DIR
+from .publisher import write_atomic
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+ROLLUP_DIR = Path(__file__).parent.parent / "output" / "rollups"
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+ROLLUP_TOOLS = [{
+    "name": "rollup_summary",
+    "description": "Summarize a month or quarter of construction progress",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "overall_progress": {"type": "string"},
+            "schedule_status": {"type": "string"},
+            "summary": {"type": "array", "items": {"type": "string"}},
+            "milestones_achieved": {"type": "array", "items": {"type": "string"}},
+            "look_ahead": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["overall_progress", "schedule_status", "summary",
+                     "milestones_achieved", "look_ahead"],
+    }
+}]
+
+
+@dataclass
+class Period:
+    label: str  # "2026-01" or "2026-Q1"
+    kind: str   # "month" or "quarter"
+    start: date
+    end: date
+
+    @property
+    def title(self) -> str:
+        if self.kind == "month":
+            return self.start.strftime("%B %Y")
+        return f"Q{(self.start.month - 1) // 3 + 1} {self.start.year}"
+
+    def months(self) -> list["Period"]:
+        if self.kind == "month":
+            return [self]
+        return [parse_period(f"{self.start.year}-{m:02d}")
+                for m in range(self.start.month, self.start.month + 3)]
+
+
+def parse_period(text: str) -> Period:
+    """'YYYY-MM' (month) or 'YYYY-Qn' (quarter)."""
+    text = text.strip().upper()
+    try:
+        if "-Q" in text:
+            year, q = text.split("-Q")
+            year, q = int(year), int(q)
+            if not 1 <= q <= 4:
+                raise ValueError
+            first = 3 * (q - 1) + 1
+            last_day = calendar.monthrange(year, first + 2)[1]
+            return Period(f"{year}-Q{q}", "quarter", date(year, first, 1),
+                          date(year, first + 2, last_day))
+        start = datetime.strptime(text, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Period must be YYYY-MM or YYYY-Qn, got {text!r}") from None
+    end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return Period(start.strftime("%Y-%m"), "month", start, end)
+
+
+# ── Days -> weeks (no model calls) ──────────────────────────────────────
+
+def _dedupe(items) -> list[str]:
+    seen, out = set(), []
+    for item in items:
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            out.append(item.strip())
+    return out
+
+
+def _week_from_report(path: Path, rw: ReportWeek) -> dict | None:
+    """The week's published report data, if it is for this week."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("report_week") != rw.report_week_str:
+        return None  # another week's report under the same number
+    return {
+        "source": "report",
+        "phase": data.get("phase"),
+        "overall_progress": data.get("overall_progress"),
+        "schedule_status": data.get("schedule_status"),
+        "activities": data.get("activities_completed", []),
+        "milestones": data.get("milestones_achieved", []),
+        "critical_items": data.get("critical_items", []),
+    }
+
+
+def _week_from_days(store: DailyStore, rw: ReportWeek) -> dict | None:
+    """Merge the week's stored daily extractions (ingest-day / Friday runs)."""
+    records = [r for r in (store.load(d) for d in weekday_dates(rw)) if r]
+    if not records:
+        return None
+    days = [r["extraction"] for r in records]
+    return {
+        "source": "daily",
+        "days": len(days),
+        "activities": _dedupe(a for d in days for a in d.get("activities", [])),
+        "issues": _dedupe(i for d in days for i in d.get("issues", [])),
+        "testing": _dedupe(t for d in days for t in d.get("testing", [])),
+    }
+
+
+def collect_weeks(config: dict, project: str, period: Period,
+                  store: DailyStore = None, reports_dir: str | Path = REPORTS_DIR) -> list[dict]:
+    """
+    One summary per report week whose Friday falls in the period, oldest first.
+    Weeks with neither a report nor stored daily extractions are left out.
+    """
+    constants = config["constants"]
+    store = store or DailyStore(project)
+    first_report = constants.get("report_start_date")
+    weeks = []
+    for friday in report_fridays(period.start.isoformat(), period.end.isoformat()):
+        if friday < period.start:
+            continue
+        if first_report and friday < datetime.strptime(first_report, "%Y-%m-%d").date():
+            continue
+        rw = get_report_week(target_date=friday.isoformat(), start_date=first_report,
+                             completion_date=constants.get("substantial_completion_date"))
+        path = Path(reports_dir) / project / f"report_data_{rw.report_number:02d}.json"
+        week = _week_from_report(path, rw) or _week_from_days(store, rw)
+        if week:
+            weeks.append({"week_ending": friday.isoformat(), "report_number": rw.report_number,
+                          "report_week": rw.report_week_str, **week})
+    return weeks
+
+
+# ── Weeks -> month -> quarter (one model call per level) ────────────────
+
+def _format_week(w: dict) -> str:
+    lines = [f"Week {w['report_number']:02d} ({w['report_week']})"]
+    if w["source"] == "report":
+        lines.append(f"Phase: {w.get('phase')} | Progress: {w.get('overall_progress')}% | "
+                     f"Schedule: {w.get('schedule_status')}")
+        lines.append(f"Activities: {'; '.join(w['activities'])}")
+        if w["milestones"]:
+            lines.append(f"Milestones: {'; '.join(w['milestones'])}")
+        if w["critical_items"]:
+            lines.append(f"Critical items: {'; '.join(w['critical_items'])}")
+    else:
+        lines.append(f"(no weekly report; from {w['days']} daily report(s))")
+        lines.append(f"Activities: {'; '.join(w['activities'])}")
+        if w["issues"]:
+            lines.append(f"Issues: {'; '.join(w['issues'])}")
+        if w["testing"]:
+            lines.append(f"Testing: {'; '.join(w['testing'])}")
+    return "\n".join(lines)
+
+
+def _format_month(m: dict) -> str:
+    s = m["summary"]
+    lines = [f"{m['title']} ({len(m['weeks'])} week(s))",
+             f"Progress: {s.get('overall_progress')}% | Schedule: {s.get('schedule_status')}",
+             "Summary:", *(f"* {b}" for b in s.get("summary", []))]
+    if s.get("milestones_achieved"):
+        lines.append(f"Milestones: {'; '.join(s['milestones_achieved'])}")
+    return "\n".join(lines)
+
+
+async def summarize_period(client: "AsyncAnthropic", project_name: str, period: Period,
+                           items: list[dict]) -> dict:
+    """
+    One model call: weekly summaries -> month, or monthly rollups (dicts with
+    title, weeks and summary) -> quarter.
+    """
+    system = (PROMPTS_DIR / "rollup_system.md").read_text(encoding="utf-8")
+    if period.kind == "month":
+        body = "\n\n".join(_format_week(w) for w in items)
+        what = f"these {len(items)} weekly reports"
+    else:
+        body = "\n\n".join(_format_month(m) for m in items)
+        what = f"these {len(items)} monthly summaries"
+    response = await client.messages.create(
+        model=MODEL,
+        max_tokens=2000,
+        system=system,
+        tools=ROLLUP_TOOLS,
+        tool_choice={"type": "tool", "name": "rollup_summary"},
+        messages=[{
+            "role": "user",
+            "content": (f"Project: {project_name}\n"
+                        f"Summarize {what} into a {period.kind}ly progress summary for "
+                        f"{period.title}:\n\n{body}"),
+        }],
+    )
+    for block in response.content:
+        if block.type == "tool_use":
+            return block.input
+    return {"error": "No rollup summary", "summary": []}
+
+
+# ── Output ──────────────────────────────────────────────────────────────
+
+def format_markdown(rollup: dict) -> str:
+    s = rollup["summary"]
+    lines = [f"# {rollup['project_name']}: {rollup['title']} Progress Summary", "",
+             f"**Overall progress:** {s.get('overall_progress')}%  ",
+             f"**Schedule status:** {s.get('schedule_status')}  ",
+             f"**Covers:** {rollup['weeks_covered']} report week(s), "
+             f"{rollup['from']} to {rollup['to']}", "", "## Progress", ""]
+    lines += [f"* {b}" for b in s.get("summary", [])]
+    if s.get("milestones_achieved"):
+        lines += ["", "## Milestones", ""] + [f"* {m}" for m in s["milestones_achieved"]]
+    if s.get("look_ahead"):
+        lines += ["", "## Looking Ahead", ""] + [f"* {a}" for a in s["look_ahead"]]
+    return "\n".join(lines) + "\n"
+
+
+def write_rollup(rollup: dict, project: str, out_dir: str | Path = ROLLUP_DIR) -> tuple[Path, Path]:
+    """Write rollup_<period>.json (full detail) and .md (for the district email)."""
+    out_dir = Path(out_dir) / project
+    stem = f"rollup_{rollup['period']}"
+    json_path = write_atomic(out_dir / f"{stem}.json", json.dumps(rollup, indent=2, default=str))
+    md_path = write_atomic(out_dir / f"{stem}.md", format_markdown(rollup))
+    return json_path, md_path
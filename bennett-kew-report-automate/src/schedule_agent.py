@@ -4,9 +4,13 @@ Uses Anthropic API (Haiku) for simple table parsing.
 """
 
 from pathlib import Path
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+MODEL = "claude-haiku-4-5-20251001"
 
 SCHEDULE_TOOLS = [{
     "name": "schedule_data",
@@ -37,7 +41,7 @@ SCHEDULE_TOOLS = [{
 }]
 
 
-async def process_schedule(client: AsyncAnthropic, schedule_text: str,
+async def process_schedule(client: "AsyncAnthropic", schedule_text: str,
                            report_week_str: str,
                            holidays: list[tuple] = None,
                            master_schedule_context: str = None) -> dict:
@@ -62,7 +66,7 @@ async def process_schedule(client: AsyncAnthropic, schedule_text: str,
         master_note = f"\n\n{master_schedule_context}"
 
     response = await client.messages.create(
-        model="claude-haiku-4-5-20251001",
+        model=MODEL,
         max_tokens=1500,
         system=system,
         tools=SCHEDULE_TOOLS,
@@ -0,0 +1,104 @@
+"""
+Report service: a long-lived process that pulls jobs from the job queue and runs
+them on warm workers (modules imported, API client and thread pool shared), so an on-demand rerun starts without paying process start-up again.
+Run one service per host; all of them can share the same queue database.
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .orchestrator import run_pipeline
+from .job_queue import JobQueue, DEFAULT_QUEUE, QUEUED, worker_name
+from .rate_limiter import new_client, priority
+from .events import progress, warning
+from . import cli_adapter
+
+
+async def serve(queue_path: str | Path = DEFAULT_QUEUE,
+                workers: int = 2,
+                max_concurrency: int = 6,
+                threads: int = 8,
+                backend: str = "api",
+                poll_interval: float = 2.0,
+                lease_seconds: float = 600.0,
+                exit_when_idle: bool = False) -> list[dict]:
+    """
+    Run queue workers until cancelled (Ctrl+C).
+    workers: jobs run concurrently by this host.
+    max_concurrency: cap on in-flight AI calls across this host's jobs (all models);
+                     job priority decides who goes first when calls queue.
+    lease_seconds: a job whose worker stops heartbeating for this long is
+                   handed to another worker (and counts as an attempt); a
+                   worker that finds its lease taken over cancels the run.
+    exit_when_idle: return once the queue has nothing left to claim (batch mode).
+    Returns the finished job summaries (useful with exit_when_idle).
+    """
+    queue = JobQueue(queue_path)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=threads))
+
+    client = None
+    if backend == "api":
+        client = new_client(max_concurrency)
+    else:
+        cli_adapter.set_max_concurrency(max_concurrency)
+
+    finished: list[dict] = []
+
+    async def _heartbeat(job_id: int, owner: str, run: asyncio.Task):
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            alive = await asyncio.to_thread(queue.heartbeat, job_id, owner, lease_seconds)
+            if not alive:
+                # Another worker owns the job now; two runs must not publish the same week
+                warning(f"  Job {job_id}: lease lost to another worker, cancelling the run")
+                run.cancel()
+                return
+
+    async def _worker(index: int):
+        owner = worker_name(index)
+        while True:
+            job = await asyncio.to_thread(queue.claim, owner, lease_seconds)
+            if job is None:
+                # --once still waits for failed jobs whose retry delay hasn't passed
+                if exit_when_idle and not (await asyncio.to_thread(queue.counts)).get(QUEUED):
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+
+            label = f"job {job['id']} ({job['config_name']} {job['target_date'] or 'current'})"
+            progress(f"[{owner}] Starting {label}, attempt {job['attempts']}/{job['max_attempts']}")
+            start = time.time()
+            with priority(job["priority"]):
+                run = asyncio.create_task(run_pipeline(
+                    config_name=job["config_name"], target_date=job["target_date"],
+                    backend=backend, client=client, **job["options"]))
+            beat = asyncio.create_task(_heartbeat(job["id"], owner, run))
+            try:
+                await asyncio.wait({run})
+            finally:
+                beat.cancel()
+                run.cancel()  # no-op once finished; stops the run if this worker is cancelled
+            if run.cancelled():
+                warning(f"[{owner}] {label} abandoned after {time.time() - start:.1f}s")
+                continue
+            try:
+                result = run.result()
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            result.setdefault("duration", time.time() - start)
+
+            if result.get("error"):
+                await asyncio.to_thread(queue.fail, job["id"], owner, result["error"])
+                warning(f"[{owner}] {label} failed: {result['error']}")
+            else:
+                await asyncio.to_thread(queue.complete, job["id"], owner, result)
+                progress(f"[{owner}] {label} done in {result['duration']:.1f}s")
+            finished.append({"job": job, **result})
+
+    progress(f"Serving {queue.path} with {workers} worker(s), "
+             f"max {max_concurrency} concurrent AI calls ({backend.upper()})")
+    await asyncio.gather(*(_worker(i) for i in range(workers)))
+    return finished
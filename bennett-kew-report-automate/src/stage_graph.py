@@ -0,0 +1,181 @@
+"""
+Stage Graph: Declarative pipeline stages run by an async dependency scheduler.
+Each stage names the values it consumes and produces; it starts as soon as all
+of its inputs exist, so independent stages overlap instead of queueing.
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from .checkpoints import CheckpointStore
+from .tracing import span
+from . import events
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[..., Awaitable[dict]]  # called with inputs as kwargs, returns outputs
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    number: int = 0  # pipeline stage number (Stage 2, 3, ...) for --from-stage
+    # Returns the material the outputs depend on (called with the inputs);
+    # None means the stage is never checkpointed.
+    checkpoint: Callable[..., object] | None = None
+    # Called with the outputs; False (a failed fetch or extraction) means they
+    # are not saved, nor is anything computed from them.
+    cacheable: Callable[[dict], bool] | None = None
+
+
+@dataclass
+class StageTiming:
+    name: str
+    start: float
+    end: float
+    blocked_by: str | None  # producer stage of the input that arrived last
+    cached: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class GraphRun:
+    values: dict
+    timings: dict[str, StageTiming]
+    start: float
+    end: float
+
+    @property
+    def wall_time(self) -> float:
+        return self.end - self.start
+
+    def critical_path(self) -> list[StageTiming]:
+        """Walk back from the last stage to finish through the inputs it waited on."""
+        if not self.timings:
+            return []
+        path = [max(self.timings.values(), key=lambda t: t.end)]
+        while path[-1].blocked_by:
+            path.append(self.timings[path[-1].blocked_by])
+        path.reverse()
+        return path
+
+    def format_critical_path(self) -> str:
+        path = self.critical_path()
+        busy = sum(t.duration for t in path)
+        steps = " -> ".join(
+            f"{t.name} ({'cached' if t.cached else f'{t.duration:.1f}s'})" for t in path)
+        return f"Critical path ({busy:.1f}s of {self.wall_time:.1f}s wall): {steps}"
+
+
+def _validate(stages: list[Stage], initial: dict) -> dict[str, str]:
+    """Check the graph is well-formed. Returns output name -> producer stage name."""
+    producers = {}
+    for stage in stages:
+        for out in stage.outputs:
+            if out in producers or out in initial:
+                raise ValueError(f"Stage graph: '{out}' is produced more than once")
+            producers[out] = stage.name
+
+    for stage in stages:
+        for key in stage.inputs:
+            if key not in producers and key not in initial:
+                raise ValueError(f"Stage graph: '{stage.name}' needs '{key}' but nothing produces it")
+
+    # Cycle check: repeatedly retire stages whose inputs are all available
+    available = set(initial)
+    pending = list(stages)
+    while pending:
+        ready = [s for s in pending if all(k in available for k in s.inputs)]
+        if not ready:
+            names = ", ".join(s.name for s in pending)
+            raise ValueError(f"Stage graph has a dependency cycle among: {names}")
+        for s in ready:
+            available.update(s.outputs)
+            pending.remove(s)
+
+    return producers
+
+
+async def run_graph(stages: list[Stage], initial: dict = None,
+                    checkpoints: CheckpointStore = None) -> GraphRun:
+    """
+    Run every stage as soon as its inputs are ready.
+    initial: values available before any stage runs.
+    checkpoints: if given, checkpointed stage outputs are saved and, when the
+                 store allows reuse for that stage number, loaded instead of run.
+                 Outputs that are not cacheable, or computed from such outputs,
+                 are never saved, so a resume retries them.
+    If any stage raises, the remaining stages are cancelled and the error propagates.
+    """
+    initial = dict(initial or {})
+    producers = _validate(stages, initial)
+    loop = asyncio.get_running_loop()
+
+    futures = {key: loop.create_future() for key in producers}
+    timings: dict[str, StageTiming] = {}
+    uncacheable: set[str] = set()  # values a later run must recompute
+    run_start = time.perf_counter()
+
+    async def _run_stage(stage: Stage):
+        kwargs = {}
+        blocked_by = None
+        for key in stage.inputs:
+            if key in initial:
+                kwargs[key] = initial[key]
+                continue
+            kwargs[key] = await futures[key]
+            producer = producers[key]
+            if blocked_by is None or timings[producer].end > timings[blocked_by].end:
+                blocked_by = producer
+
+        start = time.perf_counter()
+        cached = False
+        key = None
+        events.emit(events.STAGE_STARTED, stage=stage.name, number=stage.number,
+                    blocked_by=blocked_by)
+        with span(f"stage:{stage.name}", **{"stage.number": stage.number}) as s:
+            if checkpoints and stage.checkpoint:
+                # Material may hash input files (NAS), so compute it off the event loop
+                material = await asyncio.to_thread(stage.checkpoint, **kwargs)
+                key = checkpoints.key(stage.name, material)
+                if checkpoints.may_reuse(stage.number):
+                    cached, result = checkpoints.load(stage.name, key)
+            if cached:
+                events.progress(f"  [checkpoint] {stage.name}: loaded", stage=stage.name)
+            else:
+                result = await stage.run(**kwargs) or {}
+            if s:
+                s.set(**{"stage.cached": cached})
+        end = time.perf_counter()
+
+        missing = [k for k in stage.outputs if k not in result]
+        if missing:
+            raise RuntimeError(f"Stage '{stage.name}' did not produce: {missing}")
+        outputs = {k: result[k] for k in stage.outputs}
+        if (any(k in uncacheable for k in stage.inputs)
+                or (stage.cacheable and not cached and not stage.cacheable(outputs))):
+            uncacheable.update(stage.outputs)
+        elif key and not cached:
+            checkpoints.save(stage.name, key, outputs)
+        timings[stage.name] = StageTiming(stage.name, start, end, blocked_by, cached)
+        events.emit(events.STAGE_FINISHED, stage=stage.name, number=stage.number,
+                    duration=end - start, cached=cached)
+        for out in stage.outputs:
+            futures[out].set_result(result[out])
+
+    tasks = [asyncio.create_task(_run_stage(s), name=s.name) for s in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    values = dict(initial)
+    values.update({k: f.result() for k, f in futures.items()})
+    return GraphRun(values=values, timings=timings, start=run_start, end=time.perf_counter())
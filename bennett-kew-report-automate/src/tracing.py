@@ -0,0 +1,185 @@
+"""
+Tracing: lightweight OpenTelemetry-style spans for pipeline stages, AI calls,
+PDF extraction and NAS copies. Spans nest through contextvars (so they follow
+asyncio tasks and asyncio.to_thread), and a finished trace is exported as
+OTLP JSON and as a Chrome trace (open in chrome://tracing or ui.perfetto.dev).
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    lane: int  # Chrome trace row: each top-level stage gets its own
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attrs):
+        self.attributes.update({k: v for k, v in attrs.items() if v is not None})
+
+
+class Tracer:
+    """Collects the spans of one pipeline run."""
+
+    def __init__(self, service_name: str, **resource_attrs):
+        self.service_name = service_name
+        self.resource = {"service.name": service_name, **resource_attrs}
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lanes = 0
+        self._lock = threading.Lock()
+
+    def _next_lane(self) -> int:
+        with self._lock:
+            self._lanes += 1
+            return self._lanes
+
+    def start(self, name: str, parent: Span | None, attrs: dict) -> Span:
+        if parent is None:
+            lane = 0
+        elif parent.parent_id is None:
+            lane = self._next_lane()
+        else:
+            lane = parent.lane
+        s = Span(name=name, trace_id=self.trace_id, span_id=os.urandom(8).hex(),
+                 parent_id=parent.span_id if parent else None, lane=lane,
+                 start_ns=time.time_ns())
+        s.set(**attrs)
+        return s
+
+    def finish(self, s: Span):
+        s.end_ns = time.time_ns()
+        with self._lock:
+            self.spans.append(s)
+
+    # ── Exporters ───────────────────────────────────────────────────────
+
+    def to_otlp(self) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attrs(self.resource)},
+            "scopeSpans": [{
+                "scope": {"name": "bennett-kew-report-automate"},
+                "spans": [{
+                    "traceId": s.trace_id,
+                    "spanId": s.span_id,
+                    **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                    "name": s.name,
+                    "kind": 1,  # SPAN_KIND_INTERNAL
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": _otlp_attrs(s.attributes),
+                    "status": ({"code": 2, "message": s.error} if s.error else {"code": 1}),
+                } for s in sorted(self.spans, key=lambda s: s.start_ns)],
+            }],
+        }]}
+
+    def to_chrome(self) -> dict:
+        if not self.spans:
+            return {"traceEvents": []}
+        t0 = min(s.start_ns for s in self.spans)
+        events = []
+        lane_names = {}
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            lane_names.setdefault(s.lane, s.name)
+            args = dict(s.attributes)
+            if s.error:
+                args["error"] = s.error
+            events.append({
+                "name": s.name, "cat": s.name.split(":")[0].split(".")[0], "ph": "X",
+                "ts": (s.start_ns - t0) / 1000, "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": 1, "tid": s.lane, "args": args,
+            })
+        events += [{"name": "thread_name", "ph": "M", "pid": 1, "tid": lane,
+                    "args": {"name": name}} for lane, name in lane_names.items()]
+        events.append({"name": "process_name", "ph": "M", "pid": 1,
+                       "args": {"name": self.service_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, out_dir: str | Path, stem: str) -> tuple[Path, Path]:
+        """Write <stem>.otlp.json and <stem>.chrome.json. Returns both paths."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        otlp_path = out_dir / f"{stem}.otlp.json"
+        chrome_path = out_dir / f"{stem}.chrome.json"
+        with open(otlp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_otlp(), f)
+        with open(chrome_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f)
+        return otlp_path, chrome_path
+
+
+def _otlp_attrs(attrs: dict) -> list[dict]:
+    out = []
+    for k, v in attrs.items():
+        if isinstance(v, bool):
+            value = {"boolValue": v}
+        elif isinstance(v, int):
+            value = {"intValue": str(v)}
+        elif isinstance(v, float):
+            value = {"doubleValue": v}
+        else:
+            value = {"stringValue": str(v)}
+        out.append({"key": k, "value": value})
+    return out
+
+
+# ── Active tracer / span (per asyncio task, inherited by to_thread) ─────
+
+_tracer: ContextVar[Tracer | None] = ContextVar("tracer", default=None)
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def trace_run(service_name: str, **resource_attrs):
+    """Install a fresh tracer for the current task (and everything it spawns) for the block."""
+    tracer = Tracer(service_name, **resource_attrs)
+    tracer_token = _tracer.set(tracer)
+    span_token = _current.set(None)
+    try:
+        yield tracer
+    finally:
+        _current.reset(span_token)
+        _tracer.reset(tracer_token)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def set_attributes(**attrs):
+    """Attach attributes to the innermost open span, if tracing is active."""
+    s = _current.get()
+    if s is not None:
+        s.set(**attrs)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Open a nested span. A no-op (yields None) when no tracer is active."""
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    s = tracer.start(name, _current.get(), attrs)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        tracer.finish(s)
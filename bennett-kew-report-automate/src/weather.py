@@ -5,6 +5,8 @@ with weather-sensitive construction work.
 
 import requests
 
+from .events import warning
+
 WEATHER_GOV_BASE = "https://api.weather.gov"
 USER_AGENT = "BennettKewReportAutomation/1.0 (adam.wentworth@fonder-salari.com)"
 
@@ -43,7 +45,7 @@ def get_forecast(lat: float, lon: float) -> list[dict]:
             "detailed": p["detailedForecast"],
         } for p in periods]
     except Exception as e:
-        print(f"  WARNING: Weather fetch failed: {e}")
+        warning(f"  WARNING: Weather fetch failed: {e}", source="weather")
         return []
 
 
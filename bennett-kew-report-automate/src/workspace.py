@@ -0,0 +1,140 @@
+"""
+Workspace: a private output directory per run, promoted when the run succeeds.
+A run writes everything (report data, photo log, PDF, email, debug dumps) to
+output/runs/<project>/<week>/<run_id>/, so concurrent runs never share a file.
+On success the files are moved into output/reports/<project>/ with os.replace
+(atomic per file, same filesystem) under a per-project lock; a failed run's
+workspace is left in place for inspection and pruned after a while.
+"""
+
+import os
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+OUTPUT_DIR = Path(__file__).parent.parent / "output"
+RUNS_DIR = OUTPUT_DIR / "runs"
+REPORTS_DIR = OUTPUT_DIR / "reports"
+
+KEEP_FAILED_DAYS = 14
+LOCK_TIMEOUT = 60.0  # a lock not refreshed for this long is from a crashed process
+LOCK_REFRESH = 10.0  # the holder touches the lock this often
+LOCK_WAIT = 600.0    # give up waiting for a live holder after this long
+
+_thread_locks: dict[Path, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def publish_lock(directory: Path):
+    """
+    Exclusive lock on a publish directory, across threads and processes on this
+    host. The holder keeps the lock file's mtime fresh from a background thread,
+    so only a lock left by a dead process goes stale, however long it is held.
+    """
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(directory, threading.Lock())
+    with thread_lock:
+        lock_path = directory / ".promote.lock"
+        deadline = time.monotonic() + LOCK_WAIT
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > LOCK_TIMEOUT:
+                        lock_path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {lock_path}")
+                time.sleep(0.05)
+        held = threading.Event()
+        refresher = threading.Thread(target=_refresh_lock, args=(lock_path, held),
+                                     name="publish-lock", daemon=True)
+        try:
+            os.write(fd, f"{os.getpid()}\n".encode())
+            os.close(fd)
+            refresher.start()
+            yield
+        finally:
+            held.set()
+            if refresher.is_alive():
+                refresher.join()
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _refresh_lock(lock_path: Path, released: threading.Event):
+    while not released.wait(LOCK_REFRESH):
+        try:
+            os.utime(lock_path)
+        except FileNotFoundError:
+            return
+
+
+class Workspace:
+    """One run's output directory and the project directory it is promoted into."""
+
+    def __init__(self, project: str, week: str, run_id: str,
+                 root: str | Path = RUNS_DIR, publish_root: str | Path = REPORTS_DIR):
+        self.dir = Path(root) / project / week / run_id
+        self.publish_dir = Path(publish_root) / project
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name: str) -> Path:
+        """Where this run writes `name` until it is promoted."""
+        return self.dir / name
+
+    def promote(self) -> dict[str, Path]:
+        """
+        Move every file into the project's output directory, replacing older
+        copies, and remove the workspace. Returns name -> published path.
+        If two runs of the same week finish together, the later one wins whole:
+        promotions of one project are serialized.
+        """
+        self.publish_dir.mkdir(parents=True, exist_ok=True)
+        published = {}
+        with publish_lock(self.publish_dir):
+            for src in sorted(p for p in self.dir.rglob("*") if p.is_file()):
+                name = src.relative_to(self.dir).as_posix()
+                dest = self.publish_dir / name
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(src, dest)
+                published[name] = dest
+        shutil.rmtree(self.dir, ignore_errors=True)
+        _remove_empty_parents(self.dir.parent, stop=self.dir.parents[2])
+        return published
+
+
+def _remove_empty_parents(directory: Path, stop: Path):
+    while directory != stop:
+        try:
+            directory.rmdir()
+        except OSError:  # not empty (another run of this week) or already gone
+            return
+        directory = directory.parent
+
+
+def prune_workspaces(root: str | Path = RUNS_DIR, keep_days: float = KEEP_FAILED_DAYS) -> int:
+    """Delete run workspaces (left by failed runs) older than keep_days. Returns how many."""
+    root = Path(root)
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - keep_days * 86400
+    removed = 0
+    for run_dir in root.glob("*/*/*"):
+        try:
+            if run_dir.is_dir() and run_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(run_dir, ignore_errors=True)
+                _remove_empty_parents(run_dir.parent, stop=root)
+                removed += 1
+        except FileNotFoundError:  # pruned concurrently
+            continue
+    return removed
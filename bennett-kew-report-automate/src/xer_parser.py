@@ -8,6 +8,9 @@ from datetime import date, datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass
 
+from .tracing import set_attributes
+from .events import warning
+
 
 @dataclass
 class ScheduleActivity:
@@ -23,7 +26,7 @@ def parse_xer(xer_path: str | Path) -> list[ScheduleActivity]:
     """Parse a P6 XER file and return construction activities."""
     xer_path = Path(xer_path)
     if not xer_path.exists():
-        print(f"  WARNING: XER file not found: {xer_path}")
+        warning(f"  WARNING: XER file not found: {xer_path}", source="xer")
         return []
 
     text = xer_path.read_text(encoding="utf-8", errors="replace")
@@ -108,6 +111,7 @@ def parse_xer(xer_path: str | Path) -> list[ScheduleActivity]:
             status=status,
         ))
 
+    set_attributes(**{"xer.task_rows": len(tasks), "xer.activities": len(activities)})
     return activities
 
 
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Render benchmark and pixel-diff regression suite for generate_report.
+Renders examples/sample_data.json and synthetic worst cases (long bullets,
+missing photos, huge photos), times each section of the render cold and warm,
+rasterizes every page with PyMuPDF and compares it with NumPy:
+  - against saved baselines of the same cases (output/benchmarks/baselines/,
+    written by --update-baseline): the regression check, exit 1 if any case changed
+    or has no baseline yet;
+  - against the shipped references (examples/sample_output.pdf and
+    templates/original_template_r1.pdf): drift report only, since both predate
+    the current layout (r1 corrections, Canva export).
+Needs PyMuPDF and NumPy besides reportlab; PDFs and diff images go to output/benchmarks/.
+
+Usage:
+  python benchmarks/render.py --update-baseline   # Before a change: record the current renders
+  python benchmarks/render.py                     # After: time it and diff against the baselines
+  python benchmarks/render.py --cases sample huge_photos --runs 10
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from contextlib import contextmanager
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+OUTPUT_DIR = ROOT / "output" / "benchmarks"
+BASELINE_DIR = OUTPUT_DIR / "baselines"
+REFERENCES = {
+    "sample_output": ROOT / "examples" / "sample_output.pdf",
+    "template_r1": ROOT / "templates" / "original_template_r1.pdf",
+}
+
+# Functions of generate_report timed per call; static_layer includes draw_static
+# (the layer is drawn once, when it is compiled), draw_variable includes prepare_photo
+SECTIONS = ("static_layer", "draw_static", "place_static", "draw_variable", "prepare_photo")
+
+LONG = ("Completed installation of underground storm drain piping, catch basins and cleanouts "
+        "along the north fire lane, including trench backfill, compaction testing by the "
+        "geotechnical engineer and inspection by the district inspector of record")
+
+
+def _huge_photo(path: Path, seed: int, orientation: int = 1):
+    """A 12 MP camera-like JPEG (gradient plus deterministic noise)."""
+    from PIL import Image
+    w, h = 4000, 3000
+    noise = Image.frombytes("RGB", (w, h), random.Random(seed).randbytes(w * h * 3))
+    sky = Image.merge("RGB", [Image.linear_gradient("L").resize((w, h))] * 3)
+    img = Image.blend(sky, noise, 0.25)
+    exif = img.getexif()
+    exif[0x0112] = orientation
+    img.save(path, "JPEG", quality=92, exif=exif)
+
+
+def build_cases(tmp: Path) -> dict[str, dict]:
+    """Case name -> report data (asset paths resolved)."""
+    from run_report import resolve_asset_paths, load_report_data
+    sample = resolve_asset_paths(load_report_data(ROOT / "examples" / "sample_data.json"),
+                                 latest_photos=False)
+    huge = [tmp / "huge_1.jpg", tmp / "huge_2.jpg"]
+    _huge_photo(huge[0], 1)
+    _huge_photo(huge[1], 2, orientation=6)  # shot rotated
+    return {
+        "sample": sample,
+        "long_bullets": {
+            **sample,
+            "project_description": " ".join([sample["project_description"]] * 2),
+            "commitment_text": " ".join([sample["commitment_text"]] * 2),
+            "activities_completed": [f"{LONG} ({i})" for i in range(1, 8)],
+            "milestones_achieved": [f"{LONG} ({i})" for i in range(1, 5)],
+            "critical_items": [LONG, "x" * 160],
+            "planned_activities": [f"{LONG} ({i})" for i in range(1, 6)],
+            "special_considerations": [LONG, LONG],
+            "week1_activities": [LONG[:60], LONG[60:120], LONG[120:180]],
+        },
+        "missing_photos": {
+            **sample,
+            "photos": [str(tmp / "missing_1.jpg"), str(tmp / "missing_2.jpg")],
+        },
+        "huge_photos": {**sample, "photos": [str(p) for p in huge]},
+    }
+
+
+@contextmanager
+def timed_sections(gen, photo_cache: Path):
+    """Wrap SECTIONS in gen with timers (photos cached in photo_cache). Yields {name: [s]}."""
+    calls = defaultdict(list)
+    originals = {name: getattr(gen, name) for name in SECTIONS}
+
+    def timer(name, fn, **extra):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **extra, **kwargs)
+            finally:
+                calls[name].append(time.perf_counter() - start)
+        return timed
+
+    for name, fn in originals.items():
+        extra = {"cache_dir": photo_cache} if name == "prepare_photo" else {}
+        setattr(gen, name, timer(name, fn, **extra))
+    try:
+        yield calls
+    finally:
+        for name, fn in originals.items():
+            setattr(gen, name, fn)
+
+
+def time_case(gen, data: dict, runs: int, tmp: Path) -> tuple[bytes, list[dict]]:
+    """Render runs times from cold caches. Returns (last PDF, per-run {section: seconds})."""
+    gen._static_layers.clear()
+    gen.word_width.cache_clear()
+    photo_cache = Path(tempfile.mkdtemp(dir=tmp, prefix="photos_"))
+    timings = []
+    for _ in range(runs):
+        with timed_sections(gen, photo_cache) as calls:
+            start = time.perf_counter()
+            pdf = gen.render_report_bytes(data)
+            total = time.perf_counter() - start
+        run = {name: sum(calls[name]) for name in SECTIONS}
+        run["canvas+save"] = total - run["static_layer"] - run["place_static"] - run["draw_variable"]
+        run["total"] = total
+        timings.append(run)
+    return pdf, timings
+
+
+def rasterize(pdf, dpi: int):
+    """Every page of a PDF (bytes or path) as HxWx3 uint8 arrays."""
+    import fitz  # PyMuPDF
+    import numpy as np
+    doc = fitz.open(stream=pdf, filetype="pdf") if isinstance(pdf, bytes) else fitz.open(pdf)
+    pages = []
+    for page in doc:
+        pix = page.get_pixmap(dpi=dpi, alpha=False)
+        pages.append(np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width, 3))
+    return pages
+
+
+def load_png(path: Path):
+    import fitz
+    import numpy as np
+    pix = fitz.Pixmap(str(path))
+    return np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width, pix.n)[..., :3]
+
+
+def save_png(path: Path, image):
+    import fitz
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h, w = image.shape[:2]
+    fitz.Pixmap(fitz.csRGB, w, h, image.tobytes(), 0).save(str(path))
+
+
+def diff(image, reference, threshold: int) -> dict:
+    """Per-pixel max channel difference; pixels over threshold count as changed."""
+    import numpy as np
+    if image.shape != reference.shape:
+        return {"shape": f"{image.shape[1]}x{image.shape[0]} vs {reference.shape[1]}x{reference.shape[0]}",
+                "changed": 1.0, "max": 255, "mean": 255.0, "mask": None}
+    delta = np.abs(image.astype(np.int16) - reference.astype(np.int16)).max(axis=2)
+    mask = delta > threshold
+    result = {"changed": float(mask.mean()), "max": int(delta.max()),
+              "mean": float(delta.mean()), "mask": mask}
+    if mask.any():
+        ys, xs = np.nonzero(mask)
+        result["box"] = (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+    return result
+
+
+def heatmap(reference, mask):
+    """The reference faded to gray with changed pixels in red."""
+    import numpy as np
+    gray = reference.mean(axis=2, keepdims=True) * 0.35 + 165
+    out = np.repeat(gray, 3, axis=2).astype(np.uint8)
+    out[mask] = (220, 0, 0)
+    return out
+
+
+def describe(result: dict) -> str:
+    if "shape" in result:
+        return f"page size differs ({result['shape']})"
+    text = f"{result['changed'] * 100:6.3f}% changed, max {result['max']:3d}, mean {result['mean']:.2f}"
+    if "box" in result:
+        text += "  in x{0}-{2} y{1}-{3}".format(*result["box"])
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate_report benchmark and pixel-diff suite")
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Cases to run (default: all): sample long_bullets missing_photos huge_photos")
+    parser.add_argument("--runs", type=int, default=5, help="Renders per case, first one cold (default: 5)")
+    parser.add_argument("--dpi", type=int, default=100, help="Rasterization DPI (default: 100)")
+    parser.add_argument("--threshold", type=int, default=8,
+                        help="Channel difference (0-255) below which a pixel counts as unchanged (default: 8)")
+    parser.add_argument("--max-changed", type=float, default=0.0,
+                        help="Fraction of changed pixels a case may have vs its baseline (default: 0)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Save this run's rasters as the baselines instead of comparing")
+    args = parser.parse_args()
+
+    import generate_report as gen
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(Path(tmp))
+        unknown = set(args.cases or []) - set(cases)
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        for name in args.cases or cases:
+            pdf, timings = time_case(gen, cases[name], args.runs, Path(tmp))
+            (OUTPUT_DIR / f"{name}.pdf").write_bytes(pdf)
+            warm = timings[1:] or timings
+            print(f"{name:<16} cold {timings[0]['total'] * 1000:7.1f} ms  "
+                  f"warm median {statistics.median(r['total'] for r in warm) * 1000:7.1f} ms  "
+                  f"{len(pdf) / 1024:7.0f} KB")
+            for section in (*SECTIONS, "canvas+save"):
+                print(f"    {section:<16} cold {timings[0][section] * 1000:7.1f} ms  "
+                      f"warm {statistics.median(r[section] for r in warm) * 1000:7.1f} ms")
+
+            pages = rasterize(pdf, args.dpi)
+            for i, page in enumerate(pages):
+                baseline = BASELINE_DIR / f"{name}_p{i + 1}_{args.dpi}dpi.png"
+                if args.update_baseline:
+                    save_png(baseline, page)
+                    print(f"    baseline saved: {baseline.relative_to(ROOT)}")
+                elif not baseline.exists():
+                    failed = True
+                    print(f"    FAIL no baseline for page {i + 1} (run with --update-baseline first)")
+                else:
+                    result = diff(page, load_png(baseline), args.threshold)
+                    ok = result["changed"] <= args.max_changed
+                    failed |= not ok
+                    print(f"    {'OK  ' if ok else 'FAIL'} vs baseline p{i + 1}: {describe(result)}")
+                    if result["mask"] is not None and result["mask"].any():
+                        out = OUTPUT_DIR / f"{name}_p{i + 1}_diff.png"
+                        save_png(out, heatmap(load_png(baseline), result["mask"]))
+                        print(f"         diff: {out.relative_to(ROOT)}")
+
+            if name == "sample":
+                for ref_name, ref_path in REFERENCES.items():
+                    if not ref_path.exists():
+                        continue
+                    reference = rasterize(ref_path, args.dpi)[0]
+                    result = diff(pages[0], reference, args.threshold)
+                    print(f"    drift vs {ref_name}: {describe(result)}")
+                    if result["mask"] is not None:
+                        save_png(OUTPUT_DIR / f"sample_vs_{ref_name}.png", heatmap(reference, result["mask"]))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,27 +10,39 @@ Usage:
   python run_report.py examples/sample_data.json                # Custom data
   python run_report.py data.json --output Report_03.pdf         # Custom data + output
   python run_report.py data.json --photos ./this_weeks_photos/  # Custom photo directory
+  python run_report.py data.json --profile                      # CPU/memory profile -> output/profile/
+  python run_report.py batch ../bennett-kew-report-automate/output/reports/bennett_kew/
+                                                                # Re-render every report_data_*.json
+  python run_report.py batch "past/*.json" --output-dir out/ --workers 4
 """
 
 import sys
 import os
 import json
+import time
 import glob
 import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Resolve project root (where this script lives)
 PROJECT_ROOT = Path(__file__).resolve().parent
 
-# Add src to path
+# Add src to path (generate_report is imported in main(), after argument parsing)
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
-from generate_report import generate_report, SAMPLE_DATA
 
 
-def resolve_asset_paths(data: dict, photos_dir: str = None) -> dict:
+# Where `batch` writes PDFs unless --output-dir is given
+BATCH_OUTPUT_DIR = PROJECT_ROOT / "output" / "batch"
+BATCH_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+
+def resolve_asset_paths(data: dict, photos_dir: str = None, latest_photos: bool = True) -> dict:
     """
     Resolve logo and photo paths relative to project root.
     If paths in data are relative and don't exist, try finding them in standard locations.
+    latest_photos: use the newest photos in photos_dir (default ./photos) when it
+    exists; False keeps the data's own photos (re-rendering past reports).
     """
     resolved = dict(data)
     
@@ -50,7 +62,7 @@ def resolve_asset_paths(data: dict, photos_dir: str = None) -> dict:
     
     # ── Resolve photo paths ─────────────────────────────────────────────
     photos_path = Path(photos_dir) if photos_dir else PROJECT_ROOT / "photos"
-    if photos_path.exists():
+    if latest_photos and photos_path.exists():
         photo_files = (
             glob.glob(str(photos_path / "*.jpg")) +
             glob.glob(str(photos_path / "*.jpeg")) +
@@ -78,7 +90,124 @@ def resolve_asset_paths(data: dict, photos_dir: str = None) -> dict:
     return resolved
 
 
+def load_report_data(data_file) -> dict:
+    """A report data JSON merged over the sample defaults."""
+    from generate_report import SAMPLE_DATA
+    with open(data_file, encoding="utf-8") as f:
+        return {**SAMPLE_DATA, **json.load(f)}
+
+
+def batch_files(source: str) -> list[Path]:
+    """report_data_*.json in a directory, or the files matching a glob pattern."""
+    if os.path.isdir(source):
+        return sorted(Path(source).glob("report_data_*.json"))
+    return sorted(Path(p) for p in glob.glob(source) if p.endswith(".json"))
+
+
+def batch_output_name(data_file: Path) -> str:
+    """report_data_22_district.json -> Weekly_Progress_Report_22_district.pdf"""
+    stem = data_file.stem
+    if stem.startswith("report_data_"):
+        stem = "Weekly_Progress_Report_" + stem[len("report_data_"):]
+    return f"{stem}.pdf"
+
+
+def batch_projects(files: list[Path]) -> list[str]:
+    """One data file per distinct static layer (project fields and logos) among files."""
+    from generate_report import STATIC_FIELDS, LOGO_FIELDS
+    projects = {}
+    for f in files:
+        try:
+            data = resolve_asset_paths(load_report_data(f), latest_photos=False)
+            key = tuple(str(data.get(k)) for k in (*STATIC_FIELDS, *LOGO_FIELDS))
+        except Exception:
+            continue  # reported when the file itself is rendered
+        projects.setdefault(key, str(f))
+    return list(projects.values())
+
+
+def _batch_init(project_files: list[str]):
+    """
+    Worker start-up: import the generator, load the font metrics and build the
+    static layer (logos decoded and downsampled, the form compiled) of each
+    project once per process, before the first render.
+    """
+    import generate_report
+    from reportlab.pdfbase.pdfmetrics import getFont
+    for font in BATCH_FONTS:
+        getFont(font)
+    for data_file in project_files:
+        try:
+            generate_report.static_layer(
+                resolve_asset_paths(load_report_data(data_file), latest_photos=False))
+        except Exception:
+            pass  # the render of that file reports it
+
+
+def _batch_render(data_file: str, output: str) -> tuple[str, str, float, int, str | None]:
+    """Render one file in a worker. Returns (data_file, output, seconds, bytes, error)."""
+    from generate_report import generate_report
+    start = time.perf_counter()
+    try:
+        data = resolve_asset_paths(load_report_data(data_file), latest_photos=False)
+        generate_report(data, output)
+        return data_file, output, time.perf_counter() - start, os.path.getsize(output), None
+    except Exception as e:
+        return data_file, output, time.perf_counter() - start, 0, f"{type(e).__name__}: {e}"
+
+
+def batch_main(argv: list[str]) -> int:
+    """Render many report data files across a process pool; 1 if any failed."""
+    parser = argparse.ArgumentParser(
+        prog="run_report.py batch",
+        description="Render every report_data_*.json in a directory (or matching a glob)"
+    )
+    parser.add_argument("source", help="Directory of report_data_*.json files, or a glob pattern")
+    parser.add_argument(
+        "--output-dir", "-o", default=str(BATCH_OUTPUT_DIR),
+        help=f"Directory for the PDFs (default: {BATCH_OUTPUT_DIR.relative_to(PROJECT_ROOT)})"
+    )
+    parser.add_argument(
+        "--workers", "-w", type=int, default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count)"
+    )
+    args = parser.parse_args(argv)
+
+    files = batch_files(args.source)
+    if not files:
+        print(f"❌ No report data files found: {args.source}")
+        return 1
+    out_dir = Path(args.output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(args.workers, len(files)))
+    print(f"📄 Rendering {len(files)} report(s) with {workers} worker(s) -> {out_dir}")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_batch_init,
+                             initargs=(batch_projects(files),)) as pool:
+        futures = [pool.submit(_batch_render, str(f), str(out_dir / batch_output_name(f)))
+                   for f in files]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    failed = 0
+    for data_file, output, seconds, size, error in sorted(results):
+        name = os.path.basename(data_file)
+        if error:
+            failed += 1
+            print(f"  ❌ {name}: {error}")
+        else:
+            print(f"  ✅ {name} -> {os.path.basename(output)}  ({seconds:.2f}s, {size / 1024:.0f} KB)")
+    print(f"{'✅' if not failed else '⚠️ '} {len(files) - failed}/{len(files)} rendered "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(batch_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="Generate Bennett-Kew Weekly Construction Progress Report PDF"
     )
@@ -94,7 +223,12 @@ def main():
         "--photos", "-p", default=None,
         help="Directory containing this week's construction photos"
     )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Sample CPU and memory while rendering; write flamegraphs to output/profile/"
+    )
     args = parser.parse_args()
+    from generate_report import generate_report, SAMPLE_DATA
     
     # ── Load data ───────────────────────────────────────────────────────
     if args.data_file:
@@ -126,7 +260,16 @@ def main():
         output = f"Weekly_Progress_Report_{num}.pdf"
     
     # ── Generate ────────────────────────────────────────────────────────
-    result = generate_report(data, output)
+    if args.profile:
+        from profiling import Profiler
+        with Profiler() as profiler:
+            result = generate_report(data, output)
+        written = profiler.write(PROJECT_ROOT / "output" / "profile",
+                                 f"report_{time.strftime('%Y%m%d_%H%M%S')}")
+        print(profiler.format_table())
+        print(f"🔥 Profile written to {written[-1].parent}")
+    else:
+        result = generate_report(data, output)
     print(f"✅ Report generated: {os.path.abspath(result)}")
     print(f"   Report #{data['report_number']} | Week: {data['report_week']}")
     print(f"   Phase: {data['phase']} | Progress: {data['overall_progress']}%")
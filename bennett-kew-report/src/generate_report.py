@@ -16,13 +16,19 @@ Usage:
   python generate_report.py --output report.pdf  # Specify output filename
 """
 
+import io
 import sys
 import os
+import copy
 import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.colors import HexColor, white, black
-from reportlab.pdfgen import canvas
-from textwrap import wrap
 
 # ============================================================================
 # COLOR PALETTE
@@ -141,59 +147,323 @@ def safe_image(c, path, x, y, w, h):
         c.drawCentredString(x + w/2, y + h/2, f"[{os.path.basename(path)}]")
 
 
-def draw_bullet_list(c, items, x, y, max_width, font_name, font_size, color=BLACK, leading=None):
+# ============================================================================
+# TEXT LAYOUT: lines broken on real font metrics, placed ready to draw
+# ============================================================================
+ELLIPSIS = "\u2026"
+BULLET_LINES = 2  # activities/milestones/critical items: 2-line fields per bullet
+
+
+@dataclass
+class TextBlock:
+    runs: list      # (x, y, text) to draw with drawString, in order
+    lines: int
+    next_y: float   # baseline of the line after the block
+
+
+@lru_cache(maxsize=None)
+def word_width(word, font, size) -> float:
+    """Width of word in points; cached per (word, font, size)."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return stringWidth(word, font, size)
+
+
+def _split_long(word, width, font, size):
+    """A word wider than the line, cut into pieces that fit (as textwrap does)."""
+    pieces, piece = [], ""
+    for ch in word:
+        if piece and word_width(piece + ch, font, size) > width:
+            pieces.append(piece); piece = ch
+        else:
+            piece += ch
+    return pieces + [piece]
+
+
+def break_lines(text, width, font, size, first_indent=0.0):
+    """Greedy line breaks: one (words, widths) per line, the first line first_indent shorter."""
+    space = word_width(" ", font, size)
+    lines, words, widths, used, avail = [], [], [], 0.0, width - first_indent
+    for word in text.split():
+        w = word_width(word, font, size)
+        pieces = [(word, w)] if w <= width else \
+            [(p, word_width(p, font, size)) for p in _split_long(word, width, font, size)]
+        for piece, pw in pieces:
+            if words and used + space + pw > avail:
+                lines.append((words, widths))
+                words, widths, used, avail = [], [], 0.0, width
+            used += (space if words else 0) + pw
+            words.append(piece); widths.append(pw)
+    if words:
+        lines.append((words, widths))
+    return lines
+
+
+def _ellipsize(words, widths, width, font, size):
+    """The line's words cut back until they fit width with a trailing ellipsis."""
+    space = word_width(" ", font, size)
+    words, widths = list(words), list(widths)
+    while words and sum(widths) + space * (len(words) - 1) + word_width(ELLIPSIS, font, size) > width:
+        words.pop(); widths.pop()
+    if not words:
+        return [ELLIPSIS], [word_width(ELLIPSIS, font, size)]
+    words[-1] += ELLIPSIS
+    widths[-1] = word_width(words[-1], font, size)
+    return words, widths
+
+
+def layout(text, x, y, width, font, size, leading, align="left", first_indent=0.0, max_lines=None):
+    """
+    Break text into lines at most width points wide and place them: first
+    baseline at y, leading apart. align: left, center or justify (every line
+    but the last). Words are measured once and the same widths justify them.
+    With max_lines, cut text ends the last line in an ellipsis.
+    """
+    lines = break_lines(text, width, font, size, first_indent)
+    if max_lines and len(lines) > max_lines:
+        lines = lines[:max_lines]
+        indent = first_indent if max_lines == 1 else 0.0
+        lines[-1] = _ellipsize(*lines[-1], width - indent, font, size)
+    space = word_width(" ", font, size)
+    runs = []
+    for i, (words, widths) in enumerate(lines):
+        indent = first_indent if i == 0 else 0.0
+        lx, lw = x + indent, width - indent
+        if align == "justify" and i < len(lines) - 1 and len(words) > 1:
+            gap = (lw - sum(widths)) / (len(words) - 1)
+            for word, ww in zip(words, widths):
+                runs.append((lx, y, word))
+                lx += ww + gap
+        else:
+            if align == "center":
+                lx += (lw - sum(widths) - space * (len(words) - 1)) / 2
+            runs.append((lx, y, " ".join(words)))
+        y -= leading
+    return TextBlock(runs, len(lines), y)
+
+
+def draw_runs(c, runs):
+    for x, y, text in runs:
+        c.drawString(x, y, text)
+
+
+def draw_bullet_list(c, items, x, y, max_width, font_name, font_size, color=BLACK, leading=None,
+                     max_lines=None):
     if leading is None:
         leading = font_size + 3
-    current_y = y
     indent = 10
-    chars = max(20, int((max_width - indent) / (font_size * 0.48)))
+    c.setFont(font_name, font_size); c.setFillColor(color)
     for item in items:
-        c.setFont(font_name, font_size); c.setFillColor(color)
-        c.drawString(x, current_y, "•")
-        for i, line in enumerate(wrap(item, width=chars)):
-            c.drawString(x + indent, current_y, line)
-            if i < len(wrap(item, width=chars)) - 1:
-                current_y -= leading
-        current_y -= leading
-    return current_y
+        c.drawString(x, y, "•")
+        block = layout(item, x + indent, y, max_width - indent, font_name, font_size, leading,
+                       max_lines=max_lines)
+        draw_runs(c, block.runs)
+        y = block.next_y if block.lines else y - leading
+    return y
 
 
-def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
-    c = canvas.Canvas(output_path, pagesize=letter)
-    c.setTitle(f"Weekly Progress Report #{data['report_number']} - {data['project_name']}")
-    c.setAuthor(data['prepared_by'])
-    y = PAGE_H
+# ============================================================================
+# PAGE GEOMETRY (fixed; only the text inside the bands changes week to week)
+# ============================================================================
+HEADER_H = 78
+PHOTO_W = 2.6 * 72   # 187.2 pts
+PHOTO_H = 1.7 * 72   # 122.4 pts
+IMPACT_W = PHOTO_W
+RIGHT_X = MARGIN_L + CONTENT_W - IMPACT_W
+LEFT_COL = CONTENT_W - IMPACT_W - 2        # 2pt column gap
+RC_X = MARGIN_L + LEFT_COL; RC_W = CONTENT_W - LEFT_COL
+INFO_H = 82; INFO_LW = 130
+DESC_X = MARGIN_L + INFO_LW + 15
+DESC_W = MARGIN_L + CONTENT_W - DESC_X     # right edge flush with content
+BH2 = 18; DH = 28; ABH = 18
+MAIN_H = 230
+NBH = 18; NH = 132; CBH = 22; CH = 86      # commitment 22+86 = 108 = 1.5"
+
+Y_HEADER = PAGE_H - HEADER_H - 8           # header bottom
+Y_BANNER = Y_HEADER - 2                    # navy banner top
+Y_INFO = Y_BANNER - 22                     # architect info / description top
+Y_DETAILS_BANNER = Y_INFO - INFO_H
+Y_DETAILS = Y_DETAILS_BANNER - BH2         # details box / countdown top
+Y_ACTIVITIES_BANNER = Y_DETAILS - DH
+Y_MAIN = Y_ACTIVITIES_BANNER - ABH         # main content top
+Y_NW = Y_MAIN - MAIN_H                     # NW banner top (306 from bottom)
+Y_NW_CONTENT = Y_NW - NBH
+Y_COMMIT = Y_NW_CONTENT - NH               # commitment banner top = photo 2 bottom
+
+# Project fields (and logo files) the static layer is built from
+STATIC_FIELDS = (
+    "project_name", "project_subtitle", "project_address", "architect",
+    "project_duration", "prepared_by", "project_description", "general_contractor",
+    "construction_manager", "commitment_text", "contact_name", "contact_phone",
+    "contact_email", "district",
+)
+LOGO_FIELDS = ("logo_fs", "logo_bk", "logo_iusd")
+LOGO_DPI = 300  # logos much larger than this at their printed size are downsampled once
+
+
+# ============================================================================
+# STATIC LAYER: header, logos, banners, labels, description and commitment
+# boxes. Drawn once per project (per process) into a Form XObject whose
+# operator stream and encoded images are kept; each report adds that form to
+# its document as-is and draws only the week's fields on top.
+# ============================================================================
+STATIC_FORM = "static_layer"
+# Reusing the form relies on reportlab internals (the document's object table,
+# font mapping and registration marks), tested with reportlab 5.0 (pinned in
+# requirements.txt). If they change, these errors turn it off and every report
+# draws the layer itself.
+_INTERNALS_ERRORS = (AttributeError, ImportError, KeyError, TypeError)
+
+
+@dataclass
+class StaticLayer:
+    logos: dict        # logo field -> file path, or PNG bytes of a downsampled copy
+    description: list  # (x, y, text) runs of the justified description
+    form: object = None     # the compiled PDFFormXObject (never formatted itself); None: redraw
+    fonts: tuple = ()       # (font, internal name) pairs the form's stream refers to
+    images: dict = None     # internal name -> encoded image XObject (and soft masks)
+
+
+_static_layers: dict = {}
+_static_lock = threading.Lock()
+
+
+def _static_key(data) -> tuple:
+    logos = []
+    for field in LOGO_FIELDS:
+        path = data.get(field, '')
+        st = os.stat(path) if path and os.path.exists(path) else None
+        logos.append((path, st and (st.st_mtime_ns, st.st_size)))
+    return tuple(data[f] for f in STATIC_FIELDS) + tuple(logos)
+
+
+def _logo_source(path, w, h):
+    """The logo to embed: the file, or a LOGO_DPI copy (PNG bytes) if the file is far larger."""
+    if not path or not os.path.exists(path):
+        return path
+    try:
+        from PIL import Image
+        with Image.open(path) as im:
+            scale = max(w, h) * LOGO_DPI / 72 / max(im.size)
+            if scale > 0.5:
+                return path
+            im = im.resize((max(1, round(im.width * scale)), max(1, round(im.height * scale))),
+                           Image.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, "PNG", optimize=True)
+            return buf.getvalue()
+    except Exception:
+        return path  # drawn (or replaced by a placeholder) as before
+
+
+def static_layer(data) -> StaticLayer:
+    """The project's static layer, built on first use and cached by its fields and logo files."""
+    key = _static_key(data)
+    with _static_lock:
+        layer = _static_layers.get(key)
+        if layer is None:
+            logo_sz = 55
+            layer = StaticLayer(
+                logos={"logo_fs": _logo_source(data.get('logo_fs', ''), 75, HEADER_H),
+                       "logo_bk": _logo_source(data.get('logo_bk', ''), logo_sz, logo_sz),
+                       "logo_iusd": _logo_source(data.get('logo_iusd', ''), logo_sz, logo_sz)},
+                description=layout(data['project_description'], DESC_X + 4, Y_INFO - 28,
+                                   DESC_W - 8, "Helvetica", 6.5, 8.5, align="justify").runs,
+            )
+            _compile_static(data, layer)
+            _static_layers[key] = layer
+    return layer
+
+
+def _compile_static(data, layer: StaticLayer):
+    """
+    Draw the layer into a scratch canvas and keep its form, fonts and encoded
+    images. Leaves layer.form None (reports redraw the layer) if the reportlab
+    internals this needs are not there.
+    """
+    from reportlab.pdfgen import canvas
+    c = canvas.Canvas(io.BytesIO(), pagesize=letter)
+    c.beginForm(STATIC_FORM)
+    draw_static(c, data, layer)
+    c.endForm()
+    try:
+        from reportlab.pdfbase.pdfdoc import PDFImageXObject, __InternalName__  # noqa: F401
+        doc = c._doc
+        form = doc.idToObject[doc.getXObjectName(STATIC_FORM)]
+        fonts = tuple(doc.fontMapping.items())
+        images = {name: obj for name, obj in doc.idToObject.items()
+                  if isinstance(obj, PDFImageXObject)}
+    except _INTERNALS_ERRORS:
+        return
+    layer.form, layer.fonts, layer.images = form, fonts, images
+
+
+def place_static(c, layer: StaticLayer) -> bool:
+    """
+    Add the compiled static layer to c's document and draw it. False (nothing
+    drawn) if there is no compiled form, c already numbered its fonts
+    differently from the scratch canvas, or reportlab's internals have changed.
+    """
+    if layer.form is None:
+        return False
+    try:
+        doc = c._doc
+        if any(doc.getInternalFontName(font) != name for font, name in layer.fonts):
+            return False
+        for name, image in layer.images.items():
+            doc.Reference(_unregistered(image), name)
+        doc.addForm(STATIC_FORM, _unregistered(layer.form))
+    except _INTERNALS_ERRORS:
+        return False
+    c.doForm(STATIC_FORM)
+    return True
+
+
+def _unregistered(obj):
+    """
+    A shallow copy of a PDF object without the scratch document's registration,
+    for another document. The encoded image data and form stream are shared.
+    """
+    from reportlab.pdfbase.pdfdoc import __InternalName__
+    clone = copy.copy(obj)
+    vars(clone).pop(__InternalName__, None)
+    return clone
+
+
+def _draw_logo(c, source, x, y, w, h):
+    if isinstance(source, bytes):
+        from reportlab.lib.utils import ImageReader
+        c.drawImage(ImageReader(io.BytesIO(source)), x, y, w, h,
+                    preserveAspectRatio=True, mask='auto')
+    else:
+        safe_image(c, source, x, y, w, h)
 
+
+def draw_static(c, data, layer: StaticLayer):
+    """Everything on the page that doesn't change from week to week."""
     # ── HEADER ──────────────────────────────────────────────────────────
-    header_h = 78
-    y -= header_h + 8
-    safe_image(c, data.get('logo_fs', ''), MARGIN_L, y, 75, header_h)
+    y = Y_HEADER
+    _draw_logo(c, layer.logos['logo_fs'], MARGIN_L, y, 75, HEADER_H)
 
     c.setFont("Helvetica-Bold", 14); c.setFillColor(DARK_BLUE)
-    c.drawCentredString(PAGE_W/2, y + header_h - 20, data['project_name'])
+    c.drawCentredString(PAGE_W/2, y + HEADER_H - 20, data['project_name'])
     c.setFont("Helvetica-Bold", 11); c.setFillColor(BLACK)
-    c.drawCentredString(PAGE_W/2, y + header_h - 38, data['project_subtitle'])
+    c.drawCentredString(PAGE_W/2, y + HEADER_H - 38, data['project_subtitle'])
     c.setFont("Helvetica-Bold", 8); c.setFillColor(DARK_GREEN)
-    c.drawCentredString(PAGE_W/2, y + header_h - 52, f"Project Address: {data['project_address']}")
+    c.drawCentredString(PAGE_W/2, y + HEADER_H - 52, f"Project Address: {data['project_address']}")
 
     logo_sz = 55; logo_gap = 8  # same size, balanced gap
     logo_rx = PAGE_W - MARGIN_R - (logo_sz * 2 + logo_gap)
-    logo_ry = y + (header_h - logo_sz) / 2  # vertically centered
-    safe_image(c, data.get('logo_bk', ''), logo_rx, logo_ry, logo_sz, logo_sz)
-    safe_image(c, data.get('logo_iusd', ''), logo_rx + logo_sz + logo_gap, logo_ry, logo_sz, logo_sz)
+    logo_ry = y + (HEADER_H - logo_sz) / 2  # vertically centered
+    _draw_logo(c, layer.logos['logo_bk'], logo_rx, logo_ry, logo_sz, logo_sz)
+    _draw_logo(c, layer.logos['logo_iusd'], logo_rx + logo_sz + logo_gap, logo_ry, logo_sz, logo_sz)
 
-    # ── NAVY BANNER (no curly braces per r1) ─────────────────────────────
-    y -= 2
-    bh = 22
+    # ── NAVY BANNER (no curly braces per r1; the number is drawn per report)
+    y = Y_BANNER
     c.setFillColor(NAVY)
-    c.rect(MARGIN_L, y - bh, CONTENT_W, bh, fill=1, stroke=0)
-    c.setFont("Helvetica-Bold", 13); c.setFillColor(WHITE)
-    c.drawCentredString(PAGE_W/2, y - bh + 6,
-                        f"WEEKLY CONSTRUCTION PROGRESS REPORT {data['report_number']}")
-    y -= bh
+    c.rect(MARGIN_L, y - 22, CONTENT_W, 22, fill=1, stroke=0)
 
     # ── ARCHITECT INFO + DESCRIPTION ────────────────────────────────────
-    info_h = 82; info_lw = 130
+    y = Y_INFO
     lx = MARGIN_L + 4; ly = y - 12
     for label, val, bold_val in [
         ("Architect:", data['architect'], True),
@@ -205,71 +475,39 @@ def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
         c.setFont("Helvetica-BoldOblique", 8); c.setFillColor(DARK_GREEN)
         c.drawString(lx, ly, val); ly -= 12
 
-    desc_x = MARGIN_L + info_lw + 15
-    desc_w = MARGIN_L + CONTENT_W - desc_x  # right edge flush with content
     c.setFont("Helvetica-Bold", 13); c.setFillColor(DARK_GREEN)
-    c.drawCentredString(desc_x + desc_w/2, y - 14, "PROJECT DESCRIPTION")
+    c.drawCentredString(DESC_X + DESC_W/2, y - 14, "PROJECT DESCRIPTION")
     c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.rect(desc_x, y - info_h, desc_w, info_h - 18, stroke=1, fill=0)
+    c.rect(DESC_X, y - INFO_H, DESC_W, INFO_H - 18, stroke=1, fill=0)
     # Thin gray border on left side of description section
     c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.line(desc_x, y, desc_x, y - info_h)
-    dy = y - 28
+    c.line(DESC_X, y, DESC_X, y - INFO_H)
     c.setFont("Helvetica", 6.5); c.setFillColor(BLACK)
-    text_w = desc_w - 8  # usable width inside box
-    desc_lines = wrap(data['project_description'], width=int(text_w / (6.5 * 0.47)))
-    for idx, line in enumerate(desc_lines):
-        if idx < len(desc_lines) - 1:  # justify all lines except last
-            words = line.split()
-            if len(words) > 1:
-                total_word_w = sum(c.stringWidth(w, "Helvetica", 6.5) for w in words)
-                space = (text_w - total_word_w) / (len(words) - 1)
-                wx = desc_x + 4
-                for w in words:
-                    c.drawString(wx, dy, w)
-                    wx += c.stringWidth(w, "Helvetica", 6.5) + space
-            else:
-                c.drawString(desc_x + 4, dy, line)
-        else:
-            c.drawString(desc_x + 4, dy, line)
-        dy -= 8.5
-    y -= info_h
+    draw_runs(c, layer.description)
 
     # ── PROJECT REPORT DETAILS / COUNTDOWN BANNERS ──────────────────────
-    # Right column = photo width; left column fills the rest
-    photo_w = 2.6 * 72   # 187.2 pts
-    photo_h = 1.7 * 72   # 122.4 pts
-    col_gap = 2
-    impact_w = photo_w
-    right_x = MARGIN_L + CONTENT_W - impact_w
-    left_col = CONTENT_W - impact_w - col_gap
-    bh2 = 18
+    y = Y_DETAILS_BANNER
     c.setFillColor(GREEN_BANNER)
-    c.rect(MARGIN_L, y - bh2, left_col, bh2, fill=1, stroke=0)
+    c.rect(MARGIN_L, y - BH2, LEFT_COL, BH2, fill=1, stroke=0)
     c.setFont("Helvetica-BoldOblique", 11); c.setFillColor(WHITE)
-    c.drawCentredString(MARGIN_L + left_col/2, y - bh2 + 5, "PROJECT REPORT DETAILS")
-    rc_x = MARGIN_L + left_col; rc_w = CONTENT_W - left_col  # flush with left column
+    c.drawCentredString(MARGIN_L + LEFT_COL/2, y - BH2 + 5, "PROJECT REPORT DETAILS")
     c.setFillColor(WHITE); c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.rect(rc_x, y - bh2, rc_w, bh2, fill=1, stroke=1)
+    c.rect(RC_X, y - BH2, RC_W, BH2, fill=1, stroke=1)
     c.setFont("Helvetica-Bold", 9); c.setFillColor(GREEN_BANNER)
-    c.drawCentredString(rc_x + rc_w/2, y - bh2 + 5, "Substantial Completion Countdown")
-    y -= bh2
+    c.drawCentredString(RC_X + RC_W/2, y - BH2 + 5, "Substantial Completion Countdown")
 
     # ── DETAILS BOX (r1: 2-column layout) ───────────────────────────────
-    dh = 28
+    y = Y_DETAILS
     c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.rect(MARGIN_L, y - dh, left_col, dh, stroke=1, fill=0)
-    dx = MARGIN_L + 6; half = left_col / 2
+    c.rect(MARGIN_L, y - DH, LEFT_COL, DH, stroke=1, fill=0)
+    dx = MARGIN_L + 6; half = LEFT_COL / 2
 
-    # Left: dates
+    # Left: date labels
     dy = y - 12
     c.setFont("Helvetica-Bold", 8); c.setFillColor(BLACK)
-    c.drawString(dx, dy, "Report Week: "); c.setFont("Helvetica", 8)
-    c.drawString(dx + 70, dy, data['report_week'])
+    c.drawString(dx, dy, "Report Week: ")
     dy -= 12
-    c.setFont("Helvetica-Bold", 8); c.setFillColor(BLACK)
-    c.drawString(dx, dy, "Issued: "); c.setFont("Helvetica", 8)
-    c.drawString(dx + 40, dy, data['issued_date'])
+    c.drawString(dx, dy, "Issued: ")
 
     # Right: GC/CM
     rx = MARGIN_L + half; dy = y - 12
@@ -283,76 +521,234 @@ def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
     c.drawString(rx + 95, dy, data['construction_manager'])
 
     # ── ACTIVITIES + IMPACT BANNERS ─────────────────────────────────────
-    abh = 18
-
     # Countdown box (expanded to span details row + activities banner row)
-    cx = MARGIN_L + left_col
-    cd_w = CONTENT_W - left_col
-    cd_h = dh + abh  # extend down through activities banner row
+    cd_h = DH + ABH
     c.setFillColor(LIGHT_GRAY); c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.rect(cx, y - cd_h, cd_w, cd_h, fill=1, stroke=1)
-    c.setFont("Helvetica-Bold", 23); c.setFillColor(RED_BANNER)
-    c.drawCentredString(cx + cd_w/2 - 25, y - cd_h/2 - 5, data['countdown_days'])
+    c.rect(RC_X, y - cd_h, RC_W, cd_h, fill=1, stroke=1)
     c.setFont("Helvetica-Bold", 10); c.setFillColor(DARK_BLUE)
-    c.drawString(cx + cd_w/2 - 2, y - cd_h/2 - 1, "Calendar Days")
-    y -= dh
+    c.drawString(RC_X + RC_W/2 - 2, y - cd_h/2 - 1, "Calendar Days")
 
+    y = Y_ACTIVITIES_BANNER
     c.setFillColor(GREEN_BANNER)
-    c.rect(MARGIN_L, y - abh, left_col, abh, fill=1, stroke=0)
+    c.rect(MARGIN_L, y - ABH, LEFT_COL, ABH, fill=1, stroke=0)
     c.setFont("Helvetica-BoldOblique", 11); c.setFillColor(WHITE)
-    c.drawCentredString(MARGIN_L + left_col/2, y - abh + 5, "THIS WEEK'S COMPLETED ACTIVITIES")
+    c.drawCentredString(MARGIN_L + LEFT_COL/2, y - ABH + 5, "THIS WEEK'S COMPLETED ACTIVITIES")
     # Impact banner: top aligned with Activities banner bottom
     c.setFillColor(WHITE); c.setStrokeColor(MED_GRAY); c.setLineWidth(0.5)
-    c.rect(rc_x, y - abh * 2, rc_w, abh, fill=1, stroke=1)
+    c.rect(RC_X, y - ABH * 2, RC_W, ABH, fill=1, stroke=1)
     c.setFont("Helvetica-Bold", 9); c.setFillColor(GREEN_BANNER)
-    c.drawCentredString(rc_x + rc_w/2, y - abh * 2 + 5, "3-WEEK CONSTRUCTION IMPACT")
-    y -= abh
+    c.drawCentredString(RC_X + RC_W/2, y - ABH * 2 + 5, "3-WEEK CONSTRUCTION IMPACT")
 
-    # ── MAIN CONTENT ────────────────────────────────────────────────────
-    # Precompute layout: NW banner top at 4.25" from page bottom = 306 pts
-    main_h = 230
-    nbh = 18; nh = 132; cbh = 22; ch = 86  # commitment 22+86 = 108 = 1.5"
-    y_nw = y - main_h                  # NW banner top (306 from bottom)
-    y_nw_content = y_nw - nbh          # NW content top (288)
-    y_commit = y_nw_content - nh       # commitment banner top = photo 2 bottom
+    # ── MAIN CONTENT FRAME + LABELS ─────────────────────────────────────
+    y = Y_MAIN
+    c.setStrokeColor(MED_GRAY)
+    c.rect(MARGIN_L, y - MAIN_H, LEFT_COL, MAIN_H, stroke=1, fill=0)
+    lx = MARGIN_L + 6; ly = y - 11
+    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
+    for label in ("Phase: ", "Overall Progress: ", "Schedule Status: "):
+        c.drawString(lx, ly, label); ly -= 10
+    ly -= 2
+    c.drawString(lx, ly, "Activities Completed:")
+    c.drawString(MARGIN_L + LEFT_COL/2 + 5, y - 11, "Milestones Achieved:")
+
+    col_w = IMPACT_W / 3
+    c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
+    for i in range(3):
+        gx = RIGHT_X + i * col_w
+        c.drawCentredString(gx + col_w/2, y - ABH - 10, f"Week {i+1}")
 
+    # ── NEXT WEEK BANNER + FRAME ────────────────────────────────────────
+    y = Y_NW
+    c.setFillColor(GREEN_BANNER)
+    c.rect(MARGIN_L, y - NBH, LEFT_COL, NBH, fill=1, stroke=0)
+    c.setFont("Helvetica-BoldOblique", 11); c.setFillColor(WHITE)
+    c.drawCentredString(MARGIN_L + LEFT_COL/2, y - NBH + 4, "NEXT WEEK ACTIVITY PROJECTION")
+    y = Y_NW_CONTENT
     c.setStrokeColor(MED_GRAY)
-    c.rect(MARGIN_L, y - main_h, left_col, main_h, stroke=1, fill=0)
+    c.rect(MARGIN_L, y - NH, LEFT_COL, NH, stroke=1, fill=0)
+    c.setFont("Helvetica-Bold", 8); c.setFillColor(BLACK)
+    c.drawString(MARGIN_L + 6, y - 12, "PLANNED ACTIVITIES")
 
-    lx = MARGIN_L + 6; ly = y - 11; act_w = left_col/2 - 8
-    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
-    c.drawString(lx, ly, "Phase: "); c.setFont("Helvetica", 7.5)
+    # ── COMMITMENT (anchored to photo 2 bottom) ─────────────────────────
+    y = Y_COMMIT
+    c.setFillColor(NAVY)
+    c.rect(MARGIN_L, y - CBH, CONTENT_W, CBH, fill=1, stroke=0)
+    c.setFont("Helvetica-Bold", 14); c.setFillColor(WHITE)
+    c.drawString(MARGIN_L + 10, y - CBH + 6, "COMMITMENT")
+    y -= CBH
+
+    c.setStrokeColor(MED_GRAY)
+    c.rect(MARGIN_L, y - CH, CONTENT_W, CH, stroke=1, fill=0)
+    cx_t = MARGIN_L + 8; cy_t = y - 12
+    promise = "Community Promise: "
+    c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
+    c.drawString(cx_t, cy_t, promise)
+    block = layout(data['commitment_text'], cx_t, cy_t, CONTENT_W - 16, "Helvetica", 7, 8,
+                   first_indent=word_width(promise, "Helvetica-Bold", 7))
+    c.setFont("Helvetica", 7)
+    draw_runs(c, block.runs)
+    cy_t = block.next_y
+    cy_t -= 2
+    c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
+    label = "Direct Contact for Immediate Issues: "
+    c.drawString(cx_t, cy_t, label)
+    lw = c.stringWidth(label, "Helvetica-Bold", 7)
+    contact = f"{data['contact_name']} {data['contact_phone']} | "
+    c.drawString(cx_t + lw, cy_t, contact)
+    cw = c.stringWidth(contact, "Helvetica-Bold", 7)
+    c.setFont("Helvetica", 7); c.setFillColor(BLUE_LINK)
+    email_x = cx_t + lw + cw
+    c.drawString(email_x, cy_t, data['contact_email'])
+    email_w = c.stringWidth(data['contact_email'], "Helvetica", 7)
+    c.setStrokeColor(BLUE_LINK); c.setLineWidth(0.4)
+    c.line(email_x, cy_t - 1, email_x + email_w, cy_t - 1)
+
+    cy_t -= 22
+    c.setFont("Helvetica-BoldOblique", 9); c.setFillColor(NAVY)
+    c.drawCentredString(PAGE_W/2, cy_t, data['district'])
+
+
+# ============================================================================
+# PHOTOS: camera JPEGs resampled to their printed frame, EXIF orientation
+# applied, re-encoded, cached on disk by source hash (unused copies pruned)
+# ============================================================================
+PHOTO_CACHE_DIR = Path(__file__).parent.parent / "output" / "photo_cache"
+PHOTO_CACHE_DAYS = 60  # prepared copies not used for this long are deleted
+PHOTO_CACHE_MB = 500   # then the least recently used ones, until the cache fits
+PHOTO_DPI = 200        # pixels per inch at the frame's printed size
+PHOTO_QUALITY = 82     # JPEG quality of the embedded copies
+# With a PDF size budget, photos step down through these until the report fits
+BUDGET_STEPS = ((200, 82), (200, 70), (150, 70), (150, 60), (120, 55), (96, 50))
+
+_photo_digests: dict = {}  # (path, mtime_ns, size) -> sha256 of the file
+_pruned_caches: set = set()  # cache dirs pruned by this process
+
+
+def _photo_digest(path) -> str:
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _photo_digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _photo_digests[key] = h.hexdigest()
+    return _photo_digests[key]
+
+
+def prepare_photo(path, w=IMPACT_W, h=PHOTO_H, dpi=PHOTO_DPI, quality=PHOTO_QUALITY,
+                  cache_dir=PHOTO_CACHE_DIR) -> str:
+    """
+    A JPEG of the photo sized for a w x h pt frame at dpi, upright per its EXIF
+    orientation, at the given quality. Cached by the source's hash and these
+    settings; the original path is returned if it can't be processed.
+    """
+    try:
+        from PIL import Image, ImageOps
+        px = (max(1, round(w * dpi / 72)), max(1, round(h * dpi / 72)))
+        out = Path(cache_dir) / f"{_photo_digest(path)[:20]}_{px[0]}x{px[1]}_q{quality}.jpg"
+        if out.exists():
+            try:
+                os.utime(out)  # last use, for pruning
+            except OSError:
+                pass
+            return str(out)
+        with Image.open(path) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.mode not in ("RGB", "L"):
+                flat = Image.new("RGB", im.size, "white")
+                flat.paste(im.convert("RGBA"), mask=im.convert("RGBA").getchannel("A"))
+                im = flat
+            # Stretched to the frame like drawImage does, never enlarged
+            if im.width > px[0] or im.height > px[1]:
+                im = im.resize((min(px[0], im.width), min(px[1], im.height)), Image.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f".{out.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(buf.getvalue())
+        os.replace(tmp, out)
+        if out.parent not in _pruned_caches:  # the cache only grows here; prune once per process
+            _pruned_caches.add(out.parent)
+            prune_photo_cache(out.parent)
+        return str(out)
+    except Exception:
+        return path  # embedded as-is (or skipped) as before
+
+
+def prune_photo_cache(cache_dir=PHOTO_CACHE_DIR, keep_days=PHOTO_CACHE_DAYS,
+                      max_mb=PHOTO_CACHE_MB) -> int:
+    """
+    Delete prepared photos not used for keep_days, then the least recently
+    used ones until the cache is under max_mb. Returns how many were deleted.
+    """
+    entries = []
+    for f in Path(cache_dir).glob("*.jpg"):
+        try:
+            st = f.stat()
+        except FileNotFoundError:  # pruned concurrently
+            continue
+        entries.append((st.st_mtime, st.st_size, f))
+    entries.sort(key=lambda e: e[0])
+    cutoff = time.time() - keep_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, f in entries:
+        if mtime >= cutoff and total <= max_mb * 1024 * 1024:
+            break
+        try:
+            f.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    return removed
+
+
+def draw_variable(c, data, photo_dpi=PHOTO_DPI, photo_quality=PHOTO_QUALITY):
+    """The week's fields, drawn over the static layer."""
+    # ── Report number in the navy banner ────────────────────────────────
+    c.setFont("Helvetica-Bold", 13); c.setFillColor(WHITE)
+    c.drawCentredString(PAGE_W/2, Y_BANNER - 22 + 6,
+                        f"WEEKLY CONSTRUCTION PROGRESS REPORT {data['report_number']}")
+
+    # ── Details: dates and countdown ────────────────────────────────────
+    y = Y_DETAILS
+    dx = MARGIN_L + 6; dy = y - 12
+    c.setFont("Helvetica", 8); c.setFillColor(BLACK)
+    c.drawString(dx + 70, dy, data['report_week'])
+    dy -= 12
+    c.drawString(dx + 40, dy, data['issued_date'])
+
+    cd_h = DH + ABH
+    c.setFont("Helvetica-Bold", 23); c.setFillColor(RED_BANNER)
+    c.drawCentredString(RC_X + RC_W/2 - 25, y - cd_h/2 - 5, data['countdown_days'])
+
+    # ── MAIN CONTENT ────────────────────────────────────────────────────
+    y = Y_MAIN
+    lx = MARGIN_L + 6; ly = y - 11; act_w = LEFT_COL/2 - 8
+    c.setFont("Helvetica", 7.5); c.setFillColor(BLACK)
     c.drawString(lx + 32, ly, data['phase']); ly -= 10
-    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
-    c.drawString(lx, ly, "Overall Progress: "); c.setFont("Helvetica", 7.5)
     c.drawString(lx + 78, ly, f"{data['overall_progress']}% Complete"); ly -= 10
-    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
-    c.drawString(lx, ly, "Schedule Status: "); c.setFont("Helvetica", 7.5)
     c.drawString(lx + 78, ly, data['schedule_status']); ly -= 12
+    ly -= 10
+    ly = draw_bullet_list(c, data['activities_completed'], lx, ly, act_w, "Helvetica", 6.5, BLACK, 9, BULLET_LINES)
 
-    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
-    c.drawString(lx, ly, "Activities Completed:"); ly -= 10
-    ly = draw_bullet_list(c, data['activities_completed'], lx, ly, act_w, "Helvetica", 6.5, BLACK, 9)
-
-    mx = MARGIN_L + left_col/2 + 5; my = y - 11
-    c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
-    c.drawString(mx, my, "Milestones Achieved:"); my -= 10
-    my = draw_bullet_list(c, data['milestones_achieved'], mx, my, act_w, "Helvetica", 6.5, BLACK, 9)
+    mx = MARGIN_L + LEFT_COL/2 + 5; my = y - 11 - 10
+    my = draw_bullet_list(c, data['milestones_achieved'], mx, my, act_w, "Helvetica", 6.5, BLACK, 9, BULLET_LINES)
     my -= 8
     c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
     c.drawString(mx, my, "Critical Items:"); my -= 10
-    draw_bullet_list(c, data['critical_items'], mx, my, act_w, "Helvetica", 6.5, BLACK, 9)
+    draw_bullet_list(c, data['critical_items'], mx, my, act_w, "Helvetica", 6.5, BLACK, 9, BULLET_LINES)
 
     # Impact grid (shifted down by one banner height to match moved banner)
-    col_w = impact_w / 3
+    col_w = IMPACT_W / 3
     for i, (dk, lk, ak) in enumerate([
         ("week1_dates", "week1_level", "week1_activities"),
         ("week2_dates", "week2_level", "week2_activities"),
         ("week3_dates", "week3_level", "week3_activities"),
     ]):
-        gx = right_x + i * col_w; gy = y - abh
-        c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
-        c.drawCentredString(gx + col_w/2, gy - 10, f"Week {i+1}")
+        gx = RIGHT_X + i * col_w; gy = y - ABH
         c.setFont("Helvetica", 5.5); c.setFillColor(MED_GRAY)
         c.drawCentredString(gx + col_w/2, gy - 19, f"({data[dk]})")
         level = data[lk]
@@ -363,11 +759,11 @@ def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
         c.setFont("Helvetica-Bold", 7); c.setFillColor(WHITE)
         c.drawCentredString(bx + bw/2, by + 4, level.upper())
         ay = by - 10
+        c.setFont("Helvetica", 5.5); c.setFillColor(DARK_GRAY)
         for act in data[ak][:3]:
-            c.setFont("Helvetica", 5.5); c.setFillColor(DARK_GRAY)
-            for wline in wrap(act, width=22):
-                c.drawCentredString(gx + col_w/2, ay, wline)
-                ay -= 7
+            block = layout(act, gx + 2, ay, col_w - 4, "Helvetica", 5.5, 7, align="center")
+            draw_runs(c, block.runs)
+            ay = block.next_y
 
     # Photos in right column — anchored to commitment banner top
     photos = data.get('photos', []); captions = data.get('photo_captions', [])
@@ -375,90 +771,110 @@ def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
     cap_from_bottom = 27  # 3/8 inch from photo bottom to caption top
 
     if len(photos) > 0:
-        photo_x = right_x
-        p2_bottom = y_commit + 2               # 2pt gap above commitment banner
-        p1_bottom = p2_bottom + photo_h + 2   # 2pt gap between photos
+        photo_x = RIGHT_X
+        p2_bottom = Y_COMMIT + 2               # 2pt gap above commitment banner
+        p1_bottom = p2_bottom + PHOTO_H + 2   # 2pt gap between photos
         positions = [p1_bottom, p2_bottom]
         for i in range(min(2, len(photos))):
             if os.path.exists(photos[i]):
                 try:
-                    c.drawImage(photos[i], photo_x, positions[i], impact_w, photo_h, mask='auto')
+                    c.drawImage(prepare_photo(photos[i], dpi=photo_dpi, quality=photo_quality),
+                                photo_x, positions[i], IMPACT_W, PHOTO_H, mask='auto')
                 except Exception:
                     pass
             if i < len(captions):
                 cap_bot = positions[i] + cap_from_bottom - cap_overlay_h  # +9 from photo bottom
                 c.setFillColor(MED_GRAY)
-                c.rect(photo_x, cap_bot, impact_w, cap_overlay_h, fill=1, stroke=0)
+                c.rect(photo_x, cap_bot, IMPACT_W, cap_overlay_h, fill=1, stroke=0)
                 c.setFont("Helvetica-Bold", 6.5); c.setFillColor(WHITE)
                 c.drawString(photo_x + 3, cap_bot + 6, captions[i])
 
-    # ── NEXT WEEK BANNER (left column only, at precomputed y_nw) ────────
-    y = y_nw  # jump to NW banner position
-    c.setFillColor(GREEN_BANNER)
-    c.rect(MARGIN_L, y - nbh, left_col, nbh, fill=1, stroke=0)
-    c.setFont("Helvetica-BoldOblique", 11); c.setFillColor(WHITE)
-    c.drawCentredString(MARGIN_L + left_col/2, y - nbh + 4, "NEXT WEEK ACTIVITY PROJECTION")
-    y -= nbh
-
     # ── NEXT WEEK CONTENT ───────────────────────────────────────────────
-    c.setStrokeColor(MED_GRAY)
-    c.rect(MARGIN_L, y - nh, left_col, nh, stroke=1, fill=0)
-    lx = MARGIN_L + 6; ly = y - 12
-    c.setFont("Helvetica-Bold", 8); c.setFillColor(BLACK)
-    c.drawString(lx, ly, "PLANNED ACTIVITIES"); ly -= 11
-    ly = draw_bullet_list(c, data['planned_activities'], lx, ly, left_col - 15, "Helvetica", 7, BLACK, 11)
+    y = Y_NW_CONTENT
+    lx = MARGIN_L + 6; ly = y - 12 - 11
+    ly = draw_bullet_list(c, data['planned_activities'], lx, ly, LEFT_COL - 15, "Helvetica", 7, BLACK, 11)
     ly -= 4
     c.setFont("Helvetica-Bold", 6.5); c.setFillColor(BLACK)
     impact_line = f"ANTICIPATED IMPACT LEVELS  |  NOISE INDEX: {data['noise_index']} (Level {data['noise_level']})  |  Peak: Mon-Fri 7-3 PM"
     c.drawString(lx, ly, impact_line); ly -= 15
     c.setFont("Helvetica-Bold", 7.5); c.setFillColor(BLACK)
     c.drawString(lx, ly, "SPECIAL CONSIDERATIONS"); ly -= 10
-    draw_bullet_list(c, data['special_considerations'], lx, ly, left_col - 15, "Helvetica", 6.5, BLACK, 9)
+    draw_bullet_list(c, data['special_considerations'], lx, ly, LEFT_COL - 15, "Helvetica", 6.5, BLACK, 9)
 
-    # ── COMMITMENT (anchored to photo 2 bottom) ─────────────────────────
-    y = y_commit  # jump to commitment position
-    c.setFillColor(NAVY)
-    c.rect(MARGIN_L, y - cbh, CONTENT_W, cbh, fill=1, stroke=0)
-    c.setFont("Helvetica-Bold", 14); c.setFillColor(WHITE)
-    c.drawString(MARGIN_L + 10, y - cbh + 6, "COMMITMENT")
-    y -= cbh
 
-    ch = 86  # 22+86 = 108 pts = 1.5 inches
-    c.setStrokeColor(MED_GRAY)
-    c.rect(MARGIN_L, y - ch, CONTENT_W, ch, stroke=1, fill=0)
-    cx_t = MARGIN_L + 8; cy_t = y - 12
-    full = f"Community Promise: {data['commitment_text']}"
-    cpl = int((CONTENT_W - 20) / (7 * 0.46))
-    for line in wrap(full, width=cpl):
-        if line.startswith("Community Promise:"):
-            c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
-            c.drawString(cx_t, cy_t, "Community Promise: ")
-            c.setFont("Helvetica", 7)
-            c.drawString(cx_t + 88, cy_t, line[len("Community Promise: "):])
-        else:
-            c.setFont("Helvetica", 7); c.setFillColor(BLACK)
-            c.drawString(cx_t, cy_t, line)
-        cy_t -= 8
-    cy_t -= 2
-    c.setFont("Helvetica-Bold", 7); c.setFillColor(BLACK)
-    label = "Direct Contact for Immediate Issues: "
-    c.drawString(cx_t, cy_t, label)
-    lw = c.stringWidth(label, "Helvetica-Bold", 7)
-    contact = f"{data['contact_name']} {data['contact_phone']} | "
-    c.drawString(cx_t + lw, cy_t, contact)
-    cw = c.stringWidth(contact, "Helvetica-Bold", 7)
-    c.setFont("Helvetica", 7); c.setFillColor(BLUE_LINK)
-    email_x = cx_t + lw + cw
-    c.drawString(email_x, cy_t, data['contact_email'])
-    email_w = c.stringWidth(data['contact_email'], "Helvetica", 7)
-    c.setStrokeColor(BLUE_LINK); c.setLineWidth(0.4)
-    c.line(email_x, cy_t - 1, email_x + email_w, cy_t - 1)
+def _render(data, photo_dpi, photo_quality) -> bytes:
+    from reportlab.pdfgen import canvas  # heavy (pdfbase, fonts); only needed to render
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    c.setTitle(f"Weekly Progress Report #{data['report_number']} - {data['project_name']}")
+    c.setAuthor(data['prepared_by'])
 
-    cy_t -= 22
-    c.setFont("Helvetica-BoldOblique", 9); c.setFillColor(NAVY)
-    c.drawCentredString(PAGE_W/2, cy_t, data['district'])
+    layer = static_layer(data)
+    if not place_static(c, layer):
+        c.beginForm(STATIC_FORM)
+        draw_static(c, data, layer)
+        c.endForm()
+        c.doForm(STATIC_FORM)
+    draw_variable(c, data, photo_dpi, photo_quality)
 
     c.save()
+    return buf.getvalue()
+
+
+def render_report_bytes(data) -> bytes:
+    """
+    Render the report in memory and return the PDF. Optional data keys:
+    photo_dpi and photo_quality (how photos are embedded) and pdf_budget_kb:
+    if the PDF comes out larger, it is re-rendered with the photos stepped
+    down through BUDGET_STEPS until it fits (or the last step is reached).
+    """
+    dpi = int(data.get('photo_dpi') or PHOTO_DPI)
+    quality = int(data.get('photo_quality') or PHOTO_QUALITY)
+    pdf = _render(data, dpi, quality)
+
+    budget = data.get('pdf_budget_kb')
+    if budget and data.get('photos'):
+        for step_dpi, step_quality in BUDGET_STEPS:
+            if len(pdf) <= float(budget) * 1024:
+                break
+            # A step never raises either setting above what was just rendered
+            step = (min(step_dpi, dpi), min(step_quality, quality))
+            if step == (dpi, quality):
+                continue
+            dpi, quality = step
+            pdf = _render(data, dpi, quality)
+    return pdf
+
+
+def write_report(data, stream, chunk_size=1 << 16) -> int:
+    """
+    Write the report to a writable binary stream (an open file, a socket's
+    makefile("wb"), an HTTP response) in chunk_size writes. Returns the bytes
+    written. Not a streaming renderer: the whole PDF is rendered into memory
+    first (render_report_bytes), so nothing is written if rendering fails.
+    """
+    view = memoryview(render_report_bytes(data))
+    for start in range(0, len(view), chunk_size):
+        stream.write(view[start:start + chunk_size])
+    stream.flush()
+    return len(view)
+
+
+def generate_report(data, output_path="Weekly_Progress_Report.pdf"):
+    """
+    Render the report to output_path (see render_report_bytes for the options).
+    The file is replaced only once the render has succeeded, via a temp file
+    in the same directory, so a failed render leaves the previous PDF intact.
+    """
+    pdf = render_report_bytes(data)
+    out = Path(output_path)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(pdf)
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     return output_path
 
 
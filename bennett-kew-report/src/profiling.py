@@ -0,0 +1,183 @@
+"""
+Profiling: stdlib sampling profiler + tracemalloc, attributed to named stages.
+Every thread's stack is sampled at a fixed interval; a sample belongs to a stage
+when one of the stage functions is on the stack (the outermost one wins), so
+nothing has to be instrumented. Used by `run_report.py --profile` and by the
+automation pipeline's `run.py --profile`.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# Functions whose time and memory we want broken out
+DEFAULT_STAGES = (
+    "generate_report",          # reportlab drawing
+    "extract_schedule_table",   # PyMuPDF dict-mode extraction
+    "extract_text",             # PyMuPDF plain text extraction
+    "_encode_image",            # PIL decode + re-encode for photo selection
+    "parse_xer",                # P6 master schedule parsing
+)
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _line_range(code) -> tuple[str, int, int]:
+    lines = [line for _, _, line in code.co_lines() if line is not None]
+    return code.co_filename, min(lines, default=code.co_firstlineno), max(lines, default=code.co_firstlineno)
+
+
+class Profiler:
+    """
+    Sample all threads every `interval` seconds while active. Each sample is
+    weighted by the time since the previous one (sampling under tracemalloc
+    stretches the interval). Samples are wall-clock: a thread blocked in I/O
+    inside a stage still counts.
+    Memory: `peak` is the process-wide tracemalloc peak seen while the stage was
+    running (exact when stages don't overlap), `retained` is memory allocated
+    under the stage that is still alive when profiling stops.
+    """
+
+    def __init__(self, stages=DEFAULT_STAGES, interval: float = 0.005,
+                 trace_frames: int = 16):
+        self.stages = set(stages)
+        self.interval = interval
+        self.trace_frames = trace_frames
+        self.samples: dict[str, Counter] = defaultdict(Counter)  # stack -> count
+        self.seconds: dict[str, Counter] = defaultdict(Counter)  # stack -> weighted time
+        self.peak: dict[str, int] = defaultdict(int)
+        self.retained: dict[str, int] = defaultdict(int)
+        self._codes: dict[str, set] = defaultdict(set)
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracemalloc = False
+        self.wall_time = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracemalloc = True
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.wall_time = time.perf_counter() - self._start
+        self._attribute_retained(tracemalloc.take_snapshot())
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def _sample(self, elapsed: float):
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        me = threading.get_ident()
+        for tid, frame in sys._current_frames().items():
+            if tid == me:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            stack.reverse()  # outermost first
+            for i, code in enumerate(stack):
+                if code.co_name in self.stages:
+                    stage = code.co_name
+                    key = tuple(_label(c) for c in stack[i:])
+                    self.samples[stage][key] += 1
+                    self.seconds[stage][key] += elapsed
+                    self.peak[stage] = max(self.peak[stage], peak)
+                    self._codes[stage].add(stack[i])
+                    break
+
+    def _attribute_retained(self, snapshot):
+        ranges = {stage: [_line_range(c) for c in codes] for stage, codes in self._codes.items()}
+        for trace in snapshot.traces:
+            for stage, spans in ranges.items():
+                if any(frame.filename == f and lo <= frame.lineno <= hi
+                       for frame in trace.traceback for f, lo, hi in spans):
+                    self.retained[stage] += trace.size
+                    break
+
+    # ── Output ──────────────────────────────────────────────────────────
+
+    def write(self, out_dir: str | Path, stem: str) -> list[Path]:
+        """Write <stem>_<stage>.collapsed, <stem>_<stage>.speedscope.json and <stem>_memory.txt."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for stage, stacks in sorted(self.samples.items()):
+            collapsed = out_dir / f"{stem}_{stage}.collapsed"
+            with open(collapsed, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(";".join(stack) + f" {count}\n")
+            speedscope = out_dir / f"{stem}_{stage}.speedscope.json"
+            with open(speedscope, "w", encoding="utf-8") as f:
+                json.dump(self._speedscope(stage, self.seconds[stage]), f)
+            written += [collapsed, speedscope]
+        table = out_dir / f"{stem}_memory.txt"
+        table.write_text(self.format_table() + "\n", encoding="utf-8")
+        written.append(table)
+        return written
+
+    def _speedscope(self, stage: str, stacks: Counter) -> dict:
+        """Speedscope 'sampled' profile; stacks maps stack -> seconds."""
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, seconds in stacks.items():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    name, _, where = label.partition(" (")
+                    file, _, line = where.rstrip(")").rpartition(":")
+                    index[label] = len(frames)
+                    frames.append({"name": name, "file": file, "line": int(line)})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(seconds)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": stage, "unit": "seconds",
+                "startValue": 0, "endValue": sum(weights),
+                "samples": samples, "weights": weights,
+            }],
+            "name": stage,
+            "exporter": "bennett-kew-report profiling",
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'Stage':<26} {'Samples':>8} {'Time':>8} {'Peak MB':>9} {'Retained MB':>12}",
+                 "-" * 67]
+        for stage in sorted(self.samples, key=lambda s: -sum(self.seconds[s].values())):
+            n = sum(self.samples[stage].values())
+            lines.append(f"{stage:<26} {n:>8} {sum(self.seconds[stage].values()):>7.2f}s "
+                         f"{self.peak[stage] / 1e6:>9.1f} {self.retained[stage] / 1e6:>12.2f}")
+        if not self.samples:
+            lines.append("(no samples: none of the profiled stages ran long enough to be seen)")
+        lines.append("-" * 67)
+        lines.append(f"Profiled {self.wall_time:.1f}s wall at {self.interval * 1000:.0f} ms intervals")
+        return "\n".join(lines)